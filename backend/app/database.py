@@ -1,10 +1,13 @@
 import os
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -14,9 +17,28 @@ SQLALCHEMY_DATABASE_URL = (
     f"@127.0.0.1:3306/{os.getenv('DB_NAME')}"
 )
 
+# Same database through an asyncio driver, used by the async route handlers
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    f"mysql+aiomysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+    f"@127.0.0.1:3306/{os.getenv('DB_NAME')}"
+)
+
 # Create the SQLAlchemy engine instance for connecting to the MySQL database
+# (the pool classes also record checkout wait times for /metrics)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
+    poolclass=TimedQueuePool,
+    pool_size=5,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True
+)
+
+# Async engine with its own pool; queries await the driver instead of blocking the event loop
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
     pool_size=5,
     max_overflow=10,
     pool_timeout=30,
@@ -44,4 +66,27 @@ def get_db() -> Generator:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Configured "AsyncSession" class; objects stay usable after commit without a reload
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide an async session for `async def` route handlers.
+
+    The synchronous services in `app/services/` run on it unchanged through
+    `await db.run_sync(service, *args)`: the service receives a regular
+    `Session` whose I/O is awaited on the async driver, so the event loop
+    keeps serving other requests during every round-trip.
+
+    Yields:
+        AsyncSession: SQLAlchemy async database session.
+
+    Ensures:
+        Session is properly closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -86,4 +86,10 @@ class MajorCities(enum.Enum):
     LALITPUR = "Lalitpur"
     LUMBINI = "Lumbini"
     NEPALGUNJ = "Nepalgunj"
-    POKHARA = "Pokhara"
\ No newline at end of file
+    POKHARA = "Pokhara"
+
+class FeedSort(enum.Enum):
+    """Sort orders supported by the listings feed."""
+    NEWEST = "newest"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
@@ -1,18 +1,28 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 import os
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, Depends, HTTPException, Request
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
-from app.database import engine, Base, get_db
+from app.database import async_engine, engine, get_db
+from app.migrations import run_migrations
 from app.models.user import User
-from app.models import user, vehicle, vehicle_listing, reported_vehicle
 from app.routes import routes
+from app.services.listing_index import LISTING_INDEX_ENABLED, start_background_warmup
+from app.services.text_index import TEXT_INDEX_ENABLED, start_background_warmup as start_text_index_warmup
+from app.services.image_service import image_pipeline
+from app.services.metrics_service import MetricsMiddleware
+from app.services.query_stats import QueryStatsMiddleware, instrument_engine
+from app.services.stolen_plate_filter import STOLEN_FILTER_ENABLED, start_background_refresh as start_stolen_plate_refresh
+from app.services.suppression_service import LISTING_SUPPRESSION_ENABLED, start_background_suppression
+from app.services.storage_service import (
+    UPLOAD_SWEEP_ENABLED, UploadStaticFiles, start_background_sweep, stop_background_sweep
+)
 
 
 # Load environment variables from .env file
@@ -22,18 +32,42 @@ load_dotenv()
 BASE_DIR = Path(__file__).resolve().parent
 FAVICON_PATH = BASE_DIR / "static" / "favicon.ico"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background warm-ups and the upload sweeper; stop workers and pools on shutdown."""
+    if LISTING_INDEX_ENABLED:
+        start_background_warmup()
+    if TEXT_INDEX_ENABLED:
+        start_text_index_warmup()
+    if UPLOAD_SWEEP_ENABLED:
+        start_background_sweep()
+    if STOLEN_FILTER_ENABLED:
+        start_stolen_plate_refresh()
+    if LISTING_SUPPRESSION_ENABLED:
+        start_background_suppression()
+    yield
+    stop_background_sweep()
+    image_pipeline.shutdown()
+    await async_engine.dispose()
+
+
 # Initialize FastAPI application
-app = FastAPI(title="Shuttle Backend")
+app = FastAPI(title="Shuttle Backend", lifespan=lifespan)
 
 
 # ---------------------- Database ----------------------
 try:
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully")
+    applied = run_migrations(engine)
+    print(f"Database schema up to date (applied migrations: {applied or 'none'})")
 except Exception as e:
-    print(f"Error creating database tables: {str(e)}")
+    print(f"Error migrating database schema: {str(e)}")
     raise
 
+# Count and time statements per request (Server-Timing, slow-query log)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 
 # ---------------------- Middleware ----------------------
 # Enable CORS for frontend communication
@@ -53,13 +87,19 @@ app.add_middleware(
     max_age=int(os.getenv("MAX_SESSION_AGE", 3600)),
 )
 
+# Per-request statement count and DB time, reported as a Server-Timing header
+app.add_middleware(QueryStatsMiddleware)
+
+# Outermost: in-flight gauge and latency per route template, scraped from /metrics
+app.add_middleware(MetricsMiddleware)
+
 
 # ---------------------- Routes ----------------------
 # Include API routes from routes module
 app.include_router(routes.router)
 
-# Serve uploaded files
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Serve uploaded files (immutable names: long-lived caching, strong ETags, range requests)
+app.mount("/uploads", UploadStaticFiles(directory="uploads"), name="uploads")
 
 
 # ---------------------- Endpoints ----------------------
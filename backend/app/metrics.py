@@ -0,0 +1,79 @@
+"""
+Metric primitives shared by the database layer and `app.services.metrics_service`.
+
+Kept free of application imports so `app.database` can build its pools from
+them; rendering and the request middleware live in the metrics service.
+"""
+import math
+import time
+from bisect import bisect_left
+from typing import List, Tuple
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds in seconds; an implicit +Inf bucket follows
+POOL_WAIT_BUCKETS = (0.0001, 0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Updates are plain integer and float additions with no lock: request
+    metrics are recorded on the event loop thread, and where threads do
+    race, a scrape may at worst miss one observation. An observation
+    allocates nothing.
+    """
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration in seconds."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def samples(self, name: str, labels: str) -> List[str]:
+        """Exposition lines (cumulative buckets, sum, count) for this histogram."""
+        prefix = f"{labels}," if labels else ""
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, math.inf), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == math.inf else repr(bound)
+            lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+class TimedCheckoutMixin:
+    """Records how long each checkout waited for a connection, and checkout timeouts."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds = Histogram(POOL_WAIT_BUCKETS)
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - started)
+
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    """QueuePool with checkout wait-time metrics."""
+
+
+class TimedAsyncAdaptedQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait-time metrics."""
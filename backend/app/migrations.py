@@ -0,0 +1,206 @@
+import logging
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, bindparam, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+# Import every model so Base.metadata knows all tables
+from app.models import user, vehicle, vehicle_listing, reported_vehicle, listing_data_version
+
+# --------------------------
+# Logger configuration
+# --------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bookkeeping table lives in its own metadata so create_all on Base never touches it
+_migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+# Serializes concurrent startups (several uvicorn workers) on MySQL
+MIGRATION_LOCK_NAME = "shuttle_schema_migrations"
+MIGRATION_LOCK_TIMEOUT = 60
+
+
+def _add_column(conn: Connection, table: Table, name: str) -> None:
+    """
+    Add a column declared on a model table if it does not exist yet.
+
+    Args:
+        conn (Connection): Connection inside the migration transaction.
+        table (Table): Table the column is declared on.
+        name (str): Column name as declared in the model.
+    """
+    if name in {column["name"] for column in inspect(conn).get_columns(table.name)}:
+        return
+    column = table.c[name]
+    column_type = column.type.compile(dialect=conn.dialect)
+    nullable = "NULL" if column.nullable else "NOT NULL"
+    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type} {nullable}"))
+
+
+def _create_index(conn: Connection, table: Table, name: str) -> None:
+    """
+    Create an index declared on a model table if it does not exist yet.
+
+    Args:
+        conn (Connection): Connection inside the migration transaction.
+        table (Table): Table the index is declared on.
+        name (str): Index name as declared in the model's __table_args__.
+    """
+    index = next(ix for ix in table.indexes if ix.name == name)
+    index.create(bind=conn, checkfirst=True)
+
+
+# --------------------------
+# Migrations
+# --------------------------
+
+def _initial_schema(conn: Connection) -> None:
+    """Create all tables that do not exist yet (the pre-migration create_all behavior)."""
+    Base.metadata.create_all(bind=conn)
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    """Add composite indexes for the listings feed and the stolen-vehicle check."""
+    listings = vehicle_listing.VehicleListing.__table__
+    _create_index(conn, listings, "ix_vehicle_listings_feed_newest")
+    _create_index(conn, listings, "ix_vehicle_listings_feed_price")
+    _create_index(conn, reported_vehicle.ReportedVehicle.__table__, "ix_reported_vehicles_plate")
+
+
+def _recommendation_indexes(conn: Connection) -> None:
+    """Add indexes for the SQL-side recommendation candidate filter."""
+    _create_index(conn, vehicle_listing.VehicleListing.__table__, "ix_vehicle_listings_location")
+    _create_index(conn, vehicle.Vehicle.__table__, "ix_vehicles_attributes")
+
+
+def _image_derivative_columns(conn: Connection) -> None:
+    """Add the thumbnail and WebP variant URLs to listings."""
+    listings = vehicle_listing.VehicleListing.__table__
+    _add_column(conn, listings, "thumbnail_url")
+    _add_column(conn, listings, "webp_url")
+
+
+def _reported_plate_keys(conn: Connection) -> None:
+    """Add and backfill normalized plate keys on stolen-vehicle reports."""
+    from app.services.stolen_plate_filter import normalize_plate
+
+    reports = reported_vehicle.ReportedVehicle.__table__
+    _add_column(conn, reports, "plate_key")
+    rows = conn.execute(select(reports.c.id, reports.c.vehicle_no).where(reports.c.plate_key.is_(None))).all()
+    if rows:
+        conn.execute(
+            reports.update().where(reports.c.id == bindparam("report_id")).values(plate_key=bindparam("key")),
+            [{"report_id": row.id, "key": normalize_plate(row.vehicle_no)} for row in rows]
+        )
+    _create_index(conn, reports, "ix_reported_vehicles_plate_key")
+
+
+def _listing_suppression(conn: Connection) -> None:
+    """Add normalized plate keys on vehicles and the suppression flag on listings."""
+    from app.services.stolen_plate_filter import normalize_plate
+
+    vehicles = vehicle.Vehicle.__table__
+    _add_column(conn, vehicles, "plate_key")
+    rows = conn.execute(select(vehicles.c.id, vehicles.c.vehicle_no).where(vehicles.c.plate_key.is_(None))).all()
+    if rows:
+        conn.execute(
+            vehicles.update().where(vehicles.c.id == bindparam("vehicle_id")).values(plate_key=bindparam("key")),
+            [{"vehicle_id": row.id, "key": normalize_plate(row.vehicle_no)} for row in rows]
+        )
+    _create_index(conn, vehicles, "ix_vehicles_plate_key")
+    _add_column(conn, vehicle_listing.VehicleListing.__table__, "suppressed_at")
+    _create_index(conn, reported_vehicle.ReportedVehicle.__table__, "ix_reported_vehicles_reported_at")
+
+
+def _listing_data_versions(conn: Connection) -> None:
+    """Create the per-city listing data version table with a row for every city."""
+    from app.enum import MajorCities
+
+    versions = listing_data_version.ListingDataVersion.__table__
+    versions.create(bind=conn, checkfirst=True)
+    existing = set(conn.execute(select(versions.c.location)).scalars())
+    missing = [{"location": city, "version": 0} for city in MajorCities if city not in existing]
+    if missing:
+        conn.execute(versions.insert(), missing)
+
+
+# Ordered list of (version, description, upgrade). Append only; never renumber.
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "initial schema", _initial_schema),
+    (2, "feed and stolen-check composite indexes", _hot_path_indexes),
+    (3, "recommendation candidate indexes", _recommendation_indexes),
+    (4, "listing image derivative urls", _image_derivative_columns),
+    (5, "normalized plate keys on reported vehicles", _reported_plate_keys),
+    (6, "vehicle plate keys and listing suppression", _listing_suppression),
+    (7, "per-city listing data versions", _listing_data_versions),
+]
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """
+    Apply every pending migration in version order.
+
+    Each migration runs in its own transaction and is recorded in
+    `schema_migrations`, so existing databases pick up new indexes and
+    columns on the next startup instead of only fresh ones. On MySQL the
+    whole run holds a named lock, so concurrent startups migrate one at a
+    time; a worker that cannot get the lock raises instead of running DDL.
+
+    Args:
+        engine (Engine): Engine bound to the target database.
+
+    Returns:
+        List[int]: Versions applied by this call.
+    """
+    applied = []
+    with engine.connect() as conn:
+        is_mysql = conn.dialect.name == "mysql"
+        if is_mysql:
+            # 1: acquired; 0: timed out behind another worker; NULL: error
+            acquired = conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT}
+            ).scalar()
+            if acquired != 1:
+                raise RuntimeError(
+                    f"Could not acquire migration lock {MIGRATION_LOCK_NAME!r} within "
+                    f"{MIGRATION_LOCK_TIMEOUT}s (GET_LOCK returned {acquired}); not migrating"
+                )
+        try:
+            _migration_metadata.create_all(bind=conn)
+            conn.commit()
+
+            current = conn.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+            conn.commit()
+
+            for version, description, upgrade in MIGRATIONS:
+                if version <= current:
+                    continue
+                with conn.begin():
+                    upgrade(conn)
+                    conn.execute(schema_migrations.insert().values(version=version, description=description))
+                logger.info(f"Applied migration {version}: {description}")
+                applied.append(version)
+        finally:
+            if is_mysql:
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME})
+
+    return applied
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    run_migrations(engine)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, Enum
+from app.database import Base
+
+from app.enum import MajorCities
+
+class ListingDataVersion(Base):
+    __tablename__ = "listing_data_versions"
+
+    # One row per city, bumped in the same transaction as listing updates that
+    # neither insert nor delete (image derivatives landing, suppression)
+    location = Column(Enum(MajorCities), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from sqlalchemy.sql import func
@@ -8,9 +8,19 @@ from app.enum import VehicleType
 
 class ReportedVehicle(Base):
     __tablename__ = "reported_vehicles"
+    __table_args__ = (
+        # Stolen check filters on (vehicle_no, vehicle_type); duplicate-report check adds reported_by
+        Index("ix_reported_vehicles_plate", "vehicle_no", "vehicle_type", "reported_by"),
+        # Normalized plate lookups (stolen check confirmation, duplicate reports)
+        Index("ix_reported_vehicles_plate_key", "plate_key", "vehicle_type", "reported_by"),
+        # Suppression sweep reads reports past its high-water mark
+        Index("ix_reported_vehicles_reported_at", "reported_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     vehicle_no = Column(String(20), nullable=False)
+    # vehicle_no reduced by normalize_plate: upper case, letters and digits only
+    plate_key = Column(String(20), nullable=True)
     vehicle_type = Column(Enum(VehicleType), nullable=False)
     reported_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum
+from sqlalchemy import Column, Integer, String, Enum, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -6,9 +6,17 @@ from app.enum import VehicleType, EngineType, BodyType
 
 class Vehicle(Base):
     __tablename__ = "vehicles"
+    __table_args__ = (
+        # Recommendation candidate filter on the scored attributes
+        Index("ix_vehicles_attributes", "vehicle_type", "body_type", "engine_type"),
+        # Suppression sweep joins stolen reports on the normalized plate
+        Index("ix_vehicles_plate_key", "plate_key", "vehicle_type"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     vehicle_no = Column(String(20), unique=True, nullable=False)
+    # vehicle_no reduced by normalize_plate: upper case, letters and digits only
+    plate_key = Column(String(20), nullable=True)
     vehicle_type = Column(Enum(VehicleType), nullable=False)
     engine_type = Column(Enum(EngineType), nullable=False)
     engine_battery_capacity = Column(String(10), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Float, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Float, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -7,6 +7,13 @@ from app.enum import ListingType, MajorCities
 
 class VehicleListing(Base):
     __tablename__ = "vehicle_listings"
+    __table_args__ = (
+        # Feed filters on (listing_type, location) and seeks on the sort key + id
+        Index("ix_vehicle_listings_feed_newest", "listing_type", "location", "created_at", "id"),
+        Index("ix_vehicle_listings_feed_price", "listing_type", "location", "price", "id"),
+        # Recommendations filter on location alone
+        Index("ix_vehicle_listings_location", "location", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -20,8 +27,13 @@ class VehicleListing(Base):
 
     title = Column(String(100), nullable=False)
     image_url = Column(String(255), nullable=True)
+    # Derivatives generated in the background after upload (None until ready)
+    thumbnail_url = Column(String(255), nullable=True)
+    webp_url = Column(String(255), nullable=True)
     description = Column(Text, nullable=True)
     listing_type = Column(Enum(ListingType), nullable=False)
     price = Column(Float, nullable=False)
     location = Column(Enum(MajorCities), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Set when the vehicle's plate is reported stolen after listing; suppressed listings are never served
+    suppressed_at = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
@@ -1,31 +1,46 @@
+import time
+
+import numpy as np
 from sqlalchemy.orm import Session
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Request, Query, Form, File, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query, Form, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 # Database and models
-from app.database import get_db
-from app.models.vehicle_listing import VehicleListing
+from app.database import async_engine, engine, get_db, get_async_db
 from app.models.user import User
-from app.models.vehicle import Vehicle
 
 # Enum helpers and enums
 from app.services.enum_service import (
     get_all_cities, get_all_engine_types, get_all_vehicle_types, 
     get_bike_body_types, get_car_body_types, get_all_listing_types
 )
-from app.enum import VehicleType, EngineType, BodyType, ListingType, MajorCities
+from app.enum import VehicleType, EngineType, BodyType, ListingType, MajorCities, FeedSort
 
 # Schemas
 from app.schemas.user import UserCreate, UserOut, UserLogin
 from app.schemas.vehicle_listing import VehicleListingFullCreate
 from app.schemas.reported_vehicle import ReportedVehicleCreate
-from app.schemas.listing_feed import VehicleListingFeedOut
+from app.schemas.listing_feed import VehicleListingFeedOut, listing_feed_adapter
 
 # Services
 from app.services.user_service import register_user, login_user
-from app.services.listing_service import create_vehicle_listing, save_uploaded_file
-from app.services.report_service import report_vehicle as report_vehicle_service
+from app.services.listing_service import create_vehicle_listing, save_uploaded_file, bulk_create_vehicle_listings
+from app.services.report_service import report_vehicle as report_vehicle_service, bulk_report_vehicles
 from app.services.nlp_recommendation_service import nlp_service
+from app.services.feed_service import get_cached_listing_feed, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.cache_service import feed_cache
+from app.services.password_service import password_pool, server_timing as password_server_timing
+from app.services.stolen_plate_filter import stolen_plates
+from app.services.suppression_service import listing_suppression
+from app.services.metrics_service import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, observe_phase, render_metrics, require_diagnostics_token
+)
+from app.services.query_stats import totals as query_totals
+from app.services.etag_service import (
+    StaticJSON, etag_matches, listing_data_version, make_etag, not_modified
+)
 
 
 router = APIRouter()
@@ -33,62 +48,72 @@ router = APIRouter()
 
 # ----------------------------- ENUM ENDPOINTS -----------------------------
 
+# Enum lists never change while the process runs: serialize and hash them once
+_LOCATIONS = StaticJSON(get_all_cities())
+_VEHICLE_TYPES = StaticJSON(get_all_vehicle_types())
+_ENGINE_TYPES = StaticJSON(get_all_engine_types())
+_CAR_BODY_TYPES = StaticJSON(get_car_body_types())
+_BIKE_BODY_TYPES = StaticJSON(get_bike_body_types())
+_LISTING_TYPES = StaticJSON(get_all_listing_types())
+
 @router.get("/locations")
-def locations():
+def locations(request: Request):
     """Return all supported city locations."""
-    return get_all_cities()
+    return _LOCATIONS.respond(request)
 
 @router.get("/vehicle-types")
-def vehicle_types():
+def vehicle_types(request: Request):
     """Return all supported vehicle types."""
-    return get_all_vehicle_types()
+    return _VEHICLE_TYPES.respond(request)
 
 @router.get("/engine-types")
-def engine_types():
+def engine_types(request: Request):
     """Return all supported engine types."""
-    return get_all_engine_types()
+    return _ENGINE_TYPES.respond(request)
 
 @router.get("/car-body-types")
-def car_body_types():
+def car_body_types(request: Request):
     """Return all supported car body types."""
-    return get_car_body_types()
+    return _CAR_BODY_TYPES.respond(request)
 
 @router.get("/bike-body-types")
-def bike_body_types():
+def bike_body_types(request: Request):
     """Return all supported bike body types."""
-    return get_bike_body_types()
+    return _BIKE_BODY_TYPES.respond(request)
 
 @router.get("/listing-types")
-def listing_types():
+def listing_types(request: Request):
     """Return all supported listing types (e.g., RENTAL, SALE)."""
-    return get_all_listing_types()
+    return _LISTING_TYPES.respond(request)
 
 
 # ----------------------------- AUTH ENDPOINTS -----------------------------
 
 @router.post("/register/", response_model=UserOut)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, response: Response, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
-    result = register_user(
+    result = await register_user(
         fullname=user_data.fullname,
         phone_number=user_data.phone_number,
         password=user_data.password,
         default_location=user_data.default_location,
         db=db
     )
-    user = db.query(User).filter(User.id == result["user_id"]).first()
+    response.headers["Server-Timing"] = password_server_timing()
+    user = await db.get(User, result["user_id"])
     return UserOut.model_validate(user)
 
 @router.post("/login/", response_model=UserOut)
-async def login(user_data: UserLogin, request: Request, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     """Log in a user and set session data."""
-    result = login_user(user_data.phone_number, user_data.password, db)
+    result = await login_user(user_data.phone_number, user_data.password, db)
+    response.headers["Server-Timing"] = password_server_timing()
 
     request.session["user_id"] = result["user_id"]
     request.session["fullname"] = result["fullname"]
     request.session["default_location"] = result["default_location"].value
 
-    user = db.query(User).filter(User.id == result["user_id"]).first()
+    user = await db.get(User, result["user_id"])
     return UserOut.model_validate(user)
 
 @router.post("/logout/")
@@ -119,7 +144,7 @@ async def create_listing(
     location: str = Form(...),
     # File upload
     image: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new vehicle listing with image upload."""
     try:
@@ -133,7 +158,7 @@ async def create_listing(
         raise HTTPException(status_code=400, detail=f"Invalid enum value: {str(e)}")
 
     # Save uploaded image
-    image_url = save_uploaded_file(image)
+    image_url = await save_uploaded_file(image)
 
     # Prepare listing schema
     listing_data = VehicleListingFullCreate(
@@ -152,7 +177,18 @@ async def create_listing(
         image_url=image_url
     )
 
-    return create_vehicle_listing(listing_data, user_id, location_enum, db)
+    return await db.run_sync(lambda session: create_vehicle_listing(listing_data, user_id, location_enum, session))
+
+
+@router.post("/vehicles/list/bulk", response_model=dict)
+async def create_listings_bulk(
+    user_id: int = Query(..., description="User ID of listing owner"),
+    manifest: UploadFile = File(..., description="CSV (with header) or NDJSON, one listing per row; `image` names a file below"),
+    images: List[UploadFile] = File(..., description="Images referenced by the manifest"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a dealer's listings in one request; returns per-row results."""
+    return await bulk_create_vehicle_listings(manifest, images, user_id, db)
 
 
 @router.post("/vehicles/report/", response_model=dict)
@@ -160,7 +196,7 @@ async def report_vehicle(
     vehicle_no: str = Form(...),
     vehicle_type: str = Form(...),
     user_id: int = Query(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Report a suspicious or fraudulent vehicle."""
     try:
@@ -174,7 +210,17 @@ async def report_vehicle(
         reported_by=user_id
     )
 
-    return report_vehicle_service(vehicle_data, user_id, db)
+    return await db.run_sync(lambda session: report_vehicle_service(vehicle_data, user_id, session))
+
+
+@router.post("/vehicles/report/bulk", response_model=dict)
+async def report_vehicles_bulk(
+    file: UploadFile = File(..., description="CSV (with header) or NDJSON with vehicle_no, vehicle_type"),
+    user_id: int = Query(..., description="User ID of the reporting authority"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ingest a bulletin of stolen plates; returns per-row results and throughput."""
+    return await bulk_report_vehicles(file, user_id, db)
 
 
 @router.get("/vehicles/listings")
@@ -182,9 +228,12 @@ def get_listings(
     request: Request,
     listing_type: str = Query(..., description="RENTAL or SALE"),
     location: str = Query(..., description="City name, e.g., Kathmandu"),
+    sort: str = Query("newest", description="newest, price_asc or price_desc"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description=f"Page size (max {MAX_PAGE_SIZE})"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
-    """Fetch listings filtered by type and location. Show phone only if logged in."""
+    """Fetch a page of listings filtered by type and location. Show phone only if logged in."""
     listing_type_upper = listing_type.strip().upper()
     location_formatted = location.strip().capitalize()
 
@@ -193,55 +242,69 @@ def get_listings(
         raise HTTPException(status_code=400, detail=f"Invalid listing_type: {listing_type}")
     if location_formatted not in [city.value for city in MajorCities]:
         raise HTTPException(status_code=400, detail=f"Invalid location: {location}")
+    try:
+        sort_enum = FeedSort(sort.strip().lower())
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid sort: {sort}")
 
-    listings = (
-        db.query(VehicleListing)
-        .join(Vehicle)
-        .join(User)
-        .filter(
-            VehicleListing.listing_type == ListingType[listing_type_upper],
-            VehicleListing.location == MajorCities(location_formatted)
-        )
-        .all()
+    logged_in = "user_id" in request.session
+
+    etag, body = get_cached_listing_feed(
+        db=db,
+        listing_type=ListingType[listing_type_upper],
+        location=MajorCities(location_formatted),
+        logged_in=logged_in,
+        sort=sort_enum,
+        limit=limit,
+        cursor=cursor,
+        if_none_match=request.headers.get("if-none-match")
     )
+    if body is None:
+        return not_modified(etag)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
-    logged_in = "user_id" in request.session
 
+# ----------------------------- AI RECOMMENDATIONS -----------------------------
+
+def _recommendations_etag(db: Session, query: str, location: str, logged_in: bool) -> str:
+    """Build the ETag for a recommendation response from the city's listing data version."""
+    try:
+        location_enum = MajorCities(location) if location else None
+    except ValueError:
+        location_enum = None
+    data_version = listing_data_version(db, location=location_enum)
+    return make_etag("recommendations", data_version, query.lower(), location_enum, logged_in)
+
+
+def _recommendation_results(
+    db: Session, query: str, location: str, logged_in: bool, query_vector: Optional[np.ndarray] = None
+) -> bytes:
+    """Run the recommender and serialize its output as the feed response, validating once."""
+    rec_data = nlp_service.get_recommendations(
+        db=db,
+        query=query,
+        location=location if location else None,
+        limit=10,
+        query_vector=query_vector
+    )
+
+    started = time.perf_counter()
     results = []
-    for l in listings:
-        results.append({
-            "id": l.id,
-            "title": l.title,
-            "description": l.description,
-            "listing_type": l.listing_type.value,
-            "price": l.price,
-            "location": l.location.value,
-            "image_url": l.image_url,
-            "created_at": l.created_at,
-            "vehicle": {
-                "vehicle_no": l.vehicle.vehicle_no,
-                "vehicle_type": l.vehicle.vehicle_type.value,
-                "engine_type": l.vehicle.engine_type.value,
-                "engine_battery_capacity": l.vehicle.engine_battery_capacity,
-                "body_type": l.vehicle.body_type.value,
-                "company": l.vehicle.company,
-                "model_name": l.vehicle.model_name,
-            },
-            "user": {
-                "id": l.user.id,
-                "fullname": l.user.fullname,
-                "phone_number": l.user.phone_number if logged_in else None,
-            }
-        })
-    return results
+    for rec in rec_data["recommendations"]:
+        listing = rec["listing"]
+        if not logged_in:
+            listing["user"]["phone_number"] = None
+        results.append(listing)
 
+    content = listing_feed_adapter.dump_json(listing_feed_adapter.validate_python(results))
+    observe_phase("serialize", time.perf_counter() - started)
+    return content
 
-# ----------------------------- AI RECOMMENDATIONS -----------------------------
 
 @router.post("/recommendations", response_model=List[VehicleListingFeedOut])
 async def get_recommendations(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get AI-powered vehicle recommendations from query & location."""
     body = await request.json()
@@ -251,32 +314,82 @@ async def get_recommendations(
     if not query:
         return []
 
-    rec_data = nlp_service.get_recommendations(
-        db=db,
-        query=query,
-        location=location if location else None,
-        limit=10
+    logged_in: bool = "user_id" in request.session
+
+    etag = await db.run_sync(_recommendations_etag, query, location, logged_in)
+    # run_sync executes on the event loop thread: embed the query in the threadpool first
+    query_vector = await run_in_threadpool(nlp_service.query_vector, query)
+    return Response(
+        content=await db.run_sync(_recommendation_results, query, location, logged_in, query_vector),
+        media_type="application/json",
+        headers={"ETag": etag}
     )
 
+
+@router.get("/recommendations", response_model=List[VehicleListingFeedOut])
+def get_recommendations_conditional(
+    request: Request,
+    query: str = Query("", description="Free-text search, e.g. family suv"),
+    location: str = Query("", description="City name, e.g., Kathmandu"),
+    db: Session = Depends(get_db)
+):
+    """Cacheable GET variant of recommendations; honors If-None-Match."""
+    query = query.strip()
+    location = location.strip()
+
+    if not query:
+        return []
+
     logged_in: bool = "user_id" in request.session
 
-    results = []
-    for rec in rec_data["recommendations"]:
-        listing = rec["listing"]
-        results.append({
-            "id": listing["id"],
-            "title": listing["title"],
-            "description": listing.get("description"),
-            "listing_type": listing["listing_type"],
-            "price": listing["price"],
-            "location": listing.get("location"),
-            "image_url": listing.get("image_url"),
-            "created_at": listing.get("created_at"),
-            "vehicle": listing.get("vehicle"),
-            "user": {
-                "id": listing["user"]["id"],
-                "fullname": listing["user"]["fullname"],
-                "phone_number": listing["user"]["phone_number"] if logged_in else None
-            }
-        })
-    return results
\ No newline at end of file
+    etag = _recommendations_etag(db, query, location, logged_in)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    return Response(
+        content=_recommendation_results(db, query, location, logged_in),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
+
+
+# ----------------------------- DIAGNOSTICS -----------------------------
+# Require `Authorization: Bearer <DIAGNOSTICS_TOKEN>`; 404 while no token is configured
+
+@router.get("/cache/stats", include_in_schema=False, dependencies=[Depends(require_diagnostics_token)])
+def cache_stats():
+    """Return hit/miss/eviction counters for the in-process caches."""
+    return {
+        "feed": feed_cache.stats(),
+        "preferences": nlp_service.preference_cache.stats(),
+        "stolen_plates": stolen_plates.stats(),
+        "suppression": listing_suppression.stats(),
+    }
+
+@router.get("/auth/pool/stats", include_in_schema=False, dependencies=[Depends(require_diagnostics_token)])
+def password_pool_stats():
+    """Return occupancy, rejection and timing counters for the password hashing pool."""
+    return password_pool.stats()
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_diagnostics_token)])
+def metrics():
+    """Expose request, connection pool, cache and recommendation metrics in Prometheus text format."""
+    sql = query_totals()
+    return Response(
+        content=render_metrics(
+            pools={"sync": engine.pool, "async": async_engine.sync_engine.pool},
+            components={
+                "feed_cache": feed_cache.stats(),
+                "preference_cache": nlp_service.preference_cache.stats(),
+                "password_pool": password_pool.stats(),
+                "stolen_plates": stolen_plates.stats(),
+                "suppression": listing_suppression.stats(),
+            },
+            counters=(
+                ("shuttle_db_queries_total", "SQL statements executed", sql["queries"]),
+                ("shuttle_db_query_seconds_total", "Time spent executing SQL statements", sql["db_ms"] / 1000),
+                ("shuttle_db_slow_queries_total", "Statements slower than SQL_SLOW_QUERY_MS", sql["slow_queries"]),
+            )
+        ),
+        media_type=METRICS_CONTENT_TYPE
+    )
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, TypeAdapter
+from typing import List, Optional
 from datetime import datetime
 
 # Enums
@@ -30,6 +30,8 @@ class VehicleListingFeedOut(BaseModel):
     price: float
     location: MajorCities
     image_url: Optional[str]
+    thumbnail_url: Optional[str] = None  # Set once background derivatives are ready
+    webp_url: Optional[str] = None
     created_at: datetime
 
     # Related objects
@@ -38,4 +40,8 @@ class VehicleListingFeedOut(BaseModel):
 
     model_config = {
         "from_attributes": True  # Enables validation from ORM objects
-    }
\ No newline at end of file
+    }
+
+
+# Built once: validates a whole feed list and serializes it to JSON bytes in one pass
+listing_feed_adapter = TypeAdapter(List[VehicleListingFeedOut])
@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.enum import MajorCities
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe LRU cache with a per-entry TTL and an optional version tag.
+
+    An entry stored under an older version than the one requested is treated
+    as stale: it is dropped and reported as a miss, counted under
+    `invalidations` rather than `expirations` (which counts TTL expiry only).
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, version: int = 0) -> Optional[Any]:
+        """
+        Return the cached value for a key, or None on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            version (int, optional): Current version; entries stored under another version are stale. Defaults to 0.
+
+        Returns:
+            Any: Cached value, or None if absent, expired or stale.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry_version, expires_at, value = entry
+            if entry_version != version:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, version: int = 0) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to cache (must not be None).
+            version (int, optional): Version the value was computed at. Defaults to 0.
+        """
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Return cache counters for sizing and monitoring.
+
+        Returns:
+            dict: Size, capacity, hits, misses, evictions, expirations, invalidations and hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class FeedCache:
+    """
+    Cache of serialized listing feed pages (with their ETags) and a version counter per city.
+
+    Any write that changes a city's listings must call `invalidate(city)`,
+    after which pages cached for that city are never served again.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.pages = LRUCache(max_entries, ttl_seconds)
+        self._versions = {city: 0 for city in MajorCities}
+        self._lock = threading.Lock()
+
+    def version(self, location: MajorCities) -> int:
+        """Return the current version counter for a city."""
+        return self._versions[location]
+
+    def invalidate(self, location: MajorCities) -> None:
+        """Bump a city's version so every cached page for it becomes stale."""
+        with self._lock:
+            self._versions[location] += 1
+
+    def get(self, location: MajorCities, key: Hashable) -> Optional[tuple]:
+        """Return a cached (etag, body) pair for a city, or None on a miss."""
+        return self.pages.get((location, key), self.version(location))
+
+    def set(self, location: MajorCities, key: Hashable, page: tuple, version: int) -> None:
+        """Cache an (etag, body) pair computed while the city was at `version`."""
+        self.pages.set((location, key), page, version)
+
+    def stats(self) -> dict:
+        """Return page cache counters."""
+        return self.pages.stats()
+
+
+# --------------------------
+# Global cache instances
+# --------------------------
+
+# In-process only: with several workers, invalidation reaches the worker that
+# handled the write and the TTL bounds staleness everywhere else.
+feed_cache = FeedCache(
+    max_entries=int(os.getenv("FEED_CACHE_MAX_ENTRIES", 1024)),
+    ttl_seconds=float(os.getenv("FEED_CACHE_TTL_SECONDS", 30))
+)
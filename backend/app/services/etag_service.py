@@ -0,0 +1,120 @@
+import hashlib
+import json
+from typing import Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+# Project-specific models and enums
+from app.models.listing_data_version import ListingDataVersion
+from app.models.vehicle_listing import VehicleListing
+from app.enum import ListingType, MajorCities
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the values that fully determine a response body.
+
+    Args:
+        *parts: Hashable description of the response (data version, parameters, ...).
+
+    Returns:
+        str: Quoted strong entity tag.
+    """
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, per RFC 9110).
+
+    Args:
+        if_none_match (str, optional): Raw If-None-Match request header.
+        etag (str): Current entity tag.
+
+    Returns:
+        bool: True if the client's cached copy is still current.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    """Return an empty 304 response carrying the current ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def listing_data_version(
+    db: Session,
+    listing_type: Optional[ListingType] = None,
+    location: Optional[MajorCities] = None
+) -> tuple:
+    """
+    Return a cheap version stamp for a partition of the listings table.
+
+    (row count, max id) changes on every insert and delete in the partition
+    and is answered from the (listing_type, location, ...) indexes; updates
+    that change what a listing shows (image derivatives landing, the
+    suppression sweep) bump the city's row in `listing_data_versions`
+    instead, which is read by primary key in the same statement.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        listing_type (ListingType, optional): Listing type partition.
+        location (MajorCities, optional): City partition.
+
+    Returns:
+        tuple: (count, max id, city version) for the partition.
+    """
+    versions = db.query(func.coalesce(func.sum(ListingDataVersion.version), 0))
+    if location is not None:
+        versions = versions.filter(ListingDataVersion.location == location)
+
+    query = db.query(func.count(VehicleListing.id), func.max(VehicleListing.id), versions.scalar_subquery())
+    if listing_type is not None:
+        query = query.filter(VehicleListing.listing_type == listing_type)
+    if location is not None:
+        query = query.filter(VehicleListing.location == location)
+    return tuple(query.one())
+
+
+def bump_listing_data_version(db: Session, locations: Iterable[MajorCities]) -> None:
+    """
+    Change the data version of cities whose listings changed without an insert or delete.
+
+    Runs in the caller's transaction, so the new version is visible to every
+    worker exactly when the change itself commits.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        locations (Iterable[MajorCities]): Cities to bump.
+    """
+    locations = list(locations)
+    if locations:
+        db.query(ListingDataVersion).filter(ListingDataVersion.location.in_(locations)).update(
+            {"version": ListingDataVersion.version + 1}, synchronize_session=False
+        )
+
+
+class StaticJSON:
+    """
+    A JSON response body that never changes while the process runs.
+
+    The body and its ETag are computed once, so conditional requests are
+    answered without any work beyond a header comparison.
+    """
+    def __init__(self, payload):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = make_etag(self.body)
+
+    def respond(self, request: Request) -> Response:
+        """Return the body, or a 304 if the client already has it."""
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return not_modified(self.etag)
+        return Response(content=self.body, media_type="application/json", headers={"ETag": self.etag})
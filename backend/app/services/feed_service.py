@@ -0,0 +1,294 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+# Project-specific models and enums
+from app.models.vehicle_listing import VehicleListing
+from app.models.vehicle import Vehicle
+from app.models.user import User
+from app.enum import FeedSort, ListingType, MajorCities
+from app.services.cache_service import feed_cache
+from app.services.etag_service import etag_matches, listing_data_version, make_etag
+
+# --------------------------
+# Pagination configuration
+# --------------------------
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# --------------------------
+# Feed projection
+# --------------------------
+
+# Exactly the columns the feed responses use, selected as flat rows so no
+# ORM objects are hydrated and no relationship is lazy-loaded per row.
+FEED_COLUMNS = (
+    VehicleListing.id,
+    VehicleListing.title,
+    VehicleListing.description,
+    VehicleListing.listing_type,
+    VehicleListing.price,
+    VehicleListing.location,
+    VehicleListing.image_url,
+    VehicleListing.thumbnail_url,
+    VehicleListing.webp_url,
+    VehicleListing.created_at,
+    VehicleListing.vehicle_id,
+    VehicleListing.listed_by,
+    Vehicle.vehicle_no,
+    Vehicle.vehicle_type,
+    Vehicle.engine_type,
+    Vehicle.engine_battery_capacity,
+    Vehicle.body_type,
+    Vehicle.company,
+    Vehicle.model_name,
+    User.fullname,
+    User.phone_number,
+)
+
+
+def query_feed_rows(db: Session):
+    """
+    Build the single-statement listing/vehicle/user projection used by the feeds.
+
+    Suppressed listings (plate reported stolen after listing) are excluded
+    here, so every feed and recommendation path drops them. Feed rows are
+    read from the table anyway, so the check only costs skipping the rare
+    suppressed row.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+
+    Returns:
+        Query: Column query over the joined tables, ready for filtering.
+    """
+    return (
+        db.query(*FEED_COLUMNS)
+        .select_from(VehicleListing)
+        .join(Vehicle)
+        .join(User)
+        .filter(VehicleListing.suppressed_at.is_(None))
+    )
+
+
+def feed_row_to_dict(row, logged_in: bool) -> dict:
+    """
+    Convert a row from `query_feed_rows` into the feed response shape.
+
+    Args:
+        row (Row): Flat listing row.
+        logged_in (bool): Whether to expose the owner's phone number.
+
+    Returns:
+        dict: Listing with nested vehicle and user details.
+    """
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "listing_type": row.listing_type.value,
+        "price": row.price,
+        "location": row.location.value,
+        "image_url": row.image_url,
+        "thumbnail_url": row.thumbnail_url,
+        "webp_url": row.webp_url,
+        "created_at": row.created_at,
+        "vehicle": {
+            "vehicle_no": row.vehicle_no,
+            "vehicle_type": row.vehicle_type.value,
+            "engine_type": row.engine_type.value,
+            "engine_battery_capacity": row.engine_battery_capacity,
+            "body_type": row.body_type.value,
+            "company": row.company,
+            "model_name": row.model_name,
+        },
+        "user": {
+            "id": row.listed_by,
+            "fullname": row.fullname,
+            "phone_number": row.phone_number if logged_in else None,
+        }
+    }
+
+
+def encode_cursor(sort: FeedSort, last_listing) -> str:
+    """
+    Build an opaque cursor pointing just past the given listing.
+
+    Args:
+        sort (FeedSort): Sort order the cursor belongs to.
+        last_listing (Row): Last listing row on the current page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    if sort == FeedSort.NEWEST:
+        key = last_listing.created_at.isoformat()
+    else:
+        key = last_listing.price
+
+    payload = json.dumps({"s": sort.value, "k": key, "id": last_listing.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: FeedSort) -> tuple:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Opaque cursor from a previous page.
+        sort (FeedSort): Sort order of the current request.
+
+    Returns:
+        tuple: (sort key value, listing id) of the last row already served.
+
+    Raises:
+        HTTPException: If the cursor is malformed or was issued for another sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort.value:
+            raise ValueError("cursor sort mismatch")
+        key = datetime.fromisoformat(payload["k"]) if sort == FeedSort.NEWEST else float(payload["k"])
+        return key, int(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _keyset_filter(sort: FeedSort, key, last_id: int):
+    """Return the WHERE clause that skips every row up to and including the cursor."""
+    if sort == FeedSort.NEWEST:
+        column, after = VehicleListing.created_at, VehicleListing.created_at < key
+    elif sort == FeedSort.PRICE_ASC:
+        column, after = VehicleListing.price, VehicleListing.price > key
+    else:
+        column, after = VehicleListing.price, VehicleListing.price < key
+
+    id_after = VehicleListing.id > last_id if sort == FeedSort.PRICE_ASC else VehicleListing.id < last_id
+    return or_(after, and_(column == key, id_after))
+
+
+def _order_by(sort: FeedSort) -> tuple:
+    """Return the ORDER BY columns for a sort order, with `id` as the tiebreaker."""
+    if sort == FeedSort.NEWEST:
+        return VehicleListing.created_at.desc(), VehicleListing.id.desc()
+    if sort == FeedSort.PRICE_ASC:
+        return VehicleListing.price.asc(), VehicleListing.id.asc()
+    return VehicleListing.price.desc(), VehicleListing.id.desc()
+
+
+def get_listing_feed(
+    db: Session,
+    listing_type: ListingType,
+    location: MajorCities,
+    logged_in: bool,
+    sort: FeedSort = FeedSort.NEWEST,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> dict:
+    """
+    Fetch one page of listings using keyset pagination.
+
+    Each page is a bounded index range scan seeking past the previous page's
+    last (sort key, id), so deep pages cost the same as the first one.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        listing_type (ListingType): Listing type to filter on.
+        location (MajorCities): City to filter on.
+        logged_in (bool): Whether to expose owner phone numbers.
+        sort (FeedSort, optional): Sort order. Defaults to newest first.
+        limit (int, optional): Requested page size, capped at MAX_PAGE_SIZE.
+        cursor (str, optional): Cursor returned with the previous page.
+
+    Returns:
+        dict: Page items and the cursor for the next page (None on the last page).
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    query = query_feed_rows(db).filter(
+        VehicleListing.listing_type == listing_type,
+        VehicleListing.location == location
+    )
+
+    if cursor:
+        key, last_id = decode_cursor(cursor, sort)
+        query = query.filter(_keyset_filter(sort, key, last_id))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.order_by(*_order_by(sort)).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "items": [feed_row_to_dict(row, logged_in) for row in rows],
+        "next_cursor": encode_cursor(sort, rows[-1]) if has_more else None
+    }
+
+
+def get_cached_listing_feed(
+    db: Session,
+    listing_type: ListingType,
+    location: MajorCities,
+    logged_in: bool,
+    sort: FeedSort = FeedSort.NEWEST,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = None
+) -> Tuple[str, Optional[bytes]]:
+    """
+    Return one feed page as JSON bytes plus its ETag, using `feed_cache` when possible.
+
+    The ETag is derived from the partition's data version and the request
+    parameters, so a matching If-None-Match is answered with one cheap
+    index-only query (or none on a cache hit) and no page query at all.
+    The city's cache version is read before querying, so a listing written
+    while the page is being built leaves the stored page already stale.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        listing_type (ListingType): Listing type to filter on.
+        location (MajorCities): City to filter on.
+        logged_in (bool): Whether to expose owner phone numbers.
+        sort (FeedSort, optional): Sort order. Defaults to newest first.
+        limit (int, optional): Requested page size, capped at MAX_PAGE_SIZE.
+        cursor (str, optional): Cursor returned with the previous page.
+        if_none_match (str, optional): Client's If-None-Match header.
+
+    Returns:
+        Tuple[str, Optional[bytes]]: ETag and serialized page, or ETag and None
+        when the client's copy is still current.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    key = (listing_type, sort, limit, cursor, logged_in)
+
+    cached = feed_cache.get(location, key)
+    if cached is not None:
+        etag, body = cached
+        return etag, None if etag_matches(if_none_match, etag) else body
+
+    version = feed_cache.version(location)
+    data_version = listing_data_version(db, listing_type, location)
+    etag = make_etag("feed", data_version, location, *key)
+    if etag_matches(if_none_match, etag):
+        return etag, None
+
+    page = get_listing_feed(db, listing_type, location, logged_in, sort, limit, cursor)
+    body = JSONResponse(content=jsonable_encoder(page)).body
+    feed_cache.set(location, key, (etag, body), version)
+    return etag, body
@@ -0,0 +1,210 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Project-specific models and enums
+from app.database import SessionLocal
+from app.models.vehicle_listing import VehicleListing
+from app.enum import MajorCities
+from app.services.cache_service import feed_cache
+from app.services.etag_service import bump_listing_data_version
+from app.services.storage_service import UPLOAD_DIR, local_path, public_url, store_lock
+
+# --------------------------
+# Logger configuration
+# --------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Derivative configuration
+# --------------------------
+IMAGE_DERIVATIVES_ENABLED = os.getenv("IMAGE_DERIVATIVES_ENABLED", "true").lower() == "true"
+IMAGE_POOL_WORKERS = int(os.getenv("IMAGE_POOL_WORKERS", 2))
+IMAGE_THUMBNAIL_SIZE = tuple(int(v) for v in os.getenv("IMAGE_THUMBNAIL_SIZE", "480x360").split("x"))
+IMAGE_WEBP_MAX_SIDE = int(os.getenv("IMAGE_WEBP_MAX_SIDE", 1600))
+IMAGE_WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", 80))
+IMAGE_THUMBNAIL_QUALITY = int(os.getenv("IMAGE_THUMBNAIL_QUALITY", 75))
+
+# Derivatives mirror the originals' shard directories under /uploads/vehicles/derived
+DERIVED_DIR = UPLOAD_DIR / "derived"
+
+
+def _save_webp(image, path: Path, quality: int) -> None:
+    """Encode to a temporary file and rename it into place so readers never see a partial image."""
+    # Unique temp name: jobs for two listings sharing one original may run at once
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+    image.save(temp_path, "WEBP", quality=quality, method=4)
+    os.replace(temp_path, path)
+
+
+def build_derivatives(image_url: str) -> Dict[str, str]:
+    """
+    Generate the thumbnail and WebP variant for one uploaded original.
+
+    Runs in a worker process. Pillow is imported here so the API process
+    only needs it when derivatives are enabled. Originals are content
+    addressed, so derivatives that already exist for the same bytes are
+    reused instead of re-encoded.
+
+    Args:
+        image_url (str): URL of the original, e.g. /uploads/vehicles/<name>.jpg.
+
+    Returns:
+        Dict[str, str]: {"thumbnail_url": ..., "webp_url": ...}.
+    """
+    from PIL import Image, ImageOps
+
+    source = local_path(image_url)
+    target_dir = DERIVED_DIR / source.parent.relative_to(UPLOAD_DIR)
+    thumbnail_path = target_dir / f"{source.stem}_thumb.webp"
+    webp_path = target_dir / f"{source.stem}.webp"
+    urls = {"thumbnail_url": public_url(thumbnail_path), "webp_url": public_url(webp_path)}
+    with store_lock():
+        if thumbnail_path.exists() and webp_path.exists():
+            # Refresh the mtimes so the orphan sweep's grace period covers the new reference
+            os.utime(thumbnail_path)
+            os.utime(webp_path)
+            return urls
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+        # Fixed-size list-view thumbnail, center-cropped to the target aspect ratio
+        _save_webp(ImageOps.fit(image, IMAGE_THUMBNAIL_SIZE), thumbnail_path, IMAGE_THUMBNAIL_QUALITY)
+
+        # Full-view variant: same framing, capped size, compressed
+        variant = image.copy()
+        variant.thumbnail((IMAGE_WEBP_MAX_SIDE, IMAGE_WEBP_MAX_SIDE))
+        _save_webp(variant, webp_path, IMAGE_WEBP_QUALITY)
+
+    return urls
+
+
+def _record_derivatives(listing_id: int, location: MajorCities, urls: Dict[str, str]) -> None:
+    """Store derivative URLs on the listing, bump the city's data version and drop its cached feed pages."""
+    db = SessionLocal()
+    try:
+        db.query(VehicleListing).filter(VehicleListing.id == listing_id).update(urls, synchronize_session=False)
+        bump_listing_data_version(db, [location])
+        db.commit()
+    finally:
+        db.close()
+    feed_cache.invalidate(location)
+
+
+class ImagePipeline:
+    """
+    Process pool that turns uploaded originals into list-view derivatives.
+
+    Decoding and re-encoding multi-megapixel photos is CPU-bound, so it runs
+    in separate processes; the request that created the listing returns
+    immediately and the listing gains `thumbnail_url` / `webp_url` once its
+    job finishes. Until then the feed serves the original `image_url`.
+    """
+    def __init__(self, workers: int = IMAGE_POOL_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use."""
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that already runs the event loop and DB pools
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(self, listing_id: int, image_url: str, location: MajorCities) -> Optional[Future]:
+        """
+        Queue derivative generation for a newly committed listing.
+
+        Args:
+            listing_id (int): ID of the listing.
+            image_url (str): URL of the saved original.
+            location (MajorCities): City of the listing, for cache invalidation.
+
+        Returns:
+            Future: The job, or None when derivatives are disabled.
+        """
+        if not IMAGE_DERIVATIVES_ENABLED or not image_url:
+            return None
+
+        future = self._pool().submit(build_derivatives, image_url)
+
+        def _done(job: Future):
+            try:
+                _record_derivatives(listing_id, location, job.result())
+            except Exception as e:
+                logger.error(f"Image derivatives failed for listing {listing_id}: {str(e)}")
+
+        future.add_done_callback(_done)
+        return future
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, letting queued jobs finish."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+# --------------------------
+# Global pipeline instance
+# --------------------------
+image_pipeline = ImagePipeline()
+
+
+def backfill_derivatives(limit: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Generate derivatives for listings that have an image but no thumbnail yet.
+
+    Picks up listings created before the pipeline existed or whose job was
+    lost to a restart.
+
+    Args:
+        limit (int, optional): Max listings to process.
+
+    Returns:
+        Tuple[int, int]: (processed, failed).
+    """
+    db = SessionLocal()
+    try:
+        query = (
+            db.query(VehicleListing.id, VehicleListing.image_url, VehicleListing.location)
+            .filter(VehicleListing.image_url.isnot(None), VehicleListing.thumbnail_url.is_(None))
+            .order_by(VehicleListing.id)
+        )
+        rows = query.limit(limit).all() if limit else query.all()
+    finally:
+        db.close()
+
+    jobs = [(row, image_pipeline.submit(row.id, row.image_url, row.location)) for row in rows]
+    failed = 0
+    for row, job in jobs:
+        if job is not None and job.exception() is not None:
+            failed += 1
+    return len(jobs), failed
+
+
+if __name__ == "__main__":
+    # Offline backfill: python -m app.services.image_service [--limit N]
+    parser = argparse.ArgumentParser(description="Generate missing listing image derivatives.")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    processed, failed = backfill_derivatives(args.limit)
+    image_pipeline.shutdown()
+    logger.info(f"Backfilled image derivatives for {processed} listings ({failed} failed)")
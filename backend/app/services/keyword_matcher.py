@@ -0,0 +1,87 @@
+import re
+from typing import Dict, Hashable, List, Set
+
+# Words are runs of letters/digits; hyphens and spaces both separate tokens,
+# so "off-road" and "off road" match the same keyword.
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text (str): Raw text.
+
+    Returns:
+        List[str]: Word tokens in order.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+class KeywordMatcher:
+    """
+    Word-boundary-aware multi-phrase matcher compiled from a keyword knowledge base.
+
+    Every keyword phrase of every category is inserted once into a token trie.
+    Matching walks the query's tokens a single time and reports every
+    (group, label) whose keyword occurs as whole words, so "van" no longer
+    hits "advanced" and "ev" no longer hits "every".
+    """
+    _TERMINAL = object()
+
+    def __init__(self, knowledge_base: Dict[str, Dict[Hashable, dict]]):
+        """
+        Compile the knowledge base.
+
+        Args:
+            knowledge_base (dict): group -> label -> {"keywords": [phrases]}.
+        """
+        self._root: dict = {}
+        self._vocabulary: Set[str] = set()
+        self.max_phrase_length = 0
+
+        for group, labels in knowledge_base.items():
+            for label, data in labels.items():
+                for keyword in data["keywords"]:
+                    tokens = tokenize(keyword)
+                    if not tokens:
+                        continue
+                    node = self._root
+                    for token in tokens:
+                        node = node.setdefault(token, {})
+                    node.setdefault(self._TERMINAL, []).append((group, label))
+                    self._vocabulary.update(tokens)
+                    self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+
+    def _normalize(self, token: str) -> str:
+        """Fold a simple plural ("suvs", "bikes") onto a known keyword token."""
+        if token not in self._vocabulary and len(token) > 3 and token.endswith("s"):
+            singular = token[:-1]
+            if singular in self._vocabulary:
+                return singular
+        return token
+
+    def match(self, text: str) -> Dict[str, Set[Hashable]]:
+        """
+        Find every category whose keywords appear in the text.
+
+        Args:
+            text (str): Query text.
+
+        Returns:
+            Dict[str, Set[Hashable]]: group -> set of matched labels.
+        """
+        tokens = [self._normalize(token) for token in tokenize(text)]
+        hits: Dict[str, Set[Hashable]] = {}
+
+        for start in range(len(tokens)):
+            node = self._root
+            for token in tokens[start:start + self.max_phrase_length]:
+                node = node.get(token)
+                if node is None:
+                    break
+                for group, label in node.get(self._TERMINAL, ()):
+                    hits.setdefault(group, set()).add(label)
+
+        return hits
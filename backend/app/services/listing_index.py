@@ -0,0 +1,358 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+# Project-specific models and enums
+from app.database import SessionLocal
+from app.models.vehicle_listing import VehicleListing
+from app.models.vehicle import Vehicle
+from app.enum import BodyType, EngineType, ListingType, MajorCities, VehicleType
+
+# --------------------------
+# Logger configuration
+# --------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LISTING_INDEX_ENABLED = os.getenv("LISTING_INDEX_ENABLED", "true").lower() == "true"
+# Pick up listings created by other workers this often
+LISTING_INDEX_REFRESH_SECONDS = int(os.getenv("LISTING_INDEX_REFRESH_SECONDS", 30))
+# Re-read this many ids below the last one seen: ids are assigned at insert,
+# so a slow transaction can commit behind a later one
+LISTING_INDEX_REFRESH_OVERLAP_IDS = int(os.getenv("LISTING_INDEX_REFRESH_OVERLAP_IDS", 100))
+
+_INITIAL_CAPACITY = 1024
+
+
+def _codes(enum_cls) -> dict:
+    """Map each member of an enum to a small integer code."""
+    return {member: code for code, member in enumerate(enum_cls)}
+
+
+VEHICLE_TYPE_CODES = _codes(VehicleType)
+BODY_TYPE_CODES = _codes(BodyType)
+ENGINE_TYPE_CODES = _codes(EngineType)
+LOCATION_CODES = _codes(MajorCities)
+LISTING_TYPE_CODES = _codes(ListingType)
+
+
+class ListingAttributeIndex:
+    """
+    Resident, array-backed snapshot of listing attributes for recommendation scoring.
+
+    Each listing occupies one slot across parallel NumPy arrays (enum codes,
+    price, created_at), so a match score over every listing is a handful of
+    vectorized comparisons plus an argpartition for the top-k.
+
+    The index is cold until `warm` has loaded the table; callers must fall
+    back to the SQL path while `ready` is False. Listings created in this
+    process arrive through `add`; those created by other workers through
+    the periodic `refresh`. Suppressed listings keep their slot but are
+    masked out of every score.
+    """
+    _ARRAYS = (
+        ("ids", np.int64),
+        ("vehicle_type", np.int8),
+        ("body_type", np.int8),
+        ("engine_type", np.int8),
+        ("location", np.int8),
+        ("listing_type", np.int8),
+        ("price", np.float64),
+        ("created_at", "datetime64[s]"),
+        ("suppressed", np.bool_),
+    )
+
+    def __init__(self):
+        self.enabled = LISTING_INDEX_ENABLED
+        self.ready = False
+        self._lock = threading.Lock()
+        self._size = 0
+        self._max_id = 0
+        self._pending: List[tuple] = []
+        self._suppressed_ids: Set[int] = set()
+        self._allocate(_INITIAL_CAPACITY)
+
+    def _allocate(self, capacity: int) -> None:
+        """Grow (or create) every column to `capacity` slots, keeping existing data."""
+        for name, dtype in self._ARRAYS:
+            grown = np.zeros(capacity, dtype=dtype)
+            if hasattr(self, name):
+                grown[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    def _append(self, entries: Sequence[tuple]) -> None:
+        """Append encoded entries; caller must hold the lock."""
+        needed = self._size + len(entries)
+        if needed > self._capacity:
+            self._allocate(max(needed, self._capacity * 2))
+        if entries:
+            for (name, dtype), values in zip(self._ARRAYS, zip(*entries)):
+                getattr(self, name)[self._size:needed] = np.array(values, dtype=dtype)
+        self._size = needed
+
+    @staticmethod
+    def _encode(
+        listing_id: int,
+        vehicle_type: VehicleType,
+        body_type: BodyType,
+        engine_type: EngineType,
+        location: MajorCities,
+        listing_type: ListingType,
+        price: float,
+        created_at: Optional[datetime]
+    ) -> tuple:
+        """Convert one listing's attributes into array values."""
+        return (
+            listing_id,
+            VEHICLE_TYPE_CODES[vehicle_type],
+            BODY_TYPE_CODES[body_type],
+            ENGINE_TYPE_CODES[engine_type],
+            LOCATION_CODES[location],
+            LISTING_TYPE_CODES[listing_type],
+            price,
+            np.datetime64(created_at.replace(tzinfo=None), "s") if created_at else np.datetime64("NaT"),
+            False,
+        )
+
+    def warm(self, db: Session) -> None:
+        """
+        Load every listing into the index with one column query.
+
+        Listings added while the load is running are buffered by `add`
+        and merged afterwards, skipping any the load already picked up.
+        Suppressed listings are left out; any suppressed during the load
+        are masked once it finishes.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+        """
+        entries = [self._encode(*row) for row in self._query(db).all()]
+
+        with self._lock:
+            self._size = 0
+            self._append(entries)
+            if entries:
+                self._max_id = max(self._max_id, entries[-1][0])
+            loaded_ids = set(self.ids[:self._size].tolist())
+            self._append([entry for entry in self._pending if entry[0] not in loaded_ids])
+            self._pending.clear()
+            self._mask_suppressed(self._suppressed_ids)
+            self.ready = True
+
+        logger.info(f"Listing attribute index warmed with {self._size} listings")
+
+    @staticmethod
+    def _query(db: Session):
+        """Column query for the attributes of every unsuppressed listing, by id."""
+        return (
+            db.query(
+                VehicleListing.id,
+                Vehicle.vehicle_type,
+                Vehicle.body_type,
+                Vehicle.engine_type,
+                VehicleListing.location,
+                VehicleListing.listing_type,
+                VehicleListing.price,
+                VehicleListing.created_at,
+            )
+            .select_from(VehicleListing)
+            .join(Vehicle)
+            .filter(VehicleListing.suppressed_at.is_(None))
+            .order_by(VehicleListing.id)
+        )
+
+    def refresh(self, db: Session) -> int:
+        """
+        Load listings committed since the last warm-up or refresh, e.g. by other workers.
+
+        Incremental from the highest listing id seen by `warm`/`refresh`
+        (less a small overlap); listings this process already has through
+        `add` are skipped.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+
+        Returns:
+            int: Number of listings added to the index.
+        """
+        if not self.ready:
+            return 0
+
+        since = max(0, self._max_id - LISTING_INDEX_REFRESH_OVERLAP_IDS)
+        rows = self._query(db).filter(VehicleListing.id > since).all()
+        if not rows:
+            return 0
+
+        with self._lock:
+            known = set(self.ids[:self._size][self.ids[:self._size] > since].tolist())
+            entries = [self._encode(*row) for row in rows if row.id not in known]
+            self._append(entries)
+            self._max_id = max(self._max_id, rows[-1].id)
+            self._mask_suppressed(self._suppressed_ids & {entry[0] for entry in entries})
+        return len(entries)
+
+    def add(self, listing_id: int, vehicle_type: VehicleType, body_type: BodyType, engine_type: EngineType,
+            location: MajorCities, listing_type: ListingType, price: float, created_at: Optional[datetime]) -> None:
+        """
+        Record a newly committed listing.
+
+        Args:
+            listing_id (int): ID of the listing.
+            vehicle_type (VehicleType): Vehicle type.
+            body_type (BodyType): Body type.
+            engine_type (EngineType): Engine type.
+            location (MajorCities): City of the listing.
+            listing_type (ListingType): Sale or rental.
+            price (float): Listing price.
+            created_at (datetime, optional): Creation timestamp.
+        """
+        if not self.enabled:
+            return
+
+        entry = self._encode(listing_id, vehicle_type, body_type, engine_type, location, listing_type, price, created_at)
+        with self._lock:
+            if self.ready:
+                self._append([entry])
+            else:
+                self._pending.append(entry)
+
+    def _mask_suppressed(self, listing_ids: Iterable[int]) -> None:
+        """Flag the slots of the given listing ids; caller must hold the lock."""
+        listing_ids = list(listing_ids)
+        if listing_ids:
+            self.suppressed[:self._size] |= np.isin(self.ids[:self._size], listing_ids)
+
+    def suppress(self, listing_ids: Iterable[int]) -> None:
+        """
+        Exclude listings from all future rankings.
+
+        Args:
+            listing_ids (Iterable[int]): IDs of suppressed listings.
+        """
+        new_ids = set(listing_ids)
+        with self._lock:
+            new_ids -= self._suppressed_ids
+            self._suppressed_ids |= new_ids
+            if self.ready:
+                self._mask_suppressed(new_ids)
+
+    def disable(self) -> None:
+        """Stop buffering new listings after a failed warm-up."""
+        with self._lock:
+            self.enabled = False
+            self._pending.clear()
+
+    def top_k(
+        self,
+        vehicle_type: Optional[VehicleType],
+        body_types: Optional[List[BodyType]],
+        engine_type: Optional[EngineType],
+        location: Optional[MajorCities],
+        k: int,
+        weights: Tuple[int, int, int],
+        min_score: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Score every listing against the preferences and return the best k.
+
+        Ordering is score descending, then listing id ascending, matching the
+        SQL recommendation query exactly.
+
+        Args:
+            vehicle_type (VehicleType, optional): Preferred vehicle type.
+            body_types (List[BodyType], optional): Preferred body types.
+            engine_type (EngineType, optional): Preferred engine type.
+            location (MajorCities, optional): City filter.
+            k (int): Number of results.
+            weights (Tuple[int, int, int]): Vehicle, body and engine type weights.
+            min_score (int): Listings must score strictly above this.
+
+        Returns:
+            List[Tuple[int, int]]: (listing id, score) pairs, best first.
+        """
+        with self._lock:
+            size = self._size
+            ids = self.ids[:size]
+            vehicle_codes = self.vehicle_type[:size]
+            body_codes = self.body_type[:size]
+            engine_codes = self.engine_type[:size]
+            location_codes = self.location[:size]
+            suppressed = self.suppressed[:size].copy()
+
+        vehicle_weight, body_weight, engine_weight = weights
+        score = np.zeros(size, dtype=np.int64)
+        if vehicle_type:
+            score += (vehicle_codes == VEHICLE_TYPE_CODES[vehicle_type]) * vehicle_weight
+        if body_types:
+            score += np.isin(body_codes, [BODY_TYPE_CODES[bt] for bt in body_types]) * body_weight
+        if engine_type:
+            score += (engine_codes == ENGINE_TYPE_CODES[engine_type]) * engine_weight
+        np.minimum(score, 100, out=score)
+
+        mask = (score > min_score) & ~suppressed
+        if location is not None:
+            mask &= location_codes == LOCATION_CODES[location]
+
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return []
+
+        # One unique key per listing: higher score first, then lower id
+        keys = -(score[candidates] << 32) + ids[candidates]
+        if candidates.size > k:
+            top = np.argpartition(keys, k - 1)[:k]
+            candidates, keys = candidates[top], keys[top]
+        order = np.argsort(keys)
+
+        return [(int(ids[i]), int(score[i])) for i in candidates[order]]
+
+
+# --------------------------
+# Global index instance
+# --------------------------
+listing_index = ListingAttributeIndex()
+
+
+def start_background_warmup(interval_seconds: int = LISTING_INDEX_REFRESH_SECONDS) -> threading.Thread:
+    """
+    Warm `listing_index` on a daemon thread, then `refresh` it every `interval_seconds`.
+
+    Startup is not blocked by the load. A failed warm-up disables the index
+    for good; a failed refresh is retried at the next interval.
+
+    Returns:
+        threading.Thread: The started warm-up/refresh thread.
+    """
+    def _loop():
+        db = SessionLocal()
+        try:
+            listing_index.warm(db)
+        except Exception as e:
+            listing_index.disable()
+            logger.error(f"Listing attribute index warm-up failed, staying on SQL ranking: {str(e)}")
+            return
+        finally:
+            db.close()
+
+        while True:
+            time.sleep(interval_seconds)
+            db = SessionLocal()
+            try:
+                added = listing_index.refresh(db)
+                if added:
+                    logger.info(f"Listing attribute index picked up {added} listings from other workers")
+            except Exception as e:
+                logger.error(f"Listing attribute index refresh failed: {str(e)}")
+            finally:
+                db.close()
+
+    thread = threading.Thread(target=_loop, name="listing-index-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,145 @@
+import codecs
+import csv
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+# --------------------------
+# Manifest configuration
+# --------------------------
+MANIFEST_CHUNK_SIZE = int(os.getenv("MANIFEST_CHUNK_SIZE", 64 * 1024))
+MANIFEST_MAX_LINE_BYTES = int(os.getenv("MANIFEST_MAX_LINE_BYTES", 16 * 1024))
+
+CSV_EXTENSIONS = {".csv"}
+NDJSON_EXTENSIONS = {".ndjson", ".jsonl"}
+
+# (line number, record, error); record is None when the line could not be parsed
+ManifestRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+def _manifest_format(file: UploadFile) -> str:
+    """
+    Pick "csv" or "ndjson" from the file name, falling back to the content type.
+
+    Clients often send `text/csv` or a generic type whatever the file is, so
+    a known extension always wins; the content type only decides for names
+    without one.
+    """
+    extension = Path(file.filename or "").suffix.lower()
+    if extension in CSV_EXTENSIONS:
+        return "csv"
+    if extension in NDJSON_EXTENSIONS:
+        return "ndjson"
+    content_type = (file.content_type or "").lower()
+    if "csv" in content_type:
+        return "csv"
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    raise HTTPException(
+        status_code=400,
+        detail=f"Unsupported manifest type. Allowed: {', '.join(sorted(CSV_EXTENSIONS | NDJSON_EXTENSIONS))}"
+    )
+
+
+async def _iter_lines(file: UploadFile) -> AsyncIterator[str]:
+    """Yield decoded text lines, reading the upload in MANIFEST_CHUNK_SIZE chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    while chunk := await file.read(MANIFEST_CHUNK_SIZE):
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        if len(pending) > MANIFEST_MAX_LINE_BYTES:
+            raise HTTPException(status_code=400, detail="Manifest line too long")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+class _LineFeed(deque):
+    """Line queue a long-lived csv.reader pulls from; an empty queue ends the current pull only."""
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self:
+            raise StopIteration
+        return self.popleft()
+
+
+async def iter_manifest_rows(file: UploadFile) -> AsyncIterator[ManifestRow]:
+    """
+    Stream the records of a CSV (with header row) or NDJSON manifest.
+
+    Only one chunk and the current record are held in memory, so manifests
+    with many thousands of rows can be processed while they are read.
+    Quoted CSV fields may span lines (e.g. multi-line descriptions). Blank
+    lines are skipped; line numbers are 1-based, count the CSV header and
+    give the first line of a record.
+
+    Args:
+        file (UploadFile): Uploaded .csv, .ndjson or .jsonl file.
+
+    Yields:
+        ManifestRow: (line number, record with lower-cased keys or None, parse error or None).
+
+    Raises:
+        HTTPException: If the format is unsupported, the CSV has no header or a line or record is too long.
+    """
+    manifest_format = _manifest_format(file)
+    header = None
+    line_no = 0
+    # One csv.reader for the whole file, fed a record's lines once its quotes
+    # balance, so a quoted field spanning lines is never cut short
+    csv_lines = _LineFeed()
+    csv_rows = csv.reader(csv_lines)
+    record_line_no = 0
+    record_quotes = 0
+    record_bytes = 0
+
+    async for line in _iter_lines(file):
+        line_no += 1
+        if manifest_format == "ndjson":
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "Each line must be a JSON object"
+                continue
+            yield line_no, {str(k).strip().lower(): v for k, v in record.items()}, None
+            continue
+
+        if not csv_lines:
+            if not line.strip():
+                continue
+            record_line_no, record_quotes, record_bytes = line_no, 0, 0
+        csv_lines.append(line + "\n")
+        record_quotes += line.count('"')
+        record_bytes += len(line)
+        if record_bytes > MANIFEST_MAX_LINE_BYTES:
+            raise HTTPException(status_code=400, detail="Manifest record too long")
+        if record_quotes % 2:
+            continue
+
+        while csv_lines:
+            values = next(csv_rows)
+            if header is None:
+                header = [name.strip().lower() for name in values]
+            elif len(values) != len(header):
+                yield record_line_no, None, f"Expected {len(header)} columns, got {len(values)}"
+            else:
+                yield record_line_no, dict(zip(header, (value.strip() for value in values))), None
+
+    if csv_lines:
+        yield record_line_no, None, "Unterminated quoted field"
+    if manifest_format == "csv" and header is None:
+        raise HTTPException(status_code=400, detail="Manifest is empty or missing its header row")
@@ -0,0 +1,195 @@
+import hmac
+import os
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from fastapi import Header, HTTPException
+from sqlalchemy.pool import Pool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.metrics import Histogram, TimedCheckoutMixin
+
+# --------------------------
+# Metrics configuration
+# --------------------------
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Bearer token for /metrics, /cache/stats and /auth/pool/stats; unset disables them
+DIAGNOSTICS_TOKEN = os.getenv("DIAGNOSTICS_TOKEN", "")
+
+# Upper bounds in seconds; an implicit +Inf bucket follows
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+RECOMMENDATION_PHASES = ("extract", "query", "score", "serialize")
+
+# Other request methods share one "other" label
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# --------------------------
+# Recorded metrics
+# --------------------------
+
+# route template -> method -> latency histogram
+_route_latency: Dict[str, Dict[str, Histogram]] = {}
+_in_flight = 0
+_recommendation_phases = {phase: Histogram(PHASE_BUCKETS) for phase in RECOMMENDATION_PHASES}
+
+
+def observe_phase(phase: str, seconds: float) -> None:
+    """
+    Record the duration of one recommendation phase.
+
+    Args:
+        phase (str): One of RECOMMENDATION_PHASES.
+        seconds (float): Elapsed time.
+    """
+    _recommendation_phases[phase].observe(seconds)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording in-flight requests and latency per route template.
+
+    Latency is keyed by the matched route's path template (`/vehicles/listings`,
+    not the raw URL) and by method, with methods outside HTTP_METHODS counted
+    as `other`, so label cardinality stays bounded. Mounted apps are keyed by
+    their mount path and unmatched requests by `<unmatched>`.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        global _in_flight
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        _in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _in_flight -= 1
+            route = scope.get("route")
+            template = route.path if route is not None else scope.get("root_path") or "<unmatched>"
+            by_method = _route_latency.get(template)
+            if by_method is None:
+                by_method = _route_latency[template] = {}
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "other"
+            histogram = by_method.get(method)
+            if histogram is None:
+                histogram = by_method[method] = Histogram(REQUEST_BUCKETS)
+            histogram.observe(time.perf_counter() - started)
+
+
+# --------------------------
+# Access
+# --------------------------
+
+def require_diagnostics_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Route dependency admitting only requests that carry `Authorization: Bearer <DIAGNOSTICS_TOKEN>`.
+
+    Args:
+        authorization (str, optional): The request's Authorization header.
+
+    Raises:
+        HTTPException: 404 when DIAGNOSTICS_TOKEN is not configured, 401 when the token is missing or wrong.
+    """
+    if not DIAGNOSTICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), DIAGNOSTICS_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid diagnostics token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+
+# --------------------------
+# Exposition
+# --------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _family(lines: List[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _pool_lines(lines: List[str], pools: Mapping[str, Pool]) -> None:
+    gauges = (
+        ("size", "Configured pool size", "size"),
+        ("checked_out", "Connections currently checked out", "checkedout"),
+        ("overflow", "Connections open beyond pool_size (negative while the pool is not full)", "overflow"),
+    )
+    for suffix, help_text, method in gauges:
+        name = f"shuttle_db_pool_{suffix}"
+        _family(lines, name, "gauge", help_text)
+        for pool_name, pool in pools.items():
+            if hasattr(pool, method):
+                lines.append(f'{name}{{pool="{pool_name}"}} {getattr(pool, method)()}')
+
+    timed = {pool_name: pool for pool_name, pool in pools.items() if isinstance(pool, TimedCheckoutMixin)}
+    _family(lines, "shuttle_db_pool_checkout_wait_seconds", "histogram",
+            "Time spent waiting for a pooled connection (count = checkouts)")
+    for pool_name, pool in timed.items():
+        lines.extend(pool.wait_seconds.samples("shuttle_db_pool_checkout_wait_seconds", f'pool="{pool_name}"'))
+    _family(lines, "shuttle_db_pool_checkout_timeouts_total", "counter", "Checkouts that hit pool_timeout")
+    for pool_name, pool in timed.items():
+        lines.append(f'shuttle_db_pool_checkout_timeouts_total{{pool="{pool_name}"}} {pool.timeouts}')
+
+
+def render_metrics(
+    pools: Optional[Mapping[str, Pool]] = None,
+    components: Optional[Mapping[str, Mapping[str, object]]] = None,
+    counters: Iterable[Tuple[str, str, float]] = ()
+) -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Args:
+        pools (Mapping[str, Pool], optional): Connection pools by label.
+        components (Mapping[str, Mapping], optional): `stats()` dicts of caches and
+            pools by label; their numeric values are exported as gauges.
+        counters (Iterable[Tuple[str, str, float]], optional): Extra (name, help, value) counters.
+
+    Returns:
+        str: Exposition text.
+    """
+    lines: List[str] = []
+
+    _family(lines, "shuttle_http_requests_in_flight", "gauge", "Requests currently being served")
+    lines.append(f"shuttle_http_requests_in_flight {_in_flight}")
+
+    _family(lines, "shuttle_http_request_duration_seconds", "histogram", "Request latency by route template")
+    for template, by_method in list(_route_latency.items()):
+        for method, histogram in list(by_method.items()):
+            labels = f'method="{method}",route="{_escape(template)}"'
+            lines.extend(histogram.samples("shuttle_http_request_duration_seconds", labels))
+
+    _family(lines, "shuttle_recommendation_phase_seconds", "histogram",
+            "Recommendation time by phase (extract, query, score, serialize)")
+    for phase, histogram in _recommendation_phases.items():
+        lines.extend(histogram.samples("shuttle_recommendation_phase_seconds", f'phase="{phase}"'))
+
+    if pools:
+        _pool_lines(lines, pools)
+
+    for name, help_text, value in counters:
+        _family(lines, name, "counter", help_text)
+        lines.append(f"{name} {value}")
+
+    for component, stats in (components or {}).items():
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"shuttle_{component}_{key}"
+            _family(lines, name, "gauge", f"{component} {key.replace('_', ' ')}")
+            lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
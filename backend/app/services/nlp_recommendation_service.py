@@ -1,13 +1,23 @@
 import logging
+import os
+import time
 from typing import List, Optional
-from dataclasses import dataclass
+
+import numpy as np
+from dataclasses import dataclass, replace
+from sqlalchemy import case, or_
 from sqlalchemy.orm import Session
 
 # Project-specific models and schemas
 from app.models.vehicle_listing import VehicleListing
 from app.models.vehicle import Vehicle
-from app.models.user import User
 from app.schemas.vehicle_listing import VehicleListingOut
+from app.services.feed_service import query_feed_rows
+from app.services.cache_service import LRUCache
+from app.services.keyword_matcher import KeywordMatcher, tokenize
+from app.services.listing_index import listing_index
+from app.services.metrics_service import observe_phase
+from app.services.text_index import text_index
 from app.enum import VehicleType, BodyType, EngineType, MajorCities
 
 # --------------------------
@@ -16,6 +26,26 @@ from app.enum import VehicleType, BodyType, EngineType, MajorCities
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# --------------------------
+# Match scoring weights
+# --------------------------
+VEHICLE_TYPE_WEIGHT = 30
+BODY_TYPE_WEIGHT = 20
+ENGINE_TYPE_WEIGHT = 15
+MIN_MATCH_SCORE = 20  # Listings must score strictly above this to be recommended
+
+# --------------------------
+# Text similarity blending
+# --------------------------
+TEXT_SIMILARITY_WEIGHT = float(os.getenv("TEXT_SIMILARITY_WEIGHT", 10))
+TEXT_RERANK_POOL_FACTOR = int(os.getenv("TEXT_RERANK_POOL_FACTOR", 5))  # Structured candidates per result to rerank
+
+# --------------------------
+# Preference memo configuration
+# --------------------------
+PREFERENCE_CACHE_MAX_ENTRIES = int(os.getenv("PREFERENCE_CACHE_MAX_ENTRIES", 4096))
+PREFERENCE_CACHE_TTL_SECONDS = float(os.getenv("PREFERENCE_CACHE_TTL_SECONDS", 3600))
+
 
 @dataclass
 class ExtractedPreferences:
@@ -35,6 +65,22 @@ class NLPRecommendationService:
     """
     def __init__(self):
         self.vehicle_knowledge = self._build_knowledge_base()
+        self.matcher = KeywordMatcher(self.vehicle_knowledge)
+
+        # Normalized query text -> ExtractedPreferences, tagged with the knowledge-base version
+        self.preference_cache = LRUCache(PREFERENCE_CACHE_MAX_ENTRIES, PREFERENCE_CACHE_TTL_SECONDS)
+        self.knowledge_version = 0
+
+    def reload_knowledge_base(self) -> None:
+        """
+        Rebuild the keyword knowledge base and matcher, and flush memoized preferences.
+
+        Call this whenever `_build_knowledge_base` can return different data.
+        """
+        self.vehicle_knowledge = self._build_knowledge_base()
+        self.matcher = KeywordMatcher(self.vehicle_knowledge)
+        self.knowledge_version += 1
+        self.preference_cache.clear()
 
     def _build_knowledge_base(self) -> dict:
         """
@@ -84,7 +130,10 @@ class NLPRecommendationService:
 
     def extract_preferences(self, query: str) -> ExtractedPreferences:
         """
-        Extract vehicle preferences from a user query string.
+        Extract vehicle preferences from a user query string, memoized on its normalized text.
+
+        Queries that differ only in case, punctuation or spacing share one
+        cache entry, since the matcher only sees their word tokens.
 
         Args:
             query (str): User input query.
@@ -92,39 +141,112 @@ class NLPRecommendationService:
         Returns:
             ExtractedPreferences: Structured preference data with confidence score.
         """
-        q = query.lower()
+        normalized = " ".join(tokenize(query))
+        version = self.knowledge_version
+
+        preferences = self.preference_cache.get(normalized, version)
+        if preferences is None:
+            preferences = self._extract_preferences(normalized)
+            self.preference_cache.set(normalized, preferences, version)
+
+        # Hand out a copy so callers cannot mutate the memoized entry
+        return replace(
+            preferences,
+            body_types=list(preferences.body_types) if preferences.body_types else None,
+            purposes=list(preferences.purposes) if preferences.purposes else None
+        )
+
+    def _extract_preferences(self, query: str) -> ExtractedPreferences:
+        """
+        Match a query against the knowledge base (uncached).
+
+        Args:
+            query (str): Normalized query text.
+
+        Returns:
+            ExtractedPreferences: Structured preference data with confidence score.
+        """
+        hits = self.matcher.match(query)
         preferences = ExtractedPreferences(confidence_score=70)
 
+        # Hits are resolved in knowledge-base order so precedence matches the keyword tables
+
         # Vehicle type
-        for vt, data in self.vehicle_knowledge["vehicle_types"].items():
-            if any(k in q for k in data["keywords"]):
-                preferences.vehicle_type = vt
-                break
+        matched = hits.get("vehicle_types", ())
+        preferences.vehicle_type = next(
+            (vt for vt in self.vehicle_knowledge["vehicle_types"] if vt in matched), None
+        )
 
         # Body types
-        body_types = [
-            bt for bt, data in self.vehicle_knowledge["body_types"].items() if any(k in q for k in data["keywords"])
-        ]
+        matched = hits.get("body_types", ())
+        body_types = [bt for bt in self.vehicle_knowledge["body_types"] if bt in matched]
         preferences.body_types = body_types if body_types else None
 
         # Engine type
-        for et, data in self.vehicle_knowledge["engine_types"].items():
-            if any(k in q for k in data["keywords"]):
-                preferences.engine_type = et
-                break
+        matched = hits.get("engine_types", ())
+        preferences.engine_type = next(
+            (et for et in self.vehicle_knowledge["engine_types"] if et in matched), None
+        )
 
         # Purposes
-        purposes = [
-            purpose for purpose, data in self.vehicle_knowledge["purposes"].items() if any(k in q for k in data["keywords"])
-        ]
+        matched = hits.get("purposes", ())
+        purposes = [purpose for purpose in self.vehicle_knowledge["purposes"] if purpose in matched]
         preferences.purposes = purposes if purposes else None
 
         return preferences
 
+    @staticmethod
+    def _listing_dict_from_row(row) -> dict:
+        """
+        Build a recommendation listing dict straight from a flat feed row.
+
+        Rows come from typed columns, so no per-row schema validation is
+        needed here; the response is validated once at serialization time.
+
+        Args:
+            row (Row): Row from `query_feed_rows`.
+
+        Returns:
+            dict: Listing fields with nested vehicle and owner details.
+        """
+        return {
+            "id": row.id,
+            "vehicle_id": row.vehicle_id,
+            "listed_by": row.listed_by,
+            "title": row.title,
+            "description": row.description,
+            "listing_type": row.listing_type,
+            "price": row.price,
+            "location": row.location,
+            "image_url": row.image_url,
+            "thumbnail_url": row.thumbnail_url,
+            "webp_url": row.webp_url,
+            "created_at": row.created_at,
+            "vehicle": {
+                "id": row.vehicle_id,
+                "vehicle_no": row.vehicle_no,
+                "vehicle_type": row.vehicle_type,
+                "engine_type": row.engine_type,
+                "engine_battery_capacity": row.engine_battery_capacity,
+                "body_type": row.body_type,
+                "company": row.company,
+                "model_name": row.model_name,
+            },
+            "user": {
+                "id": row.listed_by,
+                "fullname": row.fullname,
+                "phone_number": row.phone_number,
+            },
+        }
+
     def calculate_match_score(self, listing: VehicleListingOut, preferences: ExtractedPreferences) -> float:
         """
         Calculate a match score between a listing and extracted preferences.
 
+        Reference definition of the score: recommendations are ranked by its
+        SQL translation (`_match_score_sql`) or the attribute index, and
+        tests/test_match_scores.py checks both against it.
+
         Args:
             listing (VehicleListingOut): Vehicle listing output schema.
             preferences (ExtractedPreferences): User preferences.
@@ -134,14 +256,184 @@ class NLPRecommendationService:
         """
         score = 0
         if preferences.vehicle_type and listing.vehicle.vehicle_type == preferences.vehicle_type:
-            score += 30
+            score += VEHICLE_TYPE_WEIGHT
         if preferences.body_types and listing.vehicle.body_type in preferences.body_types:
-            score += 20
+            score += BODY_TYPE_WEIGHT
         if preferences.engine_type and listing.vehicle.engine_type == preferences.engine_type:
-            score += 15
+            score += ENGINE_TYPE_WEIGHT
         return min(score, 100)
 
-    def get_recommendations(self, db: Session, query: str, location: str = None, limit: int = 10) -> dict:
+    @staticmethod
+    def _match_score_sql(preferences: ExtractedPreferences) -> tuple:
+        """
+        Translate `calculate_match_score` into SQL.
+
+        Args:
+            preferences (ExtractedPreferences): User preferences.
+
+        Returns:
+            tuple: (score expression, list of per-preference match predicates),
+            or (None, []) when no preference can contribute to the score.
+        """
+        weighted = []
+        if preferences.vehicle_type:
+            weighted.append((Vehicle.vehicle_type == preferences.vehicle_type, VEHICLE_TYPE_WEIGHT))
+        if preferences.body_types:
+            weighted.append((Vehicle.body_type.in_(preferences.body_types), BODY_TYPE_WEIGHT))
+        if preferences.engine_type:
+            weighted.append((Vehicle.engine_type == preferences.engine_type, ENGINE_TYPE_WEIGHT))
+
+        if not weighted:
+            return None, []
+
+        # The weights sum to well below 100, so the Python min(score, 100) cap never applies
+        terms = [case((predicate, weight), else_=0) for predicate, weight in weighted]
+        score = terms[0]
+        for term in terms[1:]:
+            score = score + term
+        return score, [predicate for predicate, _ in weighted]
+
+    def _rank_with_sql(
+        self,
+        db: Session,
+        preferences: ExtractedPreferences,
+        location: Optional[MajorCities],
+        limit: int
+    ) -> list:
+        """
+        Select and rank the top candidates entirely in the database.
+
+        Args:
+            db (Session): Database session.
+            preferences (ExtractedPreferences): User preferences.
+            location (MajorCities, optional): City filter.
+            limit (int): Max number of results.
+
+        Returns:
+            list: (feed row, match score) pairs, best first.
+        """
+        score, predicates = self._match_score_sql(preferences)
+        if score is None:
+            return []
+
+        # Only candidates above the threshold leave the database, already ranked;
+        # id breaks score ties in insertion order, like the former stable sort
+        db_query = (
+            query_feed_rows(db)
+            .add_columns(score.label("match_score"))
+            .filter(or_(*predicates), score > MIN_MATCH_SCORE)
+        )
+        if location:
+            db_query = db_query.filter(VehicleListing.location == location)
+
+        rows = db_query.order_by(score.desc(), VehicleListing.id.asc()).limit(limit).all()
+        return [(row, row.match_score) for row in rows]
+
+    def _score_with_index(
+        self,
+        preferences: ExtractedPreferences,
+        location: Optional[MajorCities],
+        limit: int
+    ) -> list:
+        """
+        Rank candidates with the in-memory attribute index, without touching the database.
+
+        Args:
+            preferences (ExtractedPreferences): User preferences.
+            location (MajorCities, optional): City filter.
+            limit (int): Max number of results.
+
+        Returns:
+            list: (listing id, match score) pairs, best first.
+        """
+        return listing_index.top_k(
+            vehicle_type=preferences.vehicle_type,
+            body_types=preferences.body_types,
+            engine_type=preferences.engine_type,
+            location=location,
+            k=limit,
+            weights=(VEHICLE_TYPE_WEIGHT, BODY_TYPE_WEIGHT, ENGINE_TYPE_WEIGHT),
+            min_score=MIN_MATCH_SCORE
+        )
+
+    def _fetch_ranked_rows(self, db: Session, top: list) -> list:
+        """
+        Fetch the feed rows of index-ranked listings, keeping the ranking order.
+
+        Args:
+            db (Session): Database session.
+            top (list): (listing id, match score) pairs from `_score_with_index`.
+
+        Returns:
+            list: (feed row, match score) pairs, best first.
+        """
+        if not top:
+            return []
+
+        rows = query_feed_rows(db).filter(VehicleListing.id.in_([listing_id for listing_id, _ in top])).all()
+        rows_by_id = {row.id: row for row in rows}
+        return [(rows_by_id[listing_id], score) for listing_id, score in top if listing_id in rows_by_id]
+
+    def _rerank_by_text(self, query: str, ranked: list, limit: int, query_vector: Optional[np.ndarray] = None) -> list:
+        """
+        Blend precomputed text similarity into structured match scores and keep the best.
+
+        Args:
+            query (str): User query.
+            ranked (list): (row, score) pairs from the structured ranker.
+            limit (int): Max number of results.
+            query_vector (np.ndarray, optional): Precomputed `query_vector(query)`.
+
+        Returns:
+            list: (row, blended score) pairs, best first (ties by listing id).
+        """
+        try:
+            similarity = text_index.similarity(query, [row.id for row, _ in ranked], query_vector)
+        except Exception as e:
+            logger.error(f"Text similarity failed, using structured scores: {str(e)}")
+            return ranked[:limit]
+
+        blended = [
+            (row, round(score + TEXT_SIMILARITY_WEIGHT * max(similarity.get(row.id, 0.0), 0.0), 2))
+            for row, score in ranked
+        ]
+        blended.sort(key=lambda item: (-item[1], item[0].id))
+        return blended[:limit]
+
+    @staticmethod
+    def _text_rerank_enabled() -> bool:
+        """Whether recommendations are reranked by text similarity right now."""
+        return text_index.ready and TEXT_SIMILARITY_WEIGHT > 0
+
+    def query_vector(self, query: str) -> Optional[np.ndarray]:
+        """
+        Embed a query for text reranking, or return None when reranking is off.
+
+        spaCy work is CPU-bound: async callers run this in the threadpool and
+        pass the result to `get_recommendations`, so the event loop never runs it.
+
+        Args:
+            query (str): User query.
+
+        Returns:
+            np.ndarray: Query vector, or None.
+        """
+        if not self._text_rerank_enabled():
+            return None
+        try:
+            return text_index.embed_query(query)
+        except Exception as e:
+            logger.error(f"Query embedding failed, using structured scores: {str(e)}")
+            return None
+
+    def get_recommendations(
+        self,
+        db: Session,
+        query: str,
+        location: str = None,
+        limit: int = 10,
+        query_vector: Optional[np.ndarray] = None
+    ) -> dict:
         """
         Generate a list of recommended vehicle listings based on a query and optional location.
 
@@ -150,45 +442,59 @@ class NLPRecommendationService:
             query (str): User query.
             location (str, optional): City filter. Defaults to None.
             limit (int, optional): Max number of results. Defaults to 10.
+            query_vector (np.ndarray, optional): Precomputed `query_vector(query)`; embedded here when omitted.
 
         Returns:
             dict: Recommendations and query analysis.
         """
+        started = time.perf_counter()
         preferences = self.extract_preferences(query)
+        observe_phase("extract", time.perf_counter() - started)
 
-        db_query = db.query(VehicleListing).join(Vehicle).join(User)
-
+        location_enum = None
         if location:
             try:
                 location_enum = MajorCities(location)
-                db_query = db_query.filter(VehicleListing.location == location_enum)
             except ValueError:
                 logger.warning(f"Invalid location provided: {location}")
 
-        listings = db_query.all()
+        # With text vectors available, widen the structured pool and rerank it by blended score
+        rerank = self._text_rerank_enabled()
+        pool_size = limit * TEXT_RERANK_POOL_FACTOR if rerank else limit
+
+        # The resident attribute index answers without scanning, then only the winners are
+        # fetched; until it is warm, rank in SQL (scoring is then part of the query phase)
+        score_seconds = None
+        if listing_index.ready:
+            started = time.perf_counter()
+            top = self._score_with_index(preferences, location_enum, pool_size)
+            fetched = time.perf_counter()
+            ranked = self._fetch_ranked_rows(db, top)
+            score_seconds = fetched - started
+            observe_phase("query", time.perf_counter() - fetched)
+        else:
+            started = time.perf_counter()
+            ranked = self._rank_with_sql(db, preferences, location_enum, pool_size)
+            observe_phase("query", time.perf_counter() - started)
+
+        if rerank and ranked:
+            started = time.perf_counter()
+            ranked = self._rerank_by_text(query, ranked, limit, query_vector)
+            score_seconds = (score_seconds or 0.0) + time.perf_counter() - started
+        if score_seconds is not None:
+            observe_phase("score", score_seconds)
 
         recs = []
-        for l in listings:
-            l_out = VehicleListingOut.model_validate(l)
-            score = self.calculate_match_score(l_out, preferences)
-            if score > 20:
-                listing_dict = l_out.model_dump()
-                listing_dict["user"] = {
-                    "id": l.user.id,
-                    "fullname": l.user.fullname,
-                    "phone_number": l.user.phone_number
-                }
-                recs.append({
-                    "listing": listing_dict,
-                    "match_score": score,
-                    "match_reasons": ["Matches your preferences"],
-                    "confidence": preferences.confidence_score
-                })
-
-        recs.sort(key=lambda x: x["match_score"], reverse=True)
+        for row, score in ranked:
+            recs.append({
+                "listing": self._listing_dict_from_row(row),
+                "match_score": score,
+                "match_reasons": ["Matches your preferences"],
+                "confidence": preferences.confidence_score
+            })
 
         return {
-            "recommendations": recs[:limit],
+            "recommendations": recs,
             "query_analysis": f"Processed '{query}'" + (f" for location '{location}'" if location else ""),
             "extracted_preferences": {
                 "vehicle_type": preferences.vehicle_type.value if preferences.vehicle_type else None,
@@ -0,0 +1,126 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException
+
+# --------------------------
+# Password pool configuration
+# --------------------------
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+PASSWORD_POOL_MAX_QUEUE = int(os.getenv("PASSWORD_POOL_MAX_QUEUE", 16))
+PASSWORD_POOL_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_POOL_RETRY_AFTER_SECONDS", 1))
+
+T = TypeVar("T")
+
+# Milliseconds of password work (queue wait, hashing) done for the current request
+_request_wait_ms: contextvars.ContextVar[float] = contextvars.ContextVar("password_wait_ms", default=0.0)
+_request_hash_ms: contextvars.ContextVar[float] = contextvars.ContextVar("password_hash_ms", default=0.0)
+
+
+class PasswordPool:
+    """
+    Bounded thread pool for bcrypt hashing and verification.
+
+    bcrypt releases the GIL while it works, so a few threads keep its
+    100-300 ms of CPU per call off the event loop. At most `workers` calls
+    run and `max_queue` more wait; anything beyond that is rejected at once
+    with 503 so a burst of logins cannot back up the rest of the API.
+    """
+    def __init__(self, workers: int = PASSWORD_POOL_WORKERS, max_queue: int = PASSWORD_POOL_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait_ms = 0.0
+        self._total_hash_ms = 0.0
+        self._max_hash_ms = 0.0
+
+    def _acquire(self) -> None:
+        """Reserve a slot or raise 503 when every worker and queue slot is taken."""
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server busy, please retry",
+                    headers={"Retry-After": str(PASSWORD_POOL_RETRY_AFTER_SECONDS)}
+                )
+            self._in_flight += 1
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run a password function on the pool and record its timing.
+
+        Args:
+            fn (Callable): Blocking function, e.g. `get_password_hash`.
+            *args: Arguments for `fn`.
+
+        Returns:
+            The return value of `fn`.
+
+        Raises:
+            HTTPException: 503 if the pool and its queue are full.
+        """
+        self._acquire()
+        submitted = time.perf_counter()
+        timing = {}
+
+        def _timed():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                timing["wait_ms"] = (started - submitted) * 1000
+                timing["hash_ms"] = (time.perf_counter() - started) * 1000
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, _timed)
+        finally:
+            wait_ms, hash_ms = timing.get("wait_ms", 0.0), timing.get("hash_ms", 0.0)
+            _request_wait_ms.set(_request_wait_ms.get() + wait_ms)
+            _request_hash_ms.set(_request_hash_ms.get() + hash_ms)
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._total_wait_ms += wait_ms
+                self._total_hash_ms += hash_ms
+                self._max_hash_ms = max(self._max_hash_ms, hash_ms)
+
+    def stats(self) -> dict:
+        """Return pool occupancy and timing counters."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait_ms / completed, 2) if completed else 0.0,
+                "avg_hash_ms": round(self._total_hash_ms / completed, 2) if completed else 0.0,
+                "max_hash_ms": round(self._max_hash_ms, 2),
+            }
+
+
+def server_timing() -> str:
+    """
+    Build a Server-Timing header value for the password work done in this request.
+
+    Returns:
+        str: e.g. `bcrypt-queue;dur=0.1, bcrypt;dur=212.4`.
+    """
+    return f"bcrypt-queue;dur={_request_wait_ms.get():.1f}, bcrypt;dur={_request_hash_ms.get():.1f}"
+
+
+# --------------------------
+# Global pool instance
+# --------------------------
+password_pool = PasswordPool()
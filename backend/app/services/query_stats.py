@@ -0,0 +1,199 @@
+import contextvars
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# --------------------------
+# Logger configuration
+# --------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Query statistics configuration
+# --------------------------
+SQL_STATS_ENABLED = os.getenv("SQL_STATS_ENABLED", "true").lower() == "true"
+# Statements slower than this are logged with their bound-parameter shape (0 disables the log)
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 200))
+SQL_SLOW_QUERY_MAX_CHARS = int(os.getenv("SQL_SLOW_QUERY_MAX_CHARS", 1000))
+
+_SERVER_TIMING_PATTERN = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+class QueryStats:
+    """Statement count and database time accumulated for one request (or one `count_queries` block)."""
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.db_ms = 0.0
+        self.statements: List[str] = []
+
+    def server_timing(self) -> str:
+        """Server-Timing entry, e.g. `db;dur=4.2;desc="3 queries"`."""
+        return f'db;dur={self.db_ms:.1f};desc="{self.count} queries"'
+
+
+_current_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("query_stats", default=None)
+
+# Process-wide totals, including background threads
+_totals_lock = threading.Lock()
+_totals = {"queries": 0, "db_ms": 0.0, "slow_queries": 0}
+
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """
+    Describe bound parameters by type only, so the slow-query log never records values.
+
+    Args:
+        parameters: DBAPI parameters (tuple, dict, or a list of them for executemany).
+        executemany (bool, optional): Whether `parameters` holds many parameter sets.
+
+    Returns:
+        str: e.g. `(str, int)`, `{name: str, id: int}` or `200 x (str, int)`.
+    """
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+# The start time lives on the statement's ExecutionContext, which is discarded
+# with the statement, so a statement that fails (no after_cursor_execute)
+# leaves nothing behind on the pooled connection
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    slow = SQL_SLOW_QUERY_MS > 0 and elapsed_ms >= SQL_SLOW_QUERY_MS
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.db_ms += elapsed_ms
+        stats.statements.append(statement)
+    with _totals_lock:
+        _totals["queries"] += 1
+        _totals["db_ms"] += elapsed_ms
+        _totals["slow_queries"] += slow
+
+    if slow:
+        text = " ".join(statement.split())[:SQL_SLOW_QUERY_MAX_CHARS]
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f} ms) during {stats.label if stats else 'background work'}: "
+            f"{text} params={parameter_shape(parameters, executemany)}"
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Count and time every statement `engine` executes.
+
+    For an AsyncEngine pass its `sync_engine`. Safe to call more than once.
+
+    Args:
+        engine (Engine): Engine to instrument.
+    """
+    if not SQL_STATS_ENABLED or event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def totals() -> dict:
+    """Return process-wide statement counters."""
+    with _totals_lock:
+        return {**_totals, "db_ms": round(_totals["db_ms"], 1)}
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that collects per-request query stats and reports them in `Server-Timing`.
+
+    The stats object lives in a contextvar, which Starlette copies into
+    threadpool calls and which `AsyncSession.run_sync` keeps, so sync routes
+    and async-session work are both counted. Existing Server-Timing entries
+    (e.g. bcrypt) are kept; the `db` entry is sent as an additional field.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not SQL_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(f"{scope['method']} {scope['path']}")
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+
+
+# --------------------------
+# Test helpers
+# --------------------------
+
+@contextmanager
+def count_queries(label: str = "block") -> Iterator[QueryStats]:
+    """
+    Count the statements run inside the block (in this context), e.g. around a service call.
+
+    Yields:
+        QueryStats: Stats for the block, filled in as statements run.
+    """
+    stats = QueryStats(label)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def response_query_count(response) -> Optional[int]:
+    """Read the statement count from a response's Server-Timing header (None if absent)."""
+    match = _SERVER_TIMING_PATTERN.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else None
+
+
+def assert_max_queries(response, limit: int) -> None:
+    """
+    Fail if an endpoint issued more than `limit` statements.
+
+    Usage with the TestClient: `assert_max_queries(client.get("/vehicles/listings?..."), 2)`.
+
+    Args:
+        response: Response from a TestClient / httpx call.
+        limit (int): Maximum allowed statements.
+
+    Raises:
+        AssertionError: If the count is missing or above `limit`.
+    """
+    count = response_query_count(response)
+    assert count is not None, "Response has no db Server-Timing entry (is QueryStatsMiddleware installed?)"
+    assert count <= limit, f"{response.request.method} {response.request.url.path} ran {count} queries (max {limit})"
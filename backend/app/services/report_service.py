@@ -1,10 +1,30 @@
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, UploadFile
 
 # Project-specific models and schemas
 from app.models.reported_vehicle import ReportedVehicle
 from app.schemas.reported_vehicle import ReportedVehicleCreate
+from app.enum import VehicleType
+from app.services.manifest_service import iter_manifest_rows
+from app.services.stolen_plate_filter import normalize_plate, stolen_plates
+from app.services.suppression_service import listing_suppression
+
+# --------------------------
+# Bulk ingestion configuration
+# --------------------------
+BULK_REPORT_BATCH_SIZE = int(os.getenv("BULK_REPORT_BATCH_SIZE", 1000))
+PLATE_MAX_LENGTH = 20
+
+# (line number, plate as given, normalized plate, vehicle type)
+ReportRecord = Tuple[int, str, str, VehicleType]
 
 
 def report_vehicle(
@@ -26,10 +46,11 @@ def report_vehicle(
     Raises:
         HTTPException: If vehicle is already reported or database error occurs.
     """
+    plate = normalize_plate(vehicle_data.vehicle_no)
     try:
         # Check if this vehicle is already reported by the same user
         existing_report = db.query(ReportedVehicle).filter(
-            ReportedVehicle.vehicle_no == vehicle_data.vehicle_no,
+            ReportedVehicle.plate_key == plate,
             ReportedVehicle.vehicle_type == vehicle_data.vehicle_type,
             ReportedVehicle.reported_by == user_id
         ).first()
@@ -42,7 +63,7 @@ def report_vehicle(
 
         # Check if this vehicle is already reported by someone else
         existing_report_by_others = db.query(ReportedVehicle).filter(
-            ReportedVehicle.vehicle_no == vehicle_data.vehicle_no,
+            ReportedVehicle.plate_key == plate,
             ReportedVehicle.vehicle_type == vehicle_data.vehicle_type
         ).first()
 
@@ -55,6 +76,7 @@ def report_vehicle(
         # Create new reported vehicle record
         new_report = ReportedVehicle(
             vehicle_no=vehicle_data.vehicle_no,
+            plate_key=plate,
             vehicle_type=vehicle_data.vehicle_type,
             reported_by=user_id
         )
@@ -63,6 +85,11 @@ def report_vehicle(
         db.commit()
         db.refresh(new_report)
 
+        # Listing creation in this worker sees the report immediately
+        stolen_plates.add(new_report.vehicle_no, new_report.vehicle_type)
+        # Hide an existing listing of the plate without waiting for the next sweep
+        listing_suppression.wake()
+
         return {
             "message": "Vehicle reported successfully",
             "report_id": new_report.id,
@@ -84,4 +111,127 @@ def report_vehicle(
         raise HTTPException(
             status_code=500,
             detail=f"Failed to report vehicle: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+# --------------------------
+# Bulk ingestion
+# --------------------------
+
+def parse_vehicle_type(value) -> Optional[VehicleType]:
+    """Match a vehicle type by value or name, ignoring case ("Car", "car", "CAR")."""
+    text = str(value or "").strip().lower()
+    return next((vt for vt in VehicleType if text in (vt.value.lower(), vt.name.lower())), None)
+
+
+def _insert_report_batch(db: Session, batch: List[ReportRecord], user_id: int) -> Dict[int, str]:
+    """
+    Insert one batch of deduplicated reports, skipping plates already reported.
+
+    One IN query finds existing (plate_key, vehicle_type) pairs and one
+    multi-row INSERT writes the rest, in a single transaction.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        batch (List[ReportRecord]): Records unique within the manifest.
+        user_id (int): ID of the reporting user.
+
+    Returns:
+        Dict[int, str]: Line number -> "inserted" or "already_reported".
+    """
+    existing = set(
+        db.query(ReportedVehicle.plate_key, ReportedVehicle.vehicle_type)
+        .filter(ReportedVehicle.plate_key.in_({plate for _, _, plate, _ in batch}))
+        .all()
+    )
+    new = [record for record in batch if (record[2], record[3]) not in existing]
+
+    try:
+        if new:
+            db.execute(insert(ReportedVehicle), [
+                {"vehicle_no": vehicle_no, "plate_key": plate, "vehicle_type": vehicle_type, "reported_by": user_id}
+                for _, vehicle_no, plate, vehicle_type in new
+            ])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Database error occurred while reporting vehicles")
+
+    for _, vehicle_no, _, vehicle_type in new:
+        stolen_plates.add(vehicle_no, vehicle_type)
+    if new:
+        listing_suppression.wake()
+
+    inserted = {line for line, _, _, _ in new}
+    return {line: "inserted" if line in inserted else "already_reported" for line, _, _, _ in batch}
+
+
+async def bulk_report_vehicles(file: UploadFile, user_id: int, db: AsyncSession) -> dict:
+    """
+    Ingest a CSV or NDJSON manifest of stolen plates (e.g. a police bulletin).
+
+    Rows are streamed from the upload, validated, normalized and
+    deduplicated in memory, then written in batches of
+    BULK_REPORT_BATCH_SIZE with one existence query and one multi-row
+    insert each. Each batch commits on its own, so a failure part-way
+    keeps the batches already written.
+
+    Args:
+        file (UploadFile): Manifest with `vehicle_no` and `vehicle_type` fields.
+        user_id (int): ID of the reporting user (the authority account).
+        db (AsyncSession): SQLAlchemy async database session.
+
+    Returns:
+        dict: Per-status counts, throughput and a result for every row.
+
+    Raises:
+        HTTPException: If the manifest cannot be read or a batch fails to insert.
+    """
+    started = time.perf_counter()
+    results: Dict[int, dict] = {}
+    seen = set()
+    batch: List[ReportRecord] = []
+
+    async def flush():
+        statuses = await db.run_sync(_insert_report_batch, batch, user_id)
+        for line, status in statuses.items():
+            results[line]["status"] = status
+        batch.clear()
+
+    async for line, record, error in iter_manifest_rows(file):
+        if error:
+            results[line] = {"line": line, "vehicle_no": None, "status": "invalid", "detail": error}
+            continue
+
+        vehicle_no = str(record.get("vehicle_no") or "").strip()
+        vehicle_type = parse_vehicle_type(record.get("vehicle_type"))
+        plate = normalize_plate(vehicle_no)
+        result = results[line] = {"line": line, "vehicle_no": vehicle_no, "status": None}
+
+        if not plate or len(vehicle_no) > PLATE_MAX_LENGTH:
+            result.update(status="invalid", detail="Invalid vehicle_no")
+        elif vehicle_type is None:
+            result.update(status="invalid", detail="Invalid vehicle_type")
+        elif (plate, vehicle_type) in seen:
+            result["status"] = "duplicate_in_file"
+        else:
+            seen.add((plate, vehicle_type))
+            batch.append((line, vehicle_no, plate, vehicle_type))
+            if len(batch) >= BULK_REPORT_BATCH_SIZE:
+                await flush()
+
+    if batch:
+        await flush()
+
+    elapsed = time.perf_counter() - started
+    counts = Counter(result["status"] for result in results.values())
+    return {
+        "total": len(results),
+        "inserted": counts["inserted"],
+        "already_reported": counts["already_reported"],
+        "duplicate_in_file": counts["duplicate_in_file"],
+        "invalid": counts["invalid"],
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "plates_per_second": round(len(results) / elapsed, 1) if elapsed > 0 else None,
+        "results": [results[line] for line in sorted(results)],
+    }
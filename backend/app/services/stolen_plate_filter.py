@@ -0,0 +1,253 @@
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+import unicodedata
+from typing import Iterable, Set
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+# Project-specific models and enums
+from app.database import SessionLocal
+from app.models.reported_vehicle import ReportedVehicle
+from app.enum import VehicleType
+
+# --------------------------
+# Logger configuration
+# --------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Filter configuration
+# --------------------------
+STOLEN_FILTER_ENABLED = os.getenv("STOLEN_FILTER_ENABLED", "true").lower() == "true"
+STOLEN_FILTER_CAPACITY = int(os.getenv("STOLEN_FILTER_CAPACITY", 100_000))
+STOLEN_FILTER_FP_RATE = float(os.getenv("STOLEN_FILTER_FP_RATE", 0.001))
+# Reports written by other workers are picked up within this many seconds
+STOLEN_FILTER_REFRESH_SECONDS = int(os.getenv("STOLEN_FILTER_REFRESH_SECONDS", 5))
+# A check against a filter refreshed longer ago than this first loads newer reports
+# itself, so another worker's report is missed for at most this long (0: never)
+STOLEN_FILTER_MAX_STALENESS_SECONDS = float(os.getenv("STOLEN_FILTER_MAX_STALENESS_SECONDS", 1.0))
+
+
+def normalize_plate(vehicle_no: str) -> str:
+    """
+    Reduce a plate to its comparable form: letters and digits only, upper case.
+
+    "BA 1 PA 1234", "ba-1-pa-1234" and "BA1PA1234" all become "BA1PA1234".
+    NFKC folds full-width and compatibility characters first; Devanagari
+    letters and digits are kept as they are.
+
+    Args:
+        vehicle_no (str): Plate as entered.
+
+    Returns:
+        str: Normalized plate key.
+    """
+    return "".join(ch for ch in unicodedata.normalize("NFKC", vehicle_no).upper() if ch.isalnum())
+
+
+def plate_key(vehicle_no: str, vehicle_type: VehicleType) -> str:
+    """Key a normalized plate by vehicle type (a car and a bike may share a number)."""
+    return f"{vehicle_type.value}:{normalize_plate(vehicle_no)}"
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings backed by a NumPy bit array.
+
+    Uses k probe positions from double hashing of one BLAKE2b digest.
+    No false negatives; false positives at roughly `fp_rate` up to `capacity` keys.
+    """
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = max(1, capacity)
+        self.size = max(8, int(-self.capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, key: str) -> np.ndarray:
+        """Bit positions probed for a key."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.size for i in range(self.hashes)], dtype=np.int64)
+
+    def add(self, key: str) -> None:
+        """Insert a key."""
+        positions = self._positions(key)
+        np.bitwise_or.at(self._bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        return bool(np.all(self._bits[positions >> 3] & (1 << (positions & 7)).astype(np.uint8)))
+
+
+class StolenPlateFilter:
+    """
+    Resident filter answering "has this plate been reported stolen?" for listing creation.
+
+    A Bloom filter clears almost every clean plate with a few bit probes;
+    its rare false positives are resolved by an exact set of normalized
+    plate keys, and only true hits are confirmed against `reported_vehicles`.
+    Until the first `refresh` has run, checks go straight to the table.
+
+    Misses are not confirmed against the table. Reports from this worker
+    are added at once; those from other workers arrive with the next
+    `refresh`, and a check finding the last one older than `max_staleness`
+    seconds runs an incremental refresh (one primary-key range read) first.
+    A plate reported on another worker may therefore pass a check for up
+    to `max_staleness` seconds; 0 refreshes before every check.
+    """
+    def __init__(
+        self,
+        capacity: int = STOLEN_FILTER_CAPACITY,
+        fp_rate: float = STOLEN_FILTER_FP_RATE,
+        max_staleness: float = STOLEN_FILTER_MAX_STALENESS_SECONDS
+    ):
+        self.fp_rate = fp_rate
+        self.max_staleness = max_staleness
+        self.ready = False
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, fp_rate)
+        self._keys: Set[str] = set()
+        self._max_id = 0
+        self._refreshed_at = 0.0
+        self._stats = {
+            "checks": 0, "bloom_negative": 0, "set_negative": 0, "db_confirmed": 0, "db_fallback": 0,
+            "stale_refreshes": 0,
+        }
+
+    def _add_keys(self, keys: Iterable[str]) -> None:
+        """Insert keys, growing the Bloom filter when it passes capacity; caller must hold the lock."""
+        for key in keys:
+            if key in self._keys:
+                continue
+            self._keys.add(key)
+            self._bloom.add(key)
+        if len(self._keys) > self._bloom.capacity:
+            # Fill the larger filter before publishing it: `is_reported` reads `_bloom` without the lock
+            bloom = BloomFilter(len(self._keys) * 2, self.fp_rate)
+            for key in self._keys:
+                bloom.add(key)
+            self._bloom = bloom
+
+    def refresh(self, db: Session) -> int:
+        """
+        Load reports newer than the last one seen and mark the filter ready.
+
+        The first call loads the whole table; later calls are incremental
+        from the highest report id, which also picks up reports written by
+        other workers.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+
+        Returns:
+            int: Number of reports loaded.
+        """
+        started = time.monotonic()
+        rows = (
+            db.query(ReportedVehicle.id, ReportedVehicle.vehicle_no, ReportedVehicle.vehicle_type)
+            .filter(ReportedVehicle.id > self._max_id)
+            .all()
+        )
+        with self._lock:
+            self._add_keys(plate_key(row.vehicle_no, row.vehicle_type) for row in rows)
+            self._max_id = max([self._max_id, *(row.id for row in rows)])
+            # Reports committed after the query started are not covered by this refresh
+            self._refreshed_at = max(self._refreshed_at, started)
+            self.ready = True
+        return len(rows)
+
+    def add(self, vehicle_no: str, vehicle_type: VehicleType) -> None:
+        """
+        Record a newly committed report.
+
+        Args:
+            vehicle_no (str): Reported plate.
+            vehicle_type (VehicleType): Vehicle type.
+        """
+        with self._lock:
+            self._add_keys([plate_key(vehicle_no, vehicle_type)])
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._stats["checks"] += 1
+            self._stats[outcome] += 1
+
+    def is_reported(self, db: Session, vehicle_no: str, vehicle_type: VehicleType) -> bool:
+        """
+        Return True if the plate has been reported stolen.
+
+        Args:
+            db (Session): SQLAlchemy database session, used to confirm hits and for stale refreshes.
+            vehicle_no (str): Plate as entered.
+            vehicle_type (VehicleType): Vehicle type.
+
+        Returns:
+            bool: Whether a report exists for the normalized plate.
+        """
+        key = plate_key(vehicle_no, vehicle_type)
+        if self.ready and time.monotonic() - self._refreshed_at >= self.max_staleness:
+            self.refresh(db)
+            with self._lock:
+                self._stats["stale_refreshes"] += 1
+        if self.ready:
+            if key not in self._bloom:
+                self._count("bloom_negative")
+                return False
+            if key not in self._keys:
+                self._count("set_negative")
+                return False
+            self._count("db_confirmed")
+        else:
+            self._count("db_fallback")
+
+        return db.query(ReportedVehicle.id).filter(
+            ReportedVehicle.plate_key == normalize_plate(vehicle_no),
+            ReportedVehicle.vehicle_type == vehicle_type
+        ).first() is not None
+
+    def stats(self) -> dict:
+        """Return check outcome counters and filter size."""
+        with self._lock:
+            return {
+                **self._stats,
+                "ready": self.ready,
+                "plates": len(self._keys),
+                "bloom_bits": self._bloom.size,
+                "bloom_hashes": self._bloom.hashes,
+            }
+
+
+# --------------------------
+# Global filter instance
+# --------------------------
+stolen_plates = StolenPlateFilter()
+
+
+def start_background_refresh(interval_seconds: int = STOLEN_FILTER_REFRESH_SECONDS) -> threading.Thread:
+    """
+    Load `stolen_plates` on a daemon thread, then keep it current every `interval_seconds`.
+
+    Returns:
+        threading.Thread: The started refresh thread.
+    """
+    def _loop():
+        while True:
+            db = SessionLocal()
+            try:
+                stolen_plates.refresh(db)
+            except Exception as e:
+                logger.error(f"Stolen plate filter refresh failed: {str(e)}")
+            finally:
+                db.close()
+            time.sleep(interval_seconds)
+
+    thread = threading.Thread(target=_loop, name="stolen-plate-refresh", daemon=True)
+    thread.start()
+    return thread
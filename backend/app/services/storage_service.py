@@ -0,0 +1,279 @@
+import argparse
+import fcntl
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from mimetypes import guess_type
+from pathlib import Path
+from typing import IO, Iterator, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Project-specific models
+from app.database import SessionLocal
+from app.models.vehicle_listing import VehicleListing
+
+# --------------------------
+# Logger configuration
+# --------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Storage configuration
+# --------------------------
+UPLOAD_ROOT = Path("uploads")
+UPLOAD_DIR = UPLOAD_ROOT / "vehicles"
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+# Files younger than this are never swept: their listing may still be committing
+UPLOAD_SWEEP_GRACE_SECONDS = int(os.getenv("UPLOAD_SWEEP_GRACE_SECONDS", 3600))
+UPLOAD_SWEEP_INTERVAL_SECONDS = int(os.getenv("UPLOAD_SWEEP_INTERVAL_SECONDS", 6 * 3600))
+UPLOAD_SWEEP_ENABLED = os.getenv("UPLOAD_SWEEP_ENABLED", "true").lower() == "true"
+
+# Lock files shared by every worker process on the host (outside UPLOAD_DIR, so never swept):
+# the sweeper lock is held for life by the one process that sweeps, the store lock
+# orders reuse of an existing file (shared) against its deletion (exclusive)
+SWEEPER_LOCK_PATH = UPLOAD_ROOT / ".sweeper.lock"
+STORE_LOCK_PATH = UPLOAD_ROOT / ".store.lock"
+
+# Upload names never get new content, so clients may cache them for good
+UPLOAD_CACHE_MAX_AGE = int(os.getenv("UPLOAD_CACHE_MAX_AGE", 365 * 24 * 3600))
+# Serve <file>.br / <file>.gz siblings when present and accepted (costs one stat per request)
+UPLOAD_PRECOMPRESSED = os.getenv("UPLOAD_PRECOMPRESSED", "false").lower() == "true"
+_PRECOMPRESSED_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+def content_path(digest: str, extension: str) -> Path:
+    """
+    Return the sharded location of an upload named by its content hash.
+
+    Two directory levels from the first four hex digits keep any single
+    directory small: uploads/vehicles/ab/cd/abcd....jpg.
+
+    Args:
+        digest (str): Hex SHA-256 of the file bytes.
+        extension (str): File extension including the dot.
+
+    Returns:
+        Path: Path on disk.
+    """
+    return UPLOAD_DIR / digest[:2] / digest[2:4] / f"{digest}{extension}"
+
+
+def local_path(url: str) -> Path:
+    """Map an /uploads/... URL to its path on disk."""
+    return UPLOAD_ROOT / url.removeprefix("/uploads/")
+
+
+def public_url(path: Path) -> str:
+    """Map a path under UPLOAD_ROOT to its /uploads/... URL."""
+    return "/" + path.as_posix()
+
+
+@contextmanager
+def store_lock(exclusive: bool = False) -> Iterator[None]:
+    """
+    Hold the cross-process upload store lock.
+
+    Writers that reuse an existing file (refreshing its mtime) hold it
+    shared; the sweep holds it exclusively while it re-checks and deletes a
+    file, so a file cannot be reused and deleted at the same time. Each
+    holder opens its own descriptor: flock locks belong to the open file, so
+    threads sharing one descriptor would release each other's lock.
+
+    Args:
+        exclusive (bool, optional): Take the lock exclusively (the sweep) instead of shared.
+    """
+    with open(STORE_LOCK_PATH, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _referenced_paths(db: Session) -> Set[Path]:
+    """Every upload path some listing points to (originals and derivatives)."""
+    rows = db.query(VehicleListing.image_url, VehicleListing.thumbnail_url, VehicleListing.webp_url).all()
+    return {local_path(url) for row in rows for url in row if url}
+
+
+def sweep_orphaned_uploads(db: Session, grace_seconds: int = UPLOAD_SWEEP_GRACE_SECONDS) -> Tuple[int, int]:
+    """
+    Delete upload files that no listing references.
+
+    Covers images left behind when `create_vehicle_listing` rolls back after
+    the upload was written, files of deleted listings, and stale `.part`
+    files from interrupted uploads. Identical uploads share one file, so a
+    file is only removed once no listing at all points to it; an upload
+    that reuses a candidate refreshes its mtime under `store_lock`, and the
+    sweep re-stats each candidate under the exclusive lock right before
+    deleting it, so a file reused mid-sweep is kept.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        grace_seconds (int, optional): Minimum file age before it may be removed.
+
+    Returns:
+        Tuple[int, int]: (files removed, bytes reclaimed).
+    """
+    # Snapshot the cutoff before reading references: anything written after it is kept
+    cutoff = time.time() - grace_seconds
+    referenced = _referenced_paths(db)
+
+    removed, reclaimed = 0, 0
+    for path in UPLOAD_DIR.rglob("*"):
+        if not path.is_file() or path in referenced:
+            continue
+        try:
+            if path.stat().st_mtime > cutoff:
+                continue
+            with store_lock(exclusive=True):
+                stat = path.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                path.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+        reclaimed += stat.st_size
+
+    if removed:
+        logger.info(f"Swept {removed} orphaned uploads ({reclaimed} bytes)")
+    return removed, reclaimed
+
+
+# --------------------------
+# Static serving
+# --------------------------
+
+class UploadStaticFiles(StaticFiles):
+    """
+    StaticFiles for /uploads with long-lived, immutable caching.
+
+    Every upload name is either a content hash or a one-off UUID and is
+    never rewritten, so responses carry `Cache-Control: immutable` and a
+    strong ETag taken from the file name (with extension). Unlike the default mtime/size
+    ETag, it survives copies, restores and the sweep's mtime refresh.
+    Range and If-Range requests are handled by FileResponse.
+    """
+    def file_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        # Full name: <sha>.jpg and its derived <sha>.webp are different representations
+        name = Path(full_path).name
+        headers = {
+            "cache-control": f"public, max-age={UPLOAD_CACHE_MAX_AGE}, immutable",
+            "etag": f'"{name}"',
+        }
+        path, media_type = full_path, guess_type(full_path)[0]
+
+        if UPLOAD_PRECOMPRESSED:
+            headers["vary"] = "Accept-Encoding"
+            accepted = request_headers.get("accept-encoding", "")
+            for encoding, suffix in _PRECOMPRESSED_SUFFIXES:
+                if encoding in accepted and os.path.isfile(f"{full_path}{suffix}"):
+                    path, stat_result = f"{full_path}{suffix}", None
+                    headers["content-encoding"] = encoding
+                    headers["etag"] = f'"{name}-{encoding}"'
+                    break
+
+        response = FileResponse(
+            path, status_code=status_code, headers=headers, media_type=media_type, stat_result=stat_result
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+# --------------------------
+# Periodic sweep
+# --------------------------
+_sweep_stop = threading.Event()
+_sweeper_lock: Optional[IO] = None
+
+
+def _claim_sweeper() -> bool:
+    """
+    Try to become the host's upload sweeper.
+
+    The first process to lock SWEEPER_LOCK_PATH keeps it until it exits (the
+    kernel drops the lock with the process), so with several workers only
+    one sweeps, and another takes over if that one goes away.
+
+    Returns:
+        bool: Whether this process holds the sweeper lock.
+    """
+    global _sweeper_lock
+    if _sweeper_lock is not None:
+        return True
+    lock_file = open(SWEEPER_LOCK_PATH, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return False
+    _sweeper_lock = lock_file
+    return True
+
+
+def start_background_sweep(interval_seconds: int = UPLOAD_SWEEP_INTERVAL_SECONDS) -> threading.Thread:
+    """
+    Run `sweep_orphaned_uploads` on a daemon thread every `interval_seconds`.
+
+    Every worker starts the thread, but a pass only runs in the process
+    holding the sweeper lock (see `_claim_sweeper`).
+
+    Returns:
+        threading.Thread: The started sweeper thread.
+    """
+    _sweep_stop.clear()
+
+    def _loop():
+        while not _sweep_stop.wait(interval_seconds):
+            if not _claim_sweeper():
+                continue
+            db = SessionLocal()
+            try:
+                sweep_orphaned_uploads(db)
+            except Exception as e:
+                logger.error(f"Upload sweep failed: {str(e)}")
+            finally:
+                db.close()
+
+    thread = threading.Thread(target=_loop, name="upload-sweeper", daemon=True)
+    thread.start()
+    return thread
+
+
+def stop_background_sweep() -> None:
+    """Ask the sweeper thread to exit after its current pass."""
+    _sweep_stop.set()
+
+
+if __name__ == "__main__":
+    # One-off sweep: python -m app.services.storage_service [--grace-seconds N]
+    parser = argparse.ArgumentParser(description="Delete upload files no listing references.")
+    parser.add_argument("--grace-seconds", type=int, default=UPLOAD_SWEEP_GRACE_SECONDS)
+    args = parser.parse_args()
+
+    if not _claim_sweeper():
+        parser.exit(1, "Another process is sweeping uploads\n")
+    session = SessionLocal()
+    try:
+        removed, reclaimed = sweep_orphaned_uploads(session, args.grace_seconds)
+    finally:
+        session.close()
+    logger.info(f"Removed {removed} files, reclaimed {reclaimed} bytes")
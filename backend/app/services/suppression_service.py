@@ -0,0 +1,165 @@
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+# Project-specific models
+from app.database import SessionLocal
+from app.models.reported_vehicle import ReportedVehicle
+from app.models.vehicle import Vehicle
+from app.models.vehicle_listing import VehicleListing
+from app.services.cache_service import feed_cache
+from app.services.etag_service import bump_listing_data_version
+from app.services.listing_index import listing_index
+
+# --------------------------
+# Logger configuration
+# --------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Suppression configuration
+# --------------------------
+LISTING_SUPPRESSION_ENABLED = os.getenv("LISTING_SUPPRESSION_ENABLED", "true").lower() == "true"
+LISTING_SUPPRESSION_INTERVAL_SECONDS = int(os.getenv("LISTING_SUPPRESSION_INTERVAL_SECONDS", 30))
+# Re-read reports this far behind the high-water mark: reported_at is stamped
+# when the insert runs, so a slow transaction can commit behind a later one
+LISTING_SUPPRESSION_OVERLAP_SECONDS = int(os.getenv("LISTING_SUPPRESSION_OVERLAP_SECONDS", 60))
+
+
+class ListingSuppressionSweep:
+    """
+    Hides listings whose plate was reported stolen after they were listed.
+
+    `create_vehicle_listing` refuses reported plates, but a report filed
+    later would leave the listing live. Each pass joins the reports newer
+    than the high-water mark on `reported_at` to vehicles by normalized
+    plate key and sets `suppressed_at` on their listings in one UPDATE.
+    Every worker runs its own sweep so its resident index and feed cache
+    learn about listings suppressed by the others.
+    """
+    def __init__(self, overlap_seconds: int = LISTING_SUPPRESSION_OVERLAP_SECONDS):
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.high_water: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stats = {"passes": 0, "reports_scanned": 0, "listings_matched": 0, "listings_suppressed": 0}
+
+    def sweep(self, db: Session) -> int:
+        """
+        Suppress the listings of every plate reported since the last pass.
+
+        The first pass has no mark and covers the whole reports table.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+
+        Returns:
+            int: Number of listings newly suppressed.
+        """
+        # The lock only guards the mark and counters: stats() never waits on the database
+        with self._lock:
+            since = self.high_water - self.overlap if self.high_water else None
+
+        reports = db.query(func.count(ReportedVehicle.id), func.max(ReportedVehicle.reported_at))
+        if since is not None:
+            reports = reports.filter(ReportedVehicle.reported_at >= since)
+        scanned, newest = reports.one()
+
+        matches = []
+        if scanned:
+            # reports (reported_at index) -> vehicles (plate key index) -> listings (unique vehicle_id)
+            query = (
+                db.query(VehicleListing.id, VehicleListing.location)
+                .select_from(ReportedVehicle)
+                .join(Vehicle, (Vehicle.plate_key == ReportedVehicle.plate_key)
+                      & (Vehicle.vehicle_type == ReportedVehicle.vehicle_type))
+                .join(VehicleListing, VehicleListing.vehicle_id == Vehicle.id)
+                .filter(ReportedVehicle.reported_at <= newest)
+            )
+            if since is not None:
+                query = query.filter(ReportedVehicle.reported_at >= since)
+            matches = query.distinct().all()
+
+        suppressed = 0
+        if matches:
+            suppressed = (
+                db.query(VehicleListing)
+                .filter(VehicleListing.id.in_([row.id for row in matches]), VehicleListing.suppressed_at.is_(None))
+                .update({"suppressed_at": datetime.now(timezone.utc)}, synchronize_session=False)
+            )
+            if suppressed:
+                bump_listing_data_version(db, {row.location for row in matches})
+            db.commit()
+
+            # Refresh this worker's view even for listings another worker already suppressed
+            listing_index.suppress(row.id for row in matches)
+            for location in {row.location for row in matches}:
+                feed_cache.invalidate(location)
+
+        with self._lock:
+            if newest is not None:
+                self.high_water = max(self.high_water, newest) if self.high_water else newest
+            self._stats["passes"] += 1
+            self._stats["reports_scanned"] += scanned
+            self._stats["listings_matched"] += len(matches)
+            self._stats["listings_suppressed"] += suppressed
+
+        if suppressed:
+            logger.info(f"Suppressed {suppressed} listings of vehicles reported stolen")
+        return suppressed
+
+    def wake(self) -> None:
+        """Run the background pass now instead of at the next interval (e.g. after a new report)."""
+        self._wake.set()
+
+    def stats(self) -> dict:
+        """Return pass counters and the current high-water mark."""
+        with self._lock:
+            return {**self._stats, "high_water": self.high_water.isoformat() if self.high_water else None}
+
+
+# --------------------------
+# Global sweep instance
+# --------------------------
+listing_suppression = ListingSuppressionSweep()
+
+
+def start_background_suppression(interval_seconds: int = LISTING_SUPPRESSION_INTERVAL_SECONDS) -> threading.Thread:
+    """
+    Run `listing_suppression.sweep` on a daemon thread now and every `interval_seconds`.
+
+    Returns:
+        threading.Thread: The started sweep thread.
+    """
+    def _loop():
+        while True:
+            listing_suppression._wake.clear()
+            db = SessionLocal()
+            try:
+                listing_suppression.sweep(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Listing suppression sweep failed: {str(e)}")
+            finally:
+                db.close()
+            listing_suppression._wake.wait(interval_seconds)
+
+    thread = threading.Thread(target=_loop, name="listing-suppression", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    # One-off full pass: python -m app.services.suppression_service
+    session = SessionLocal()
+    try:
+        count = listing_suppression.sweep(session)
+    finally:
+        session.close()
+    logger.info(f"Suppressed {count} listings")
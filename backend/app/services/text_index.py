@@ -0,0 +1,416 @@
+import argparse
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+# Project-specific models
+from app.database import SessionLocal
+from app.models.vehicle_listing import VehicleListing
+
+# --------------------------
+# Logger configuration
+# --------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Text index configuration
+# --------------------------
+TEXT_INDEX_ENABLED = os.getenv("TEXT_INDEX_ENABLED", "true").lower() == "true"
+TEXT_INDEX_MODEL = os.getenv("TEXT_INDEX_MODEL", "en_core_web_sm")
+TEXT_INDEX_PATH = os.getenv("TEXT_INDEX_PATH", "data/text_index.npz")
+TEXT_INDEX_BATCH_SIZE = int(os.getenv("TEXT_INDEX_BATCH_SIZE", 256))
+# Pick up listings created by other workers this often
+TEXT_INDEX_REFRESH_SECONDS = int(os.getenv("TEXT_INDEX_REFRESH_SECONDS", 30))
+# Re-read this many ids below the last one seen (a slow transaction can commit behind a later one)
+TEXT_INDEX_REFRESH_OVERLAP_IDS = int(os.getenv("TEXT_INDEX_REFRESH_OVERLAP_IDS", 100))
+
+_INITIAL_CAPACITY = 1024
+
+# Only the token-to-vector layer is needed to produce document vectors
+_DISABLED_PIPES = ["tagger", "parser", "ner", "attribute_ruler", "lemmatizer", "senter"]
+
+
+def listing_text(title: str, description: Optional[str]) -> str:
+    """Return the free text of a listing that gets embedded."""
+    return f"{title}. {description}" if description else title
+
+
+class ListingTextIndex:
+    """
+    Compact float32 matrix of spaCy document vectors over listing titles and descriptions.
+
+    Every listing is embedded once (in batches with `nlp.pipe`) and stored
+    L2-normalized in a preallocated matrix that doubles when full, so cosine
+    similarity against a query is one matrix-vector product over the
+    requested rows. spaCy runs only on the query per request, on its own
+    pipeline instance so a query never waits behind a batch. New listings
+    are queued by `add` and embedded in batches on the background thread,
+    never on the write path; those created by other workers arrive through
+    the periodic `refresh`.
+
+    The index is optional: if spaCy or the model cannot be loaded it stays
+    cold and callers simply skip text similarity.
+    """
+    def __init__(self, model_name: str = TEXT_INDEX_MODEL, batch_size: int = TEXT_INDEX_BATCH_SIZE):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.enabled = TEXT_INDEX_ENABLED
+        self.ready = False
+        # Batch embedding (warm-up, queued listings) and query embedding use separate pipelines
+        self._nlp = None
+        self._nlp_lock = threading.Lock()
+        self._query_nlp = None
+        self._query_nlp_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._max_id = 0
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._positions: Dict[int, int] = {}
+        self._pending: List[Tuple[int, str]] = []
+        self._wake = threading.Event()
+
+    def _load_model(self):
+        """Load the batch spaCy pipeline on first use."""
+        if self._nlp is None:
+            import spacy
+            self._nlp = spacy.load(self.model_name, disable=_DISABLED_PIPES)
+        return self._nlp
+
+    def _load_query_model(self):
+        """Load the query spaCy pipeline on first use."""
+        if self._query_nlp is None:
+            import spacy
+            self._query_nlp = spacy.load(self.model_name, disable=_DISABLED_PIPES)
+        return self._query_nlp
+
+    def _vectorize(self, nlp, texts: Sequence[str]) -> np.ndarray:
+        """Run texts through a pipeline and L2-normalize the document vectors."""
+        vectors = np.array(
+            [doc.vector for doc in nlp.pipe(texts, batch_size=self.batch_size)],
+            dtype=np.float32
+        ).reshape(len(texts), -1)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts in batches and L2-normalize the result.
+
+        Args:
+            texts (Sequence[str]): Texts to embed.
+
+        Returns:
+            np.ndarray: float32 matrix with one unit-length row per text.
+        """
+        with self._nlp_lock:
+            return self._vectorize(self._load_model(), texts)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed one query on the query pipeline, which batch work never holds.
+
+        Args:
+            query (str): Free-text query.
+
+        Returns:
+            np.ndarray: Unit-length float32 vector.
+        """
+        with self._query_nlp_lock:
+            return self._vectorize(self._load_query_model(), [query])[0]
+
+    def _append(self, ids: Iterable[int], vectors: np.ndarray) -> None:
+        """Append embedded rows, skipping ids already present; caller must hold the lock."""
+        ids = np.asarray(list(ids), dtype=np.int64)
+        keep = np.array([int(listing_id) not in self._positions for listing_id in ids], dtype=bool)
+        ids, vectors = ids[keep], vectors[keep]
+        if ids.size == 0:
+            return
+
+        start, needed = self._size, self._size + ids.size
+        if needed > self._ids.size or vectors.shape[1] != self._vectors.shape[1]:
+            # Grow by doubling; rows already handed to `similarity` stay valid in the old buffer
+            capacity = max(needed, self._ids.size * 2, _INITIAL_CAPACITY)
+            grown_ids = np.zeros(capacity, dtype=np.int64)
+            grown_vectors = np.zeros((capacity, vectors.shape[1]), dtype=np.float32)
+            grown_ids[:start] = self._ids[:start]
+            if start:
+                grown_vectors[:start] = self._vectors[:start]
+            self._ids, self._vectors = grown_ids, grown_vectors
+
+        self._ids[start:needed] = ids
+        self._vectors[start:needed] = vectors
+        self._size = needed
+        for offset, listing_id in enumerate(ids.tolist()):
+            self._positions[listing_id] = start + offset
+
+    def save(self, path: str = TEXT_INDEX_PATH) -> None:
+        """
+        Write the index to an .npz file so later startups only embed new listings.
+
+        The file is written under a temporary name in the same directory and
+        renamed into place, so workers saving at once or a crash mid-write
+        never leave a truncated index for the next `load`.
+        """
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            ids, vectors = self._ids[:self._size], self._vectors[:self._size]
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".text_index-", suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, ids=ids, vectors=vectors, model=np.array(self.model_name))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, path: str = TEXT_INDEX_PATH) -> bool:
+        """
+        Load a previously saved index if it exists and was built with the same model.
+
+        Returns:
+            bool: True if rows were loaded.
+        """
+        if not os.path.exists(path):
+            return False
+        data = np.load(path)
+        if str(data["model"]) != self.model_name:
+            logger.warning(f"Ignoring text index at {path}: built with {data['model']}, not {self.model_name}")
+            return False
+        with self._lock:
+            self._append(data["ids"], data["vectors"].astype(np.float32))
+        return True
+
+    def warm(self, db: Session, path: Optional[str] = TEXT_INDEX_PATH) -> None:
+        """
+        Load the saved index, embed every listing missing from it, and mark the index ready.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+            path (str, optional): Saved index location; None skips load and save.
+        """
+        # Fail fast (and get disabled) when spaCy or the model is missing, even on an empty table
+        with self._nlp_lock:
+            self._load_model()
+        with self._query_nlp_lock:
+            self._load_query_model()
+
+        if path:
+            self.load(path)
+
+        with self._lock:
+            known = max(self._positions, default=0)
+
+        rows = (
+            db.query(VehicleListing.id, VehicleListing.title, VehicleListing.description)
+            .filter(VehicleListing.id > known)
+            .order_by(VehicleListing.id)
+            .all()
+        )
+        if rows:
+            vectors = self.embed([listing_text(row.title, row.description) for row in rows])
+            with self._lock:
+                self._append([row.id for row in rows], vectors)
+
+        self.embed_pending()
+
+        with self._lock:
+            self._max_id = max(self._max_id, known, rows[-1].id if rows else 0)
+            self.ready = True
+        if path and rows:
+            self.save(path)
+
+        logger.info(f"Listing text index warmed with {self._size} listings ({len(rows)} newly embedded)")
+
+    def refresh(self, db: Session) -> int:
+        """
+        Queue listings committed since the last warm-up or refresh, e.g. by other workers.
+
+        Incremental from the highest listing id seen (less a small overlap);
+        listings already indexed or queued are skipped. The caller embeds
+        the queue with `embed_pending`.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+
+        Returns:
+            int: Number of listings queued.
+        """
+        if not self.ready:
+            return 0
+
+        since = max(0, self._max_id - TEXT_INDEX_REFRESH_OVERLAP_IDS)
+        rows = (
+            db.query(VehicleListing.id, VehicleListing.title, VehicleListing.description)
+            .filter(VehicleListing.id > since)
+            .order_by(VehicleListing.id)
+            .all()
+        )
+        if not rows:
+            return 0
+
+        with self._lock:
+            queued = {listing_id for listing_id, _ in self._pending}
+            entries = [
+                (row.id, listing_text(row.title, row.description))
+                for row in rows if row.id not in self._positions and row.id not in queued
+            ]
+            self._pending.extend(entries)
+            self._max_id = max(self._max_id, rows[-1].id)
+        return len(entries)
+
+    def add(self, listing_id: int, title: str, description: Optional[str]) -> None:
+        """
+        Queue a newly committed listing for embedding on the background thread.
+
+        Args:
+            listing_id (int): ID of the listing.
+            title (str): Listing title.
+            description (str, optional): Listing description.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._pending.append((listing_id, listing_text(title, description)))
+        self._wake.set()
+
+    def add_many(self, listings: Iterable[Tuple[int, str, Optional[str]]]) -> None:
+        """
+        Queue several newly committed listings, embedded together as one batch.
+
+        Args:
+            listings (Iterable[Tuple[int, str, Optional[str]]]): (listing id, title, description) triples.
+        """
+        if not self.enabled:
+            return
+
+        entries = [(listing_id, listing_text(title, description)) for listing_id, title, description in listings]
+        with self._lock:
+            self._pending.extend(entries)
+        self._wake.set()
+
+    def embed_pending(self) -> int:
+        """
+        Embed every queued listing in one batch and add it to the index.
+
+        Returns:
+            int: Number of listings embedded.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+
+        # A failed batch is dropped; the next warm-up picks those listings up
+        try:
+            vectors = self.embed([text for _, text in pending])
+        except Exception as e:
+            logger.error(f"Failed to embed {len(pending)} listings: {str(e)}")
+            return 0
+        with self._lock:
+            self._append([listing_id for listing_id, _ in pending], vectors)
+        return len(pending)
+
+    def disable(self) -> None:
+        """Stop buffering new listings after a failed warm-up (e.g. spaCy or the model is missing)."""
+        with self._lock:
+            self.enabled = False
+            self._pending.clear()
+
+    def similarity(
+        self,
+        query: str,
+        listing_ids: Sequence[int],
+        query_vector: Optional[np.ndarray] = None
+    ) -> Dict[int, float]:
+        """
+        Cosine similarity between a query and the given listings.
+
+        Args:
+            query (str): Free-text query.
+            listing_ids (Sequence[int]): Listings to score; unknown ids are skipped.
+            query_vector (np.ndarray, optional): `embed_query(query)`, when the caller
+                already computed it off the event loop.
+
+        Returns:
+            Dict[int, float]: Listing id -> similarity in [-1, 1].
+        """
+        with self._lock:
+            known = [(listing_id, self._positions[listing_id]) for listing_id in listing_ids if listing_id in self._positions]
+            vectors = self._vectors
+        if not known:
+            return {}
+
+        if query_vector is None:
+            query_vector = self.embed_query(query)
+        scores = vectors[[position for _, position in known]] @ query_vector
+        return {listing_id: float(score) for (listing_id, _), score in zip(known, scores)}
+
+
+# --------------------------
+# Global index instance
+# --------------------------
+text_index = ListingTextIndex()
+
+
+def start_background_warmup(interval_seconds: int = TEXT_INDEX_REFRESH_SECONDS) -> threading.Thread:
+    """
+    Warm `text_index` on a daemon thread, then embed queued new listings as they arrive.
+
+    Every `interval_seconds` without new local listings, the thread also
+    runs `refresh` to pick up listings created by other workers.
+    Recommendations skip text similarity until the warm-up is done.
+
+    Returns:
+        threading.Thread: The started warm-up/embedding thread.
+    """
+    def _loop():
+        db = SessionLocal()
+        try:
+            text_index.warm(db)
+        except Exception as e:
+            text_index.disable()
+            logger.error(f"Listing text index warm-up failed, text similarity disabled: {str(e)}")
+            return
+        finally:
+            db.close()
+
+        while True:
+            if not text_index._wake.wait(interval_seconds):
+                db = SessionLocal()
+                try:
+                    text_index.refresh(db)
+                except Exception as e:
+                    logger.error(f"Listing text index refresh failed: {str(e)}")
+                finally:
+                    db.close()
+            text_index._wake.clear()
+            text_index.embed_pending()
+
+    thread = threading.Thread(target=_loop, name="text-index-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    # Offline build: python -m app.services.text_index [--path data/text_index.npz]
+    parser = argparse.ArgumentParser(description="Build or update the listing text index offline.")
+    parser.add_argument("--path", default=TEXT_INDEX_PATH)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        text_index.warm(session, path=args.path)
+    finally:
+        session.close()
@@ -1,9 +1,12 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from passlib.context import CryptContext
 
 # Project-specific imports
 from app.models.user import User
+from app.services.password_service import password_pool
 
 # Password hashing configuration
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -36,85 +39,110 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def register_user(
+def _ensure_phone_available(phone_number: str, db: Session) -> None:
+    """Raise 400 if the phone number is already registered."""
+    if db.query(User.id).filter(User.phone_number == phone_number).first():
+        raise HTTPException(status_code=400, detail="Number already registered")
+
+
+def _insert_user(fullname: str, phone_number: str, hashed_password: str, default_location: str, db: Session) -> dict:
+    """Create the user row with an already hashed password."""
+    _ensure_phone_available(phone_number, db)
+    new_user = User(
+        fullname=fullname,
+        phone_number=phone_number,
+        password=hashed_password,
+        default_location=default_location
+    )
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+
+    return {
+        "message": "User registered successfully",
+        "user_id": new_user.id,
+        "fullname": new_user.fullname
+    }
+
+
+async def register_user(
     fullname: str,
     phone_number: str,
     password: str,
     default_location: str,
-    db: Session
+    db: AsyncSession
 ) -> dict:
     """
     Register a new user with hashed password.
 
+    The bcrypt hash runs on the password pool, between two short database
+    transactions, so neither the event loop nor a database connection waits
+    on it: the availability check is committed, returning its pooled
+    connection, before the hash is queued.
+
     Args:
         fullname (str): Full name of the user.
         phone_number (str): Phone number of the user.
         password (str): Plain text password.
         default_location (str): Default city/location of the user.
-        db (Session): SQLAlchemy database session.
+        db (AsyncSession): SQLAlchemy async database session.
 
     Returns:
         dict: Confirmation message and user details.
 
     Raises:
-        HTTPException: If user already exists or database error occurs.
+        HTTPException: If user already exists, the password pool is saturated (503) or database error occurs.
     """
     try:
-        # Check if phone number is already registered
-        user = db.query(User).filter(User.phone_number == phone_number).first()
-        if user:
-            raise HTTPException(status_code=400, detail="Number already registered")
-
-        # Hash password and create user
-        hashed_password = get_password_hash(password)
-        new_user = User(
-            fullname=fullname,
-            phone_number=phone_number,
-            password=hashed_password,
-            default_location=default_location
+        # Check if phone number is already registered before spending a hash on it
+        await db.run_sync(lambda session: _ensure_phone_available(phone_number, session))
+        await db.commit()
+
+        # Hash password and create user (the insert re-checks the number)
+        hashed_password = await password_pool.run(get_password_hash, password)
+        return await db.run_sync(
+            lambda session: _insert_user(fullname, phone_number, hashed_password, default_location, session)
         )
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-
-        return {
-            "message": "User registered successfully",
-            "user_id": new_user.id,
-            "fullname": new_user.fullname
-        }
 
     except HTTPException as e:
         raise e
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
 
-def login_user(
+async def login_user(
     phone_number: str,
     password: str,
-    db: Session
+    db: AsyncSession
 ) -> dict:
     """
     Log in a user by verifying phone number and password.
 
+    The user row is read and its transaction closed (returning the pooled
+    connection) before the bcrypt check is queued on the password pool.
+
     Args:
         phone_number (str): User's phone number.
         password (str): Plain text password.
-        db (Session): SQLAlchemy database session.
+        db (AsyncSession): SQLAlchemy async database session.
 
     Returns:
         dict: Login confirmation and user details.
 
     Raises:
-        HTTPException: If user not found, incorrect password, or database error occurs.
+        HTTPException: If user not found, incorrect password, the password pool is saturated (503) or database error occurs.
     """
     try:
         # Fetch user by phone number
-        user = db.query(User).filter(User.phone_number == phone_number).first()
+        user = (await db.execute(
+            select(User.id, User.fullname, User.default_location, User.password)
+            .where(User.phone_number == phone_number)
+        )).first()
+        await db.rollback()
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        if not verify_password(password, user.password):
+        if not await password_pool.run(verify_password, password, user.password):
             raise HTTPException(status_code=400, detail="Incorrect password")
 
         return {
@@ -127,5 +155,5 @@ def login_user(
     except HTTPException as e:
         raise e
     except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
\ No newline at end of file
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
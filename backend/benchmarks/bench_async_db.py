@@ -0,0 +1,148 @@
+"""
+Load benchmark: async handlers on a blocking Session vs an AsyncSession.
+
+Runs the recommendation handler body under N concurrent requests on one
+event loop, the way uvicorn does, against a throwaway SQLite database:
+
+- blocking: `async def` handler calling the synchronous Session (today's
+  behavior before the async data layer) -- every query stalls the loop.
+- async: the same service run through `await db.run_sync(...)` on an
+  aiosqlite AsyncSession -- the loop keeps serving while queries run.
+
+Alongside the load a 1 ms ticker stands in for cheap requests (enum lists,
+304s) and records how late the loop lets it run.
+
+Run from the backend directory:
+    python -m benchmarks.bench_async_db [--listings N] [--concurrency C] [--seconds S]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.enum import BodyType, EngineType, ListingType, MajorCities, VehicleType
+from app.models.user import User
+from app.models.vehicle import Vehicle
+from app.models.vehicle_listing import VehicleListing
+from app.models import reported_vehicle  # noqa: F401  (registers the User.reports target)
+from app.services.nlp_recommendation_service import nlp_service
+
+QUERIES = ["family suv car", "electric scooter", "cheap bike", "hybrid sedan", "diesel pickup truck"]
+
+
+def seed(session_factory, listings: int) -> None:
+    """Insert one user and `listings` random vehicles with listings."""
+    rng = random.Random(7)
+    db = session_factory()
+    user = User(fullname="Bench User", phone_number="+9779800000000", password="x",
+                default_location=MajorCities.KATHMANDU)
+    db.add(user)
+    db.flush()
+    for i in range(listings):
+        vehicle = Vehicle(
+            vehicle_no=f"BN{i:07d}", vehicle_type=rng.choice(list(VehicleType)),
+            engine_type=rng.choice(list(EngineType)), engine_battery_capacity="1500",
+            body_type=rng.choice(list(BodyType)), company="Toyota", model_name="RAV4"
+        )
+        db.add(vehicle)
+        db.flush()
+        db.add(VehicleListing(
+            vehicle_id=vehicle.id, listed_by=user.id, title=f"Listing {i}", description=None,
+            listing_type=rng.choice(list(ListingType)), price=float(rng.randint(500, 5000)),
+            location=rng.choice(list(MajorCities))
+        ))
+    db.commit()
+    db.close()
+
+
+async def run_load(handler, concurrency: int, seconds: float) -> dict:
+    """Drive `handler` from `concurrency` workers for `seconds`; report throughput and loop lag."""
+    completed = 0
+    lags = []
+    deadline = time.perf_counter() + seconds
+
+    async def worker(offset: int):
+        nonlocal completed
+        i = offset
+        while time.perf_counter() < deadline:
+            await handler(QUERIES[i % len(QUERIES)])
+            completed += 1
+            i += 1
+
+    async def ticker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - start - 0.001) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(ticker(), *(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    lags.sort()
+    return {
+        "requests_per_second": round(completed / elapsed, 1),
+        "loop_lag_p50_ms": round(lags[len(lags) // 2], 2) if lags else None,
+        "loop_lag_p99_ms": round(lags[int(len(lags) * 0.99)], 2) if lags else None,
+        "loop_lag_max_ms": round(lags[-1], 2) if lags else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--listings", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        SessionLocal = sessionmaker(bind=engine, autoflush=False)
+        AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+        Base.metadata.create_all(engine)
+        seed(SessionLocal, args.listings)
+
+        async def blocking_handler(query: str):
+            db = SessionLocal()
+            try:
+                return nlp_service.get_recommendations(db, query)
+            finally:
+                db.close()
+
+        async def async_handler(query: str):
+            async with AsyncSessionLocal() as db:
+                return await db.run_sync(nlp_service.get_recommendations, query)
+
+        async def run_all() -> dict:
+            results = {
+                "blocking_session": await run_load(blocking_handler, args.concurrency, args.seconds),
+                "async_session": await run_load(async_handler, args.concurrency, args.seconds),
+            }
+            await async_engine.dispose()
+            return results
+
+        results = asyncio.run(run_all())
+        engine.dispose()
+
+    print(json.dumps({
+        "benchmark": "async_db",
+        "listings": args.listings,
+        "concurrency": args.concurrency,
+        "seconds": args.seconds,
+        **results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
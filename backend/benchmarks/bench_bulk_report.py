@@ -0,0 +1,135 @@
+"""
+Throughput benchmark: stolen-plate ingestion one report at a time vs in bulk.
+
+Feeds the same synthetic bulletin (with a share of in-file duplicates and
+plates already on record) to a throwaway SQLite database two ways:
+
+- single: `report_vehicle` per plate, as an authority would by calling
+  POST /vehicles/report/ in a loop -- two duplicate lookups and a commit each.
+- bulk: `bulk_report_vehicles` on the CSV manifest -- in-memory dedup, one
+  IN query and one multi-row insert per batch.
+
+Run from the backend directory:
+    python -m benchmarks.bench_bulk_report [--plates N] [--existing N] [--batch-size B]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import Headers
+
+from app.database import Base
+from app.enum import MajorCities, VehicleType
+from app.models.user import User
+from app.models import vehicle, vehicle_listing  # noqa: F401  (registers the User relationship targets)
+from app.schemas.reported_vehicle import ReportedVehicleCreate
+from app.services import report_service
+from app.services.stolen_plate_filter import StolenPlateFilter
+
+
+def bulletin(plates: int, existing: int) -> list:
+    """Build (vehicle_no, vehicle_type) rows: ~5% format-variant repeats, the first `existing` already reported."""
+    rng = random.Random(7)
+    rows = [(f"BA {i // 1000} PA {i % 1000:04d}", rng.choice(list(VehicleType)).value) for i in range(plates)]
+    for i in rng.sample(range(plates), plates // 20):
+        vehicle_no, vehicle_type = rows[rng.randrange(plates)]
+        rows[i] = (vehicle_no.lower().replace(" ", "-"), vehicle_type)
+    return rows[:existing], rows
+
+
+def fresh_database(tmp: str, name: str, preload: list):
+    """Create a database with one user and `preload` already reported."""
+    path = os.path.join(tmp, f"{name}.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    db = SessionLocal()
+    db.add(User(fullname="Bench Authority", phone_number="+9779800000000", password="x",
+                default_location=MajorCities.KATHMANDU))
+    db.commit()
+    for vehicle_no, vehicle_type in preload:
+        try:
+            report_service.report_vehicle(
+                ReportedVehicleCreate(vehicle_no=vehicle_no, vehicle_type=vehicle_type, reported_by=1), 1, db
+            )
+        except HTTPException:
+            pass
+    db.close()
+    return path, engine, SessionLocal
+
+
+def run_single(SessionLocal, rows: list) -> dict:
+    """Report each plate through the single-report service."""
+    db = SessionLocal()
+    inserted = 0
+    started = time.perf_counter()
+    for vehicle_no, vehicle_type in rows:
+        try:
+            report_service.report_vehicle(
+                ReportedVehicleCreate(vehicle_no=vehicle_no, vehicle_type=vehicle_type, reported_by=1), 1, db
+            )
+            inserted += 1
+        except HTTPException:
+            pass
+    elapsed = time.perf_counter() - started
+    db.close()
+    return {"inserted": inserted, "elapsed_ms": round(elapsed * 1000, 1),
+            "plates_per_second": round(len(rows) / elapsed, 1)}
+
+
+async def run_bulk(path: str, rows: list) -> dict:
+    """Ingest the whole bulletin as one CSV manifest."""
+    manifest = "vehicle_no,vehicle_type\n" + "".join(f"{no},{vt}\n" for no, vt in rows)
+    file = UploadFile(io.BytesIO(manifest.encode()), filename="bulletin.csv",
+                      headers=Headers({"content-type": "text/csv"}))
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    async with AsyncSessionLocal() as db:
+        summary = await report_service.bulk_report_vehicles(file, 1, db)
+    await async_engine.dispose()
+    return {key: summary[key] for key in ("inserted", "elapsed_ms", "plates_per_second")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--plates", type=int, default=5000)
+    parser.add_argument("--existing", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=report_service.BULK_REPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    report_service.BULK_REPORT_BATCH_SIZE = args.batch_size
+    # Keep the process-wide filter out of the measurement
+    report_service.stolen_plates = StolenPlateFilter()
+    preload, rows = bulletin(args.plates, args.existing)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, single_engine, SingleSession = fresh_database(tmp, "single", preload)
+        single = run_single(SingleSession, rows)
+        single_engine.dispose()
+
+        bulk_path, bulk_engine, _ = fresh_database(tmp, "bulk", preload)
+        bulk = asyncio.run(run_bulk(bulk_path, rows))
+        bulk_engine.dispose()
+
+    print(json.dumps({
+        "benchmark": "bulk_report",
+        "plates": args.plates,
+        "existing": args.existing,
+        "batch_size": args.batch_size,
+        "single": single,
+        "bulk": bulk,
+        "speedup": round(bulk["plates_per_second"] / single["plates_per_second"], 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
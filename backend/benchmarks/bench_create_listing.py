@@ -0,0 +1,188 @@
+"""
+Latency benchmark: single listing creation (`create_vehicle_listing`).
+
+Creates the same listings one after another on two throwaway SQLite
+databases and reports p50/p99 latency plus database round trips per call:
+
+- legacy: the previous implementation -- SELECT the vehicle (and its
+  listing), INSERT, COMMIT, then reload the listing and vehicle.
+- current: `create_vehicle_listing` -- insert and catch the unique-key
+  collision, nothing reloaded after commit.
+
+SQLite runs in-process, so a network round trip to MySQL is simulated by
+sleeping `--rtt-ms` before every statement and commit. Every
+`--relist-every`-th call lists an existing unlisted vehicle, the path
+that used to need the extra lookups.
+
+Run from the backend directory:
+    python -m benchmarks.bench_create_listing [--listings N] [--rtt-ms MS] [--relist-every K]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.enum import BodyType, EngineType, ListingType, MajorCities, VehicleType
+from app.models.user import User
+from app.models.vehicle import Vehicle
+from app.models.vehicle_listing import VehicleListing
+from app.models import reported_vehicle  # noqa: F401  (registers the User.reports target)
+from app.schemas.vehicle import VehicleCreate
+from app.schemas.vehicle_listing import VehicleListingFullCreate
+from app.services.cache_service import feed_cache
+from app.services.image_service import image_pipeline
+from app.services.listing_index import listing_index
+from app.services.listing_service import create_vehicle_listing
+from app.services.stolen_plate_filter import normalize_plate, stolen_plates
+from app.services.text_index import text_index
+
+
+def listing(i: int) -> VehicleListingFullCreate:
+    """Build the i-th listing payload (no image, so no derivative jobs)."""
+    return VehicleListingFullCreate(
+        vehicle_no=f"BN {i // 1000} PA {i % 1000:04d}", vehicle_type=VehicleType.CAR,
+        engine_type=EngineType.PETROL, engine_battery_capacity="1500", body_type=BodyType.SUV,
+        company="Toyota", model_name="RAV4", title=f"Bench listing {i}", description=None,
+        listing_type=ListingType.SALE, price=1000.0 + i, location=MajorCities.KATHMANDU
+    )
+
+
+def legacy_create_vehicle_listing(
+    listing_data: VehicleListingFullCreate,
+    user_id: int,
+    location: MajorCities,
+    db: Session
+) -> dict:
+    """The implementation before insert-and-catch: look up, insert, commit, reload."""
+    try:
+        if stolen_plates.is_reported(db, listing_data.vehicle_no, listing_data.vehicle_type):
+            raise HTTPException(status_code=403, detail="This vehicle has been reported as stolen and cannot be listed.")
+
+        existing_vehicle = db.query(Vehicle).filter(Vehicle.vehicle_no == listing_data.vehicle_no).first()
+        if existing_vehicle:
+            existing_listing = db.query(VehicleListing).filter(VehicleListing.vehicle_id == existing_vehicle.id).first()
+            if existing_listing:
+                raise HTTPException(status_code=400, detail="This vehicle is already listed")
+            vehicle = existing_vehicle
+        else:
+            vehicle_data = VehicleCreate(**listing_data.model_dump(include=set(VehicleCreate.model_fields)))
+            vehicle = Vehicle(**vehicle_data.model_dump(), plate_key=normalize_plate(vehicle_data.vehicle_no))
+            db.add(vehicle)
+            db.flush()
+
+        vehicle_id = vehicle.id
+        new_listing = VehicleListing(
+            vehicle_id=vehicle_id, listed_by=user_id, title=listing_data.title,
+            description=listing_data.description, listing_type=listing_data.listing_type,
+            price=listing_data.price, location=location, image_url=listing_data.image_url
+        )
+        db.add(new_listing)
+        db.commit()
+        db.refresh(new_listing)
+
+        feed_cache.invalidate(location)
+        # Reading the vehicle after commit reloads its expired attributes
+        listing_index.add(
+            new_listing.id, vehicle.vehicle_type, vehicle.body_type, vehicle.engine_type,
+            location, new_listing.listing_type, new_listing.price, new_listing.created_at
+        )
+        text_index.add(new_listing.id, new_listing.title, new_listing.description)
+        image_pipeline.submit(new_listing.id, new_listing.image_url, location)
+
+        return {"message": "Vehicle listed successfully", "vehicle_id": vehicle_id, "listing_id": new_listing.id}
+    except HTTPException:
+        db.rollback()
+        raise
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Return the value at `fraction` of the sorted samples, in milliseconds."""
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 2)
+
+
+def run(create, args) -> dict:
+    """Create `args.listings` listings with `create` on a fresh database; return round trips and latency."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        SessionLocal = sessionmaker(bind=engine, autoflush=False)
+        Base.metadata.create_all(engine)
+
+        db = SessionLocal()
+        user = User(fullname="Bench Dealer", phone_number="+9779800000000", password="x",
+                    default_location=MajorCities.KATHMANDU)
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        # Vehicles registered earlier without a listing, for the relist calls
+        relists = {i for i in range(args.listings) if args.relist_every and i % args.relist_every == 0}
+        for i in relists:
+            data = listing(i)
+            db.add(Vehicle(**data.model_dump(include=set(VehicleCreate.model_fields)), plate_key=normalize_plate(data.vehicle_no)))
+        db.commit()
+        stolen_plates.refresh(db)
+        db.close()
+
+        round_trips = 0
+
+        def _round_trip(*_):
+            nonlocal round_trips
+            round_trips += 1
+            if args.rtt_ms:
+                time.sleep(args.rtt_ms / 1000)
+
+        event.listen(engine, "before_cursor_execute", _round_trip)
+        event.listen(engine, "commit", _round_trip)
+
+        latencies = []
+        for i in range(args.listings):
+            db = SessionLocal()
+            started = time.perf_counter()
+            create(listing(i), user_id, MajorCities.KATHMANDU, db)
+            latencies.append(time.perf_counter() - started)
+            db.close()
+        engine.dispose()
+
+    return {
+        "round_trips_per_call": round(round_trips / args.listings, 2),
+        "p50_ms": percentile(latencies, 0.50),
+        "p99_ms": percentile(latencies, 0.99),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--listings", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    parser.add_argument("--relist-every", type=int, default=10)
+    args = parser.parse_args()
+
+    # Only measure the write path; the resident indexes are exercised elsewhere
+    listing_index.disable()
+    text_index.disable()
+
+    legacy = run(legacy_create_vehicle_listing, args)
+    current = run(create_vehicle_listing, args)
+
+    print(json.dumps({
+        "benchmark": "create_listing",
+        "listings": args.listings,
+        "rtt_ms": args.rtt_ms,
+        "relist_every": args.relist_every,
+        "legacy": legacy,
+        "current": current,
+        "p99_speedup": round(legacy["p99_ms"] / current["p99_ms"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark: per-query latency of NLPRecommendationService.extract_preferences.
+
+Compares the compiled token-trie matcher (uncached, and behind the
+normalized-query memo) against the original `any(k in q for k in keywords)`
+substring scan, and lists queries where the matcher and the scan disagree
+(substring false positives such as "van" in "advanced").
+
+Run from the backend directory:
+    python -m benchmarks.bench_extract_preferences [--repeat N]
+"""
+import argparse
+import json
+import timeit
+
+from app.services.keyword_matcher import tokenize
+from app.services.nlp_recommendation_service import ExtractedPreferences, nlp_service
+
+QUERIES = [
+    "family suv",
+    "electric scooter",
+    "cheap bike",
+    "I need a spacious seven seater for a family trip to the mountains",
+    "advanced every day commuter",
+    "fuel efficient hybrid sedan for business and office commute in city traffic",
+    "off-road adventure motorcycle for camping, dual-sport or enduro",
+    "sporty two door coupe with performance and racing feel, petrol only",
+    "looking for a compact economical hatchback with good parking for urban use",
+    "van or minivan people carrier for group tour travel with kids",
+]
+
+
+def legacy_extract_preferences(query: str) -> ExtractedPreferences:
+    """The original substring-scan implementation, kept for comparison."""
+    knowledge = nlp_service.vehicle_knowledge
+    q = query.lower()
+    preferences = ExtractedPreferences(confidence_score=70)
+
+    for vt, data in knowledge["vehicle_types"].items():
+        if any(k in q for k in data["keywords"]):
+            preferences.vehicle_type = vt
+            break
+
+    body_types = [bt for bt, data in knowledge["body_types"].items() if any(k in q for k in data["keywords"])]
+    preferences.body_types = body_types if body_types else None
+
+    for et, data in knowledge["engine_types"].items():
+        if any(k in q for k in data["keywords"]):
+            preferences.engine_type = et
+            break
+
+    purposes = [p for p, data in knowledge["purposes"].items() if any(k in q for k in data["keywords"])]
+    preferences.purposes = purposes if purposes else None
+
+    return preferences
+
+
+def compiled_extract_preferences(query: str) -> ExtractedPreferences:
+    """The compiled matcher without the memo in front of it."""
+    return nlp_service._extract_preferences(" ".join(tokenize(query)))
+
+
+def time_per_query(fn, repeat: int) -> float:
+    """Return mean microseconds per query over the whole query set."""
+    seconds = timeit.timeit(lambda: [fn(q) for q in QUERIES], number=repeat)
+    return seconds / (repeat * len(QUERIES)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    legacy_us = time_per_query(legacy_extract_preferences, args.repeat)
+    compiled_us = time_per_query(compiled_extract_preferences, args.repeat)
+    memoized_us = time_per_query(nlp_service.extract_preferences, args.repeat)
+
+    differences = [
+        {"query": q, "legacy": repr(legacy_extract_preferences(q)), "compiled": repr(compiled_extract_preferences(q))}
+        for q in QUERIES
+        if legacy_extract_preferences(q) != compiled_extract_preferences(q)
+    ]
+
+    print(json.dumps({
+        "benchmark": "extract_preferences",
+        "queries": len(QUERIES),
+        "repeat": args.repeat,
+        "legacy_us_per_query": round(legacy_us, 2),
+        "compiled_us_per_query": round(compiled_us, 2),
+        "memoized_us_per_query": round(memoized_us, 2),
+        "speedup": round(legacy_us / compiled_us, 2),
+        "memoized_speedup": round(legacy_us / memoized_us, 2),
+        "differences": differences,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Micro-benchmark: per-request CPU to serialize recommendation responses.
+
+Compares the former path (row -> VehicleListingOut -> model_dump -> route
+dict -> response_model validation -> jsonable_encoder -> json) with the
+lean path (row -> dict -> one TypeAdapter validation -> dump_json) for
+10, 100 and 1000 candidate listings.
+
+Run from the backend directory:
+    python -m benchmarks.bench_recommendation_serialization [--repeat N]
+"""
+import argparse
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from app.enum import BodyType, EngineType, ListingType, MajorCities, VehicleType
+from app.schemas.listing_feed import listing_feed_adapter
+from app.schemas.vehicle import VehicleOut
+from app.schemas.vehicle_listing import VehicleListingOut
+from app.services.feed_service import FEED_COLUMNS
+from app.services.nlp_recommendation_service import nlp_service
+
+FeedRow = namedtuple("FeedRow", [column.key for column in FEED_COLUMNS])
+
+SIZES = (10, 100, 1000)
+
+
+def make_rows(count: int) -> list:
+    """Build synthetic rows shaped like `query_feed_rows` results."""
+    base = datetime(2025, 1, 1)
+    return [
+        FeedRow(
+            id=i, title=f"Listing number {i}", description="Well kept, single owner",
+            listing_type=ListingType.RENTAL, price=1500.0 + i, location=MajorCities.KATHMANDU,
+            image_url=f"/uploads/vehicles/{i}.jpg", thumbnail_url=f"/uploads/vehicles/derived/{i}_thumb.webp",
+            webp_url=f"/uploads/vehicles/derived/{i}.webp", created_at=base + timedelta(minutes=i),
+            vehicle_id=i, listed_by=1, vehicle_no=f"BA{i:06d}", vehicle_type=VehicleType.CAR,
+            engine_type=EngineType.PETROL, engine_battery_capacity="1500", body_type=BodyType.SUV,
+            company="Toyota", model_name="RAV4", fullname="Test Owner", phone_number="+9779800000000",
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_serialize(rows: list, logged_in: bool) -> bytes:
+    """The former three-conversion path, kept for comparison."""
+    results = []
+    for row in rows:
+        l_out = VehicleListingOut(
+            id=row.id, vehicle_id=row.vehicle_id, listed_by=row.listed_by, title=row.title,
+            description=row.description, listing_type=row.listing_type, price=row.price,
+            location=row.location, image_url=row.image_url, created_at=row.created_at,
+            vehicle=VehicleOut(
+                id=row.vehicle_id, vehicle_no=row.vehicle_no, vehicle_type=row.vehicle_type,
+                engine_type=row.engine_type, engine_battery_capacity=row.engine_battery_capacity,
+                body_type=row.body_type, company=row.company, model_name=row.model_name
+            )
+        )
+        listing = l_out.model_dump()
+        listing["user"] = {"id": row.listed_by, "fullname": row.fullname, "phone_number": row.phone_number}
+        results.append({
+            "id": listing["id"],
+            "title": listing["title"],
+            "description": listing.get("description"),
+            "listing_type": listing["listing_type"],
+            "price": listing["price"],
+            "location": listing.get("location"),
+            "image_url": listing.get("image_url"),
+            "thumbnail_url": row.thumbnail_url,
+            "webp_url": row.webp_url,
+            "created_at": listing.get("created_at"),
+            "vehicle": listing.get("vehicle"),
+            "user": {
+                "id": listing["user"]["id"],
+                "fullname": listing["user"]["fullname"],
+                "phone_number": listing["user"]["phone_number"] if logged_in else None
+            }
+        })
+    # What FastAPI does with response_model=List[VehicleListingFeedOut]
+    validated = listing_feed_adapter.validate_python(results)
+    content = jsonable_encoder(listing_feed_adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def lean_serialize(rows: list, logged_in: bool) -> bytes:
+    """The current path: plain dicts, validated and encoded once."""
+    results = []
+    for row in rows:
+        listing = nlp_service._listing_dict_from_row(row)
+        if not logged_in:
+            listing["user"]["phone_number"] = None
+        results.append(listing)
+    return listing_feed_adapter.dump_json(listing_feed_adapter.validate_python(results))
+
+
+def cpu_ms_per_request(fn, rows: list, repeat: int) -> float:
+    """Return mean process CPU milliseconds per serialized response."""
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(rows, False)
+    return (time.process_time() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    results = []
+    for size in SIZES:
+        rows = make_rows(size)
+        assert json.loads(legacy_serialize(rows, False)) == json.loads(lean_serialize(rows, False))
+        repeat = max(1, args.repeat * 10 // size)
+        legacy_ms = cpu_ms_per_request(legacy_serialize, rows, repeat)
+        lean_ms = cpu_ms_per_request(lean_serialize, rows, repeat)
+        results.append({
+            "candidates": size,
+            "repeat": repeat,
+            "legacy_cpu_ms": round(legacy_ms, 3),
+            "lean_cpu_ms": round(lean_ms, 3),
+            "speedup": round(legacy_ms / lean_ms, 2),
+        })
+
+    print(json.dumps({"benchmark": "recommendation_serialization", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+In-process SQLite stand-in for the MySQL database behind `app.database`.
+
+`sqlite_standin` points the application's engines and session factories
+at one SQLite file, so services (and the background helpers that open
+their own `SessionLocal()` sessions) run unchanged without a server. The
+schema is built by the application's own migrations and both engines are
+instrumented by `query_stats`, so benchmarks can report statements per call.
+
+SQLite answers in microseconds where MySQL costs a network round trip per
+statement; `simulate_round_trips` adds that latency back when the number
+of round trips matters more than raw CPU.
+"""
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import now
+
+import app.database as database
+from app.migrations import run_migrations
+from app.services.query_stats import instrument_engine
+
+
+@compiles(now, "sqlite")
+def _sqlite_now(element, compiler, **kw) -> str:
+    """
+    Render `func.now()` in the text format SQLAlchemy binds datetimes with on SQLite.
+
+    SQLite compares DATETIME columns as strings. CURRENT_TIMESTAMP has no
+    fractional part, so a `server_default=func.now()` value sorts before
+    the same instant bound from Python ("... 12:00:00" < "... 12:00:00.000000")
+    and keyset cursors on `created_at` would never step past tied rows.
+    MySQL compares DATETIMEs as values and is unaffected.
+    """
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def sqlite_standin(path: str) -> tuple:
+    """
+    Replace `app.database.engine` and `app.database.async_engine` with engines on a SQLite file.
+
+    Must run before anything imports `engine` / `async_engine` by name
+    (`app.main`, `app.routes`); modules holding `SessionLocal` or
+    `AsyncSessionLocal` follow the rebinding automatically.
+
+    Args:
+        path (str): SQLite database file, created if missing.
+
+    Returns:
+        tuple: (Engine, AsyncEngine) now used by the application.
+    """
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    database.engine = engine
+    database.async_engine = async_engine
+    database.SessionLocal.configure(bind=engine)
+    database.AsyncSessionLocal.configure(bind=async_engine)
+
+    run_migrations(engine)
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    return engine, async_engine
+
+
+def simulate_round_trips(rtt_ms: float, *engines) -> None:
+    """
+    Sleep `rtt_ms` before every statement and commit, like a database across the network.
+
+    Args:
+        rtt_ms (float): Simulated round-trip time in milliseconds (0 does nothing).
+        *engines (Engine | AsyncEngine): Engines to slow down.
+    """
+    if not rtt_ms:
+        return
+
+    def _round_trip(*_):
+        time.sleep(rtt_ms / 1000)
+
+    for engine in engines:
+        sync_engine: Engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        event.listen(sync_engine, "before_cursor_execute", _round_trip)
+        event.listen(sync_engine, "commit", _round_trip)
@@ -0,0 +1,333 @@
+"""
+Benchmark suite: latency of the main hot paths on a synthetic dataset.
+
+Generates (or reuses) a synthetic database with `benchmarks.synthetic`,
+points `app.database` at it through the SQLite stand-in and times, one
+call after another on fresh sessions like `get_db` hands out:
+
+- get_listings: a feed page per random listing type/city/sort with the
+  page cache cleared first, then the same pages again as cache hits.
+- get_recommendations: free-text queries through the recommender, with the
+  resident listing index warmed beforehand.
+- create_vehicle_listing: new listings, every tenth relisting a registered
+  vehicle.
+- report_vehicle: new stolen-plate reports, every tenth a repeat (400).
+- login: phone/password sign-in, including the bcrypt verification.
+
+Each benchmark reports p50/p95/p99/mean latency, throughput and SQL
+statements per call. The JSON output records the commit and dataset, so
+runs from two commits can be compared; `--baseline` does that directly.
+The focused `bench_*` scripts next to this one compare old and new
+implementations of single optimizations.
+
+Run from the backend directory:
+    python -m benchmarks.suite [--listings N] [--ops N] [--rtt-ms MS] [--db FILE] [--output FILE] [--baseline FILE]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from typing import Callable, List
+
+import sqlalchemy
+from fastapi import HTTPException
+
+from benchmarks.standin import simulate_round_trips, sqlite_standin
+from benchmarks import synthetic
+from app.database import AsyncSessionLocal, SessionLocal
+from app.enum import EngineType, FeedSort, ListingType, MajorCities, VehicleType
+from app.models.vehicle import Vehicle
+from app.schemas.reported_vehicle import ReportedVehicleCreate
+from app.schemas.vehicle import VehicleCreate
+from app.schemas.vehicle_listing import VehicleListingFullCreate
+from app.services.cache_service import feed_cache
+from app.services.feed_service import get_cached_listing_feed
+from app.services.listing_index import listing_index
+from app.services.listing_service import create_vehicle_listing
+from app.services.nlp_recommendation_service import nlp_service
+from app.services.query_stats import count_queries
+from app.services.report_service import report_vehicle
+from app.services.stolen_plate_filter import normalize_plate, stolen_plates
+from app.services.suppression_service import listing_suppression
+from app.services.user_service import login_user
+
+QUERIES = [
+    "family suv", "cheap bike", "electric scooter", "diesel pickup for business",
+    "fuel efficient hybrid sedan", "sporty naked bike", "seven seater van for tours",
+    "off-road adventure motorcycle", "compact hatchback for city commute", "luxury convertible",
+]
+
+# Benchmarks that write run after the read-only ones
+BENCHMARKS = ("get_listings", "get_listings_cached", "get_recommendations",
+              "create_vehicle_listing", "report_vehicle", "login")
+
+# bcrypt makes each login cost a few hundred milliseconds; run fewer of them
+LOGIN_OPS_DIVISOR = 10
+
+
+def summarize(latencies: List[float], queries: int) -> dict:
+    """Latency percentiles (ms), throughput and statements per call for one benchmark."""
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
+
+    total = sum(ordered)
+    return {
+        "ops": len(ordered),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "mean_ms": round(total / len(ordered) * 1000, 3),
+        "ops_per_second": round(len(ordered) / total, 1) if total else None,
+        "queries_per_op": round(queries / len(ordered), 2),
+    }
+
+
+def measure(label: str, ops: int, call: Callable[[int], None]) -> dict:
+    """Run `call(i)` for i in range(ops), timing each call and counting its statements."""
+    latencies = []
+    with count_queries(label) as stats:
+        for i in range(ops):
+            started = time.perf_counter()
+            call(i)
+            latencies.append(time.perf_counter() - started)
+    return summarize(latencies, stats.count)
+
+
+def with_session(fn: Callable) -> Callable[[int], None]:
+    """Give `fn(db, i)` a fresh session per call, closed afterwards."""
+    def _call(i: int) -> None:
+        db = SessionLocal()
+        try:
+            fn(db, i)
+        finally:
+            db.close()
+    return _call
+
+
+def bench_get_listings(rng: random.Random, ops: int) -> dict:
+    """Uncached feed pages for random partitions, then the same pages served from the page cache."""
+    city = synthetic.weighted_sampler(rng, synthetic.CITY_WEIGHTS)
+    pages = [(rng.choice(list(ListingType)), city(), rng.choice(list(FeedSort)), rng.random() < 0.5)
+             for _ in range(ops)]
+
+    def _page(db, i: int, cold: bool) -> None:
+        listing_type, location, sort, logged_in = pages[i]
+        if cold:
+            feed_cache.pages.clear()
+        get_cached_listing_feed(db=db, listing_type=listing_type, location=location, logged_in=logged_in, sort=sort)
+
+    cold = measure("get_listings", ops, with_session(lambda db, i: _page(db, i, True)))
+    # Unmeasured pass to fill the cache (the cold pass keeps only its last page)
+    warm = with_session(lambda db, i: _page(db, i, False))
+    for i in range(ops):
+        warm(i)
+    cached = measure("get_listings_cached", ops, warm)
+    return {"get_listings": cold, "get_listings_cached": cached}
+
+
+def bench_get_recommendations(rng: random.Random, ops: int) -> dict:
+    """Recommendations for the sample queries, half of them scoped to a city."""
+    requests = [(rng.choice(QUERIES), rng.choice(list(MajorCities)).value if rng.random() < 0.5 else None)
+                for _ in range(ops)]
+
+    def _recommend(db, i: int) -> None:
+        query, location = requests[i]
+        nlp_service.get_recommendations(db, query, location=location, limit=10)
+
+    return measure("get_recommendations", ops, with_session(_recommend))
+
+
+def run_plate(run: int, index: int, vehicle_type: VehicleType) -> str:
+    """Plate number for a benchmark write; the `BN` zone never occurs in generated data."""
+    return f"BN {run} {synthetic.PLATE_CLASSES[vehicle_type]} {index:06d}"
+
+
+def bench_create_vehicle_listing(rng: random.Random, ops: int, run: int, user_id: int) -> dict:
+    """New listings on fresh plates, every tenth for a vehicle registered without a listing."""
+    payloads = []
+    relists = []
+    for i in range(ops):
+        vehicle_type = rng.choice(list(VehicleType))
+        body_type = synthetic.weighted_sampler(rng, synthetic.BODY_WEIGHTS[vehicle_type])()
+        company, model_name = rng.choice(synthetic.MODELS[vehicle_type])
+        payload = VehicleListingFullCreate(
+            vehicle_no=run_plate(run, i, vehicle_type), vehicle_type=vehicle_type,
+            engine_type=EngineType.PETROL, engine_battery_capacity="150", body_type=body_type,
+            company=company, model_name=model_name, title=f"{company} {model_name} for sale", description=None,
+            listing_type=ListingType.SALE, price=float(rng.randint(100, 5000) * 1000), location=MajorCities.KATHMANDU
+        )
+        payloads.append(payload)
+        if i % 10 == 0:
+            relists.append(payload)
+
+    # Register the relisted vehicles up front, as a listing deleted earlier would leave them
+    db = SessionLocal()
+    for payload in relists:
+        db.add(Vehicle(**payload.model_dump(include=set(VehicleCreate.model_fields)),
+                       plate_key=normalize_plate(payload.vehicle_no)))
+    db.commit()
+    db.close()
+
+    def _create(db, i: int) -> None:
+        create_vehicle_listing(payloads[i], user_id, MajorCities.KATHMANDU, db)
+
+    return measure("create_vehicle_listing", ops, with_session(_create))
+
+
+def bench_report_vehicle(rng: random.Random, ops: int, run: int, user_id: int) -> dict:
+    """Stolen-plate reports on fresh plates, every tenth repeating an earlier one (rejected with 400)."""
+    reports = []
+    for i in range(ops):
+        if i % 10 == 9 and reports:
+            reports.append(reports[rng.randrange(len(reports))])
+        else:
+            vehicle_type = rng.choice(list(VehicleType))
+            reports.append(ReportedVehicleCreate(vehicle_no=run_plate(run, ops + i, vehicle_type),
+                                                 vehicle_type=vehicle_type, reported_by=user_id))
+
+    def _report(db, i: int) -> None:
+        try:
+            report_vehicle(reports[i], user_id, db)
+        except HTTPException:
+            pass
+
+    return measure("report_vehicle", ops, with_session(_report))
+
+
+def bench_login(rng: random.Random, ops: int, users: int) -> dict:
+    """Sign-ins of random users on the async session, as POST /login does."""
+    phone_numbers = [synthetic.phone_number(rng.randrange(users)) for _ in range(ops)]
+
+    async def _run() -> dict:
+        latencies = []
+        with count_queries("login") as stats:
+            for phone_number in phone_numbers:
+                started = time.perf_counter()
+                async with AsyncSessionLocal() as db:
+                    await login_user(phone_number, synthetic.BENCH_PASSWORD, db)
+                latencies.append(time.perf_counter() - started)
+        return summarize(latencies, stats.count)
+
+    return asyncio.run(_run())
+
+
+def git_commit() -> str:
+    """Return the checked-out commit (with a `-dirty` suffix for uncommitted changes), or None outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """Ratio of this run's p50/p99 latency to the baseline's per benchmark (above 1 is slower)."""
+    comparison = {}
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        comparison[name] = {
+            metric: round(current[metric] / previous[metric], 2) if previous[metric] else None
+            for metric in ("p50_ms", "p99_ms")
+        }
+        comparison[name]["queries_per_op"] = round(current["queries_per_op"] - previous["queries_per_op"], 2)
+    return comparison
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--listings", type=int, default=10000, help="Synthetic listings (1k to 1M)")
+    parser.add_argument("--ops", type=int, default=500, help="Calls per benchmark")
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="Simulated database round trip per statement")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db", help="Reuse (or create) this SQLite file instead of a temporary one; "
+                                     "benchmarks write to it, so regenerate between comparable runs")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Run only these benchmarks")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+    selected = set(args.only or BENCHMARKS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or os.path.join(tmp, "bench.db")
+        reuse = os.path.exists(path)
+        engine, async_engine = sqlite_standin(path)
+        if reuse:
+            with engine.connect() as conn:
+                dataset = {
+                    key: conn.execute(sqlalchemy.text(f"SELECT COUNT(*) FROM {table}")).scalar()
+                    for key, table in (("users", "users"), ("listings", "vehicle_listings"),
+                                       ("reports", "reported_vehicles"))
+                }
+            dataset["reused"] = path
+            users = dataset["users"]
+            # Earlier runs wrote to this file; give this run's plates their own series
+            run = int(time.time()) % 100000
+        else:
+            dataset = synthetic.generate(engine, args.listings, seed=args.seed)
+            users, run = dataset["users"], 0
+
+        db = SessionLocal()
+        warm_started = time.perf_counter()
+        # What the lifespan's background threads do at startup
+        listing_suppression.sweep(db)
+        listing_index.warm(db)
+        stolen_plates.refresh(db)
+        dataset["warm_seconds"] = round(time.perf_counter() - warm_started, 2)
+        db.close()
+
+        simulate_round_trips(args.rtt_ms, engine, async_engine)
+        rng = random.Random(args.seed)
+
+        results = {}
+        if selected & {"get_listings", "get_listings_cached"}:
+            listings_results = bench_get_listings(rng, args.ops)
+            results.update({name: value for name, value in listings_results.items() if name in selected})
+        if "get_recommendations" in selected:
+            results["get_recommendations"] = bench_get_recommendations(rng, args.ops)
+        if "create_vehicle_listing" in selected:
+            results["create_vehicle_listing"] = bench_create_vehicle_listing(rng, args.ops, run, user_id=1)
+        if "report_vehicle" in selected:
+            results["report_vehicle"] = bench_report_vehicle(rng, args.ops, run, user_id=1)
+        if "login" in selected:
+            results["login"] = bench_login(rng, max(1, args.ops // LOGIN_OPS_DIVISOR), users)
+
+        engine.dispose()
+        asyncio.run(async_engine.dispose())
+
+    report = {
+        "suite": "shuttle",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "config": {"ops": args.ops, "rtt_ms": args.rtt_ms, "seed": args.seed},
+        "dataset": dataset,
+        "results": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline_commit"] = baseline.get("commit")
+        report["vs_baseline"] = compare(results, baseline)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
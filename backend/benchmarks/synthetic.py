@@ -0,0 +1,256 @@
+"""
+Synthetic data generator for the benchmark suite.
+
+Fills an empty Shuttle schema with users, vehicles, listings and stolen-plate
+reports at any scale (1k to 1M+ listings). Distributions follow the market
+rather than being uniform: bikes outnumber cars, most listings sit in the
+Kathmandu valley, petrol dominates, body types depend on the vehicle type,
+and rentals are priced far below sales. Everything derives from one seed,
+so the same arguments always produce the same database.
+
+Rows are written with one multi-row INSERT per table per batch and explicit
+ids, so a million listings take seconds rather than an ORM flush per row.
+
+Run from the backend directory to build a database file for reuse:
+    python -m benchmarks.synthetic --db bench.db [--listings N] [--seed S]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.enum import BodyType, EngineType, ListingType, MajorCities, VehicleType
+from app.models.reported_vehicle import ReportedVehicle
+from app.models.user import User
+from app.models.vehicle import Vehicle
+from app.models.vehicle_listing import VehicleListing
+from app.services.stolen_plate_filter import normalize_plate
+from app.services.user_service import get_password_hash
+
+# Every synthetic user shares this password, hashed once, so the login benchmark can sign in
+BENCH_PASSWORD = "bench-password"
+
+# Listings per dealer/owner and stolen-plate reports per listing
+LISTINGS_PER_USER = 4
+REPORTS_PER_LISTING = 0.01
+# Share of reports that hit a plate which is actually listed
+REPORTED_LISTED_SHARE = 0.2
+IMAGE_SHARE = 0.7
+DESCRIPTION_SHARE = 0.6
+
+# Median prices in NPR; listing prices are log-normal around them, rentals per day
+BIKE_BASE_PRICE = 250000
+CAR_BASE_PRICE = 4000000
+RENTAL_PRICE_DIVISOR = 200
+
+BATCH_SIZE = 10000
+
+# Relative weights (not percentages)
+CITY_WEIGHTS = {
+    MajorCities.KATHMANDU: 30, MajorCities.LALITPUR: 12, MajorCities.BHAKTAPUR: 8, MajorCities.POKHARA: 10,
+    MajorCities.CHITWAN: 4, MajorCities.BHARATPUR: 4, MajorCities.BIRATNAGAR: 5, MajorCities.BIRGUNJ: 4,
+    MajorCities.BUTWAL: 4, MajorCities.DHARAN: 3, MajorCities.ITAHARI: 3, MajorCities.HETAUDA: 2,
+    MajorCities.JANAKPUR: 2, MajorCities.NEPALGUNJ: 2, MajorCities.DHANGADI: 2, MajorCities.LUMBINI: 1,
+    MajorCities.GORKHA: 1, MajorCities.BARDIYA: 1,
+}
+VEHICLE_TYPE_WEIGHTS = {VehicleType.BIKE: 70, VehicleType.CAR: 30}
+ENGINE_WEIGHTS = {
+    VehicleType.BIKE: {EngineType.PETROL: 85, EngineType.ELECTRIC: 15},
+    VehicleType.CAR: {EngineType.PETROL: 55, EngineType.DIESEL: 25, EngineType.ELECTRIC: 12, EngineType.HYBRID: 8},
+}
+BODY_WEIGHTS = {
+    VehicleType.BIKE: {
+        BodyType.COMMUTER: 35, BodyType.SCOTTER: 30, BodyType.NAKED_SPORT: 12, BodyType.SPORT: 8,
+        BodyType.ADVENTURE: 6, BodyType.CRUISER: 4, BodyType.DIRT: 3, BodyType.TOURING: 2,
+    },
+    VehicleType.CAR: {
+        BodyType.SUV: 30, BodyType.HATCHBACK: 25, BodyType.SEDAN: 20, BodyType.CROSSOVER: 10,
+        BodyType.PICKUP: 6, BodyType.VAN: 5, BodyType.COUPE: 2, BodyType.CONVERTIBLE: 2,
+    },
+}
+LISTING_TYPE_WEIGHTS = {ListingType.SALE: 65, ListingType.RENTAL: 35}
+MODELS = {
+    VehicleType.BIKE: [
+        ("Honda", "Shine"), ("Bajaj", "Pulsar 150"), ("Yamaha", "FZ-S"), ("TVS", "Apache RTR"),
+        ("Hero", "Splendor"), ("Honda", "Dio"), ("Yadea", "G5"), ("Royal Enfield", "Classic 350"),
+        ("KTM", "Duke 200"), ("Suzuki", "Gixxer"),
+    ],
+    VehicleType.CAR: [
+        ("Hyundai", "Creta"), ("Suzuki", "Swift"), ("Toyota", "Hilux"), ("Kia", "Seltos"),
+        ("Tata", "Nexon EV"), ("Mahindra", "Scorpio"), ("Honda", "City"), ("BYD", "Atto 3"),
+        ("Toyota", "Hiace"), ("Nissan", "Magnite"),
+    ],
+}
+ENGINE_CAPACITY = {
+    EngineType.PETROL: ("110", "125", "150", "200", "350", "1200", "1500", "2000"),
+    EngineType.DIESEL: ("1500", "2200", "2800"),
+    EngineType.ELECTRIC: ("3.2", "40.5", "60.5"),
+    EngineType.HYBRID: ("1800", "2500"),
+}
+DESCRIPTIONS = (
+    "Single owner, well maintained and regularly serviced.",
+    "Great for daily city commute, excellent mileage.",
+    "Spacious family vehicle, perfect for long trips.",
+    "Off-road ready, recently serviced, new tyres.",
+    "Fuel efficient and budget friendly, ideal for students.",
+    "Comfortable ride for business and office use.",
+)
+# Nepali zone codes used as plate prefixes
+PLATE_ZONES = ("BA", "GA", "KO", "LU", "ME", "NA", "SE", "JA", "DHA", "RA", "BHE", "MA", "KA", "PRA")
+PLATE_CLASSES = {VehicleType.BIKE: "PA", VehicleType.CAR: "CHA"}
+
+
+def weighted_sampler(rng: random.Random, weights: Dict) -> Callable[[], object]:
+    """Return a function drawing one key of `weights` per call."""
+    population, cumulative, total = list(weights), [], 0
+    for weight in weights.values():
+        total += weight
+        cumulative.append(total)
+    return lambda: rng.choices(population, cum_weights=cumulative)[0]
+
+
+def plate(index: int, vehicle_type: VehicleType) -> str:
+    """Return the unique plate number of the `index`-th synthetic vehicle, e.g. `BA 12 PA 3456`."""
+    zone, serial = PLATE_ZONES[index % len(PLATE_ZONES)], index // len(PLATE_ZONES)
+    return f"{zone} {serial // 10000} {PLATE_CLASSES[vehicle_type]} {serial % 10000:04d}"
+
+
+def phone_number(index: int) -> str:
+    """Return the unique phone number of the `index`-th synthetic user."""
+    return f"+97798{index:08d}"
+
+
+def generate(
+    engine: Engine,
+    listings: int,
+    users: int = None,
+    reports: int = None,
+    seed: int = 7,
+    batch_size: int = BATCH_SIZE
+) -> dict:
+    """
+    Populate an empty database with synthetic users, vehicles, listings and reports.
+
+    Every vehicle gets one listing. Vehicle and user ids are 1..N, so
+    `plate(i - 1, ...)` and `phone_number(i - 1)` reproduce any row's keys.
+    Rows are built and written one batch at a time, so memory stays flat
+    however many listings are requested.
+
+    Args:
+        engine (Engine): Engine of a database with the Shuttle schema and no rows.
+        listings (int): Number of vehicles and listings.
+        users (int, optional): Number of users. Defaults to one per LISTINGS_PER_USER listings.
+        reports (int, optional): Stolen-plate reports. Defaults to REPORTS_PER_LISTING per listing.
+        seed (int, optional): Random seed.
+        batch_size (int, optional): Rows per INSERT statement.
+
+    Returns:
+        dict: Row counts per table and generation time.
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    users = users or max(1, listings // LISTINGS_PER_USER)
+    reports = int(listings * REPORTS_PER_LISTING) if reports is None else reports
+
+    city = weighted_sampler(rng, CITY_WEIGHTS)
+    vehicle_type = weighted_sampler(rng, VEHICLE_TYPE_WEIGHTS)
+    engine_type = {vt: weighted_sampler(rng, weights) for vt, weights in ENGINE_WEIGHTS.items()}
+    body_type = {vt: weighted_sampler(rng, weights) for vt, weights in BODY_WEIGHTS.items()}
+    listing_type = weighted_sampler(rng, LISTING_TYPE_WEIGHTS)
+    newest = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    # Vehicle type per vehicle index, so reports can name listed plates
+    is_car = bytearray(listings)
+
+    with engine.begin() as conn:
+        for offset in range(0, users, batch_size):
+            conn.execute(insert(User.__table__), [
+                {"id": i + 1, "fullname": f"Bench User {i}", "phone_number": phone_number(i),
+                 "password": hashed_password, "default_location": city()}
+                for i in range(offset, min(users, offset + batch_size))
+            ])
+
+        for offset in range(0, listings, batch_size):
+            vehicle_rows, listing_rows = [], []
+            for i in range(offset, min(listings, offset + batch_size)):
+                vt = vehicle_type()
+                is_car[i] = vt == VehicleType.CAR
+                et = engine_type[vt]()
+                company, model_name = rng.choice(MODELS[vt])
+                vehicle_no = plate(i, vt)
+                vehicle_rows.append({
+                    "id": i + 1, "vehicle_no": vehicle_no, "plate_key": normalize_plate(vehicle_no),
+                    "vehicle_type": vt, "engine_type": et, "engine_battery_capacity": rng.choice(ENGINE_CAPACITY[et]),
+                    "body_type": body_type[vt](), "company": company, "model_name": model_name,
+                })
+
+                lt = listing_type()
+                price = (BIKE_BASE_PRICE if vt == VehicleType.BIKE else CAR_BASE_PRICE) * rng.lognormvariate(0, 0.5)
+                if lt == ListingType.RENTAL:
+                    price /= RENTAL_PRICE_DIVISOR
+                has_image = rng.random() < IMAGE_SHARE
+                listing_rows.append({
+                    "id": i + 1, "vehicle_id": i + 1, "listed_by": rng.randint(1, users),
+                    "title": f"{company} {model_name} for {lt.value.lower()}",
+                    "image_url": f"/uploads/vehicles/{i % 256:02x}/bench-{i}.jpg" if has_image else None,
+                    "thumbnail_url": f"/uploads/vehicles/derived/bench-{i}_thumb.webp" if has_image else None,
+                    "webp_url": f"/uploads/vehicles/derived/bench-{i}.webp" if has_image else None,
+                    "description": rng.choice(DESCRIPTIONS) if rng.random() < DESCRIPTION_SHARE else None,
+                    "listing_type": lt, "price": round(price, -1 if lt == ListingType.RENTAL else -3),
+                    "location": city(), "created_at": newest - timedelta(seconds=rng.randint(0, 365 * 86400)),
+                })
+            conn.execute(insert(Vehicle.__table__), vehicle_rows)
+            conn.execute(insert(VehicleListing.__table__), listing_rows)
+
+        # Some reports name listed plates (the suppression sweep hides those listings), the rest unseen ones
+        report_rows, seen = [], set()
+        for i in range(reports):
+            if listings and rng.random() < REPORTED_LISTED_SHARE:
+                index = rng.randrange(listings)
+                vt = VehicleType.CAR if is_car[index] else VehicleType.BIKE
+            else:
+                index, vt = listings + i, vehicle_type()
+            vehicle_no = plate(index, vt)
+            key = (normalize_plate(vehicle_no), vt)
+            if key in seen:
+                continue
+            seen.add(key)
+            report_rows.append({
+                "vehicle_no": vehicle_no, "plate_key": key[0], "vehicle_type": vt,
+                "reported_by": rng.randint(1, users), "reported_at": newest - timedelta(minutes=i),
+            })
+        for offset in range(0, len(report_rows), batch_size):
+            conn.execute(insert(ReportedVehicle.__table__), report_rows[offset:offset + batch_size])
+
+    return {
+        "users": users,
+        "vehicles": listings,
+        "listings": listings,
+        "reports": len(report_rows),
+        "seed": seed,
+        "generate_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main() -> None:
+    from benchmarks.standin import sqlite_standin
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", required=True, help="SQLite file to create")
+    parser.add_argument("--listings", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=None)
+    parser.add_argument("--reports", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine, _ = sqlite_standin(args.db)
+    print(json.dumps(generate(engine, args.listings, args.users, args.reports, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("SESSION_SECRET_KEY", "test-session-secret")
+
+
+@pytest.fixture(scope="session")
+def client(tmp_path_factory):
+    """
+    TestClient for the app on a SQLite stand-in filled with synthetic listings.
+
+    The lifespan (and its background warm-ups) is not started, so every
+    request takes the same, deterministic code path.
+    """
+    from benchmarks.standin import sqlite_standin
+    from benchmarks.synthetic import generate
+
+    engine, _ = sqlite_standin(str(tmp_path_factory.mktemp("db") / "test.db"))
+    generate(engine, listings=200)
+
+    # Imported only now: app.main binds app.database.engine at import time
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
@@ -0,0 +1,118 @@
+import csv
+import io
+
+import pytest
+
+from app.enum import BodyType, EngineType, VehicleType
+from app.models.reported_vehicle import ReportedVehicle
+from app.models.vehicle import Vehicle
+from app.services import image_service, listing_service
+from app.services.query_stats import assert_max_queries
+from app.services.stolen_plate_filter import normalize_plate
+from app.services.storage_service import UPLOAD_DIR
+
+FIELDS = ("vehicle_no", "vehicle_type", "engine_type", "engine_battery_capacity", "body_type",
+          "company", "model_name", "title", "description", "listing_type", "price", "location", "image")
+
+
+def row(vehicle_no: str, **overrides) -> dict:
+    return {
+        "vehicle_no": vehicle_no, "vehicle_type": "Car", "engine_type": "Petrol", "engine_battery_capacity": "1500",
+        "body_type": "SUV", "company": "Toyota", "model_name": "RAV4", "title": f"Lot listing {vehicle_no}",
+        "description": "", "listing_type": "Sale", "price": "25000", "location": "Kathmandu", "image": "front.jpg",
+        **overrides,
+    }
+
+
+def manifest(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+@pytest.fixture(autouse=True)
+def no_derivatives_or_leftover_uploads(monkeypatch):
+    """Skip the image process pool and remove images the imports store."""
+    monkeypatch.setattr(image_service, "IMAGE_DERIVATIVES_ENABLED", False)
+    before = set(UPLOAD_DIR.rglob("*"))
+    yield
+    for path in sorted(set(UPLOAD_DIR.rglob("*")) - before, key=lambda p: len(p.parts), reverse=True):
+        path.unlink() if path.is_file() else path.rmdir()
+
+
+def post(client, rows, images=("front.jpg",)):
+    return client.post(
+        "/vehicles/list/bulk", params={"user_id": 1},
+        files=[("manifest", ("lot.csv", manifest(rows), "text/csv"))]
+        + [("images", (name, f"image bytes of {name}".encode(), "image/jpeg")) for name in images]
+    )
+
+
+def test_bulk_listing_row_statuses(client):
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.add(ReportedVehicle(vehicle_no="BL 9 PA 0003", plate_key=normalize_plate("BL 9 PA 0003"),
+                               vehicle_type=VehicleType.CAR, reported_by=1))
+        registered = Vehicle(vehicle_no="BL 9 PA 0004", plate_key=normalize_plate("BL 9 PA 0004"),
+                             vehicle_type=VehicleType.CAR, engine_type=EngineType.DIESEL,
+                             engine_battery_capacity="2000", body_type=BodyType.PICKUP,
+                             company="Tata", model_name="Xenon")
+        db.add(registered)
+        db.commit()
+        registered_id = registered.id
+    finally:
+        db.close()
+
+    assert post(client, [row("BL 9 PA 0002")]).json()["created"] == 1
+
+    response = post(client, [
+        row("BL 9 PA 0001"),                          # 2: new vehicle
+        row("BL 9 PA 0002"),                          # 3: listed by the first import
+        row("bl-9-pa-0003"),                          # 4: reported stolen (normalized plate)
+        row("BL-9-PA-0001"),                          # 5: repeats line 2
+        row("BL 9 PA 0005", price="-5"),              # 6: fails validation
+        row("BL 9 PA 0006", image="missing.jpg"),     # 7: image not uploaded
+        row("BL 9 PA 0007", image=""),                # 8: no image
+        row("BL 9 PA 0004"),                          # 9: registered vehicle without a listing
+    ])
+    assert response.status_code == 200, response.text
+    body = response.json()
+    results = {result["line"]: result for result in body["results"]}
+
+    assert {line: result["status"] for line, result in results.items()} == {
+        2: "created", 3: "already_listed", 4: "reported_stolen", 5: "duplicate_in_file",
+        6: "invalid", 7: "invalid", 8: "invalid", 9: "created",
+    }
+    assert (body["total"], body["created"], body["already_listed"], body["reported_stolen"],
+            body["duplicate_in_file"], body["invalid"]) == (8, 2, 1, 1, 1, 3)
+    assert results[6]["detail"].startswith("price:")
+    assert results[7]["detail"] == "Image 'missing.jpg' was not uploaded"
+    assert results[8]["detail"] == "image is required"
+    # The registered vehicle is reused, not inserted again
+    assert results[9]["vehicle_id"] == registered_id
+
+    listed = client.get("/vehicles/listings", params={"listing_type": "SALE", "location": "Kathmandu", "limit": 100})
+    titles = {item["title"] for item in listed.json()["items"]}
+    assert {"Lot listing BL 9 PA 0001", "Lot listing BL 9 PA 0004"} <= titles
+
+
+def test_bulk_listing_lot_runs_six_statements(client):
+    response = post(client, [row(f"BL 8 PA {i:04d}") for i in range(200)])
+    assert response.status_code == 200
+    assert response.json()["created"] == 200
+    # Stolen check, existing vehicles, vehicle insert and ids, listing insert and ids
+    assert_max_queries(response, 6)
+
+
+def test_bulk_listing_row_cap(client, monkeypatch):
+    monkeypatch.setattr(listing_service, "BULK_LISTING_MAX_ROWS", 3)
+
+    response = post(client, [row(f"BL 7 PA {i:04d}") for i in range(4)])
+    assert response.status_code == 413
+
+    response = post(client, [row(f"BL 7 PA {i:04d}") for i in range(3)])
+    assert response.json()["created"] == 3
@@ -0,0 +1,71 @@
+import json
+
+
+def _post(client, name: str, content: str, content_type: str = "text/csv"):
+    response = client.post(
+        "/vehicles/report/bulk", params={"user_id": 1},
+        files={"file": (name, content.encode("utf-8"), content_type)}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _statuses(body: dict) -> dict:
+    return {result["line"]: result["status"] for result in body["results"]}
+
+
+def test_bulk_report_row_statuses(client):
+    _post(client, "first.csv", "vehicle_no,vehicle_type\nBR 9 PA 0001,Car\n")
+
+    body = _post(client, "bulletin.csv", "\n".join([
+        "vehicle_no,vehicle_type",
+        "BR 9 PA 0002,Car",        # 2: new
+        "br-9-pa-0002,car",        # 3: same plate after normalization
+        "BR 9 PA 0001,CAR",        # 4: reported by the first upload
+        "BR 9 PA 0002,Bike",       # 5: same number, other vehicle type
+        ",Car",                    # 6: no plate
+        "BR 9 PA 0003,Truck",      # 7: unknown type
+        "",
+        "BR 9 PA 0004,Bike",       # 9: new, after a blank line
+    ]) + "\n")
+
+    assert _statuses(body) == {
+        2: "inserted", 3: "duplicate_in_file", 4: "already_reported", 5: "inserted",
+        6: "invalid", 7: "invalid", 9: "inserted",
+    }
+    assert (body["total"], body["inserted"], body["already_reported"], body["duplicate_in_file"], body["invalid"]) \
+        == (7, 3, 1, 1, 2)
+    details = {result["line"]: result.get("detail") for result in body["results"]}
+    assert details[6] == "Invalid vehicle_no"
+    assert details[7] == "Invalid vehicle_type"
+
+
+def test_bulk_report_multiline_quoted_csv_field(client):
+    body = _post(client, "notes.csv", (
+        "vehicle_no,vehicle_type,notes\n"
+        'BR 9 PA 0101,Car,"taken from a parking lot,\nnear the ring road"\n'
+        "BR 9 PA 0102,Bike,\n"
+    ))
+
+    assert _statuses(body) == {2: "inserted", 4: "inserted"}
+    assert [result["vehicle_no"] for result in body["results"]] == ["BR 9 PA 0101", "BR 9 PA 0102"]
+
+
+def test_bulk_report_extension_wins_over_content_type(client):
+    rows = [{"vehicle_no": "BR 9 PA 0201", "vehicle_type": "Car"}, {"vehicle_no": "BR 9 PA 0202", "vehicle_type": "Bike"}]
+    content = "\n".join(json.dumps(row) for row in rows) + "\n"
+
+    # Browsers and curl label uploads text/csv or octet-stream regardless of the file
+    body = _post(client, "bulletin.ndjson", content, "text/csv")
+    assert _statuses(body) == {1: "inserted", 2: "inserted"}
+
+    body = _post(client, "bulletin", "vehicle_no,vehicle_type\nBR 9 PA 0203,Car\n", "text/csv")
+    assert _statuses(body) == {2: "inserted"}
+
+
+def test_bulk_report_rejects_unknown_manifest_type(client):
+    response = client.post(
+        "/vehicles/report/bulk", params={"user_id": 1},
+        files={"file": ("bulletin.xlsx", b"...", "application/octet-stream")}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,29 @@
+from app.services import metrics_service
+from app.services.cache_service import LRUCache
+
+DIAGNOSTIC_PATHS = ("/cache/stats", "/auth/pool/stats", "/metrics")
+
+
+def test_diagnostics_hidden_without_configured_token(client, monkeypatch):
+    monkeypatch.setattr(metrics_service, "DIAGNOSTICS_TOKEN", "")
+    for path in DIAGNOSTIC_PATHS:
+        assert client.get(path, headers={"Authorization": "Bearer anything"}).status_code == 404
+
+
+def test_diagnostics_require_token(client, monkeypatch):
+    monkeypatch.setattr(metrics_service, "DIAGNOSTICS_TOKEN", "s3cret")
+    for path in DIAGNOSTIC_PATHS:
+        assert client.get(path).status_code == 401
+        assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.get(path, headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+
+def test_version_drops_are_counted_as_invalidations():
+    cache = LRUCache(max_entries=4, ttl_seconds=60)
+    cache.set("page", "body", version=1)
+    assert cache.get("page", version=2) is None
+
+    stats = cache.stats()
+    assert stats["invalidations"] == 1
+    assert stats["expirations"] == 0
+    assert stats["misses"] == 1
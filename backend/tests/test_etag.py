@@ -0,0 +1,45 @@
+from app.enum import ListingType, MajorCities
+from app.services.etag_service import bump_listing_data_version, listing_data_version
+from app.services.query_stats import count_queries
+
+
+def test_data_version_is_one_statement_and_follows_bumps(client):
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with count_queries() as stats:
+            before = listing_data_version(db, ListingType.SALE, MajorCities.POKHARA)
+        assert stats.count == 1
+        other_city = listing_data_version(db, ListingType.SALE, MajorCities.KATHMANDU)
+        everywhere = listing_data_version(db)
+
+        bump_listing_data_version(db, [MajorCities.POKHARA])
+        db.commit()
+
+        assert listing_data_version(db, ListingType.SALE, MajorCities.POKHARA) != before
+        assert listing_data_version(db, ListingType.SALE, MajorCities.KATHMANDU) == other_city
+        assert listing_data_version(db) != everywhere
+    finally:
+        db.close()
+
+
+def test_feed_etag_changes_when_city_version_is_bumped(client):
+    from app.database import SessionLocal
+    from app.services.cache_service import feed_cache
+
+    params = {"listing_type": "RENTAL", "location": "Pokhara"}
+    etag = client.get("/vehicles/listings", params=params).headers["etag"]
+
+    db = SessionLocal()
+    try:
+        bump_listing_data_version(db, [MajorCities.POKHARA])
+        db.commit()
+    finally:
+        db.close()
+    # Another worker's change: this process's feed cache has not been told
+    feed_cache.pages.clear()
+
+    response = client.get("/vehicles/listings", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
@@ -0,0 +1,55 @@
+from app.enum import BodyType, EngineType, VehicleType
+from app.services.keyword_matcher import KeywordMatcher, tokenize
+from app.services.nlp_recommendation_service import nlp_service
+
+KNOWLEDGE = {
+    "engine_types": {EngineType.ELECTRIC: {"keywords": ["ev", "electric"]}},
+    "body_types": {
+        BodyType.SUV: {"keywords": ["suv", "seven seater"]},
+        BodyType.VAN: {"keywords": ["van", "people carrier"]},
+    },
+    "vehicle_types": {VehicleType.BIKE: {"keywords": ["bike"]}},
+}
+
+
+def test_tokenize_splits_on_spaces_hyphens_and_punctuation():
+    assert tokenize("Off-road, 4x4  SUV!") == ["off", "road", "4x4", "suv"]
+
+
+def test_keywords_only_match_whole_words():
+    matcher = KeywordMatcher(KNOWLEDGE)
+
+    assert matcher.match("seven seats for every trip") == {}
+    assert matcher.match("advanced driver assistance") == {}
+    assert matcher.match("an ev or a van") == {
+        "engine_types": {EngineType.ELECTRIC}, "body_types": {BodyType.VAN},
+    }
+
+
+def test_multi_word_keywords_match_across_separators():
+    matcher = KeywordMatcher(KNOWLEDGE)
+
+    assert matcher.match("a Seven-Seater people  carrier") == {"body_types": {BodyType.SUV, BodyType.VAN}}
+    assert matcher.match("seven cars") == {}
+
+
+def test_plurals_fold_onto_known_keywords():
+    matcher = KeywordMatcher(KNOWLEDGE)
+
+    assert matcher.match("suvs") == {"body_types": {BodyType.SUV}}
+    assert matcher.match("cheap bikes") == {"vehicle_types": {VehicleType.BIKE}}
+    # Short tokens are never folded: "evs" is not a plural of "ev"
+    assert matcher.match("evs") == {}
+
+
+def test_extract_preferences_ignores_substring_hits():
+    preferences = nlp_service.extract_preferences("advanced seven seater")
+    assert preferences.engine_type is None
+    assert preferences.vehicle_type is None
+    assert preferences.body_types == [BodyType.SUV]
+
+    preferences = nlp_service.extract_preferences("electric SUVs")
+    assert (preferences.vehicle_type, preferences.body_types, preferences.engine_type) \
+        == (VehicleType.CAR, [BodyType.SUV], EngineType.ELECTRIC)
+
+    assert nlp_service.extract_preferences("used bikes").vehicle_type == VehicleType.BIKE
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.enum import BodyType, EngineType, MajorCities, VehicleType
+from app.models.vehicle import Vehicle
+from app.models.vehicle_listing import VehicleListing
+from app.services.listing_index import ListingAttributeIndex
+from app.services.nlp_recommendation_service import (
+    BODY_TYPE_WEIGHT, ENGINE_TYPE_WEIGHT, MIN_MATCH_SCORE, VEHICLE_TYPE_WEIGHT, ExtractedPreferences, nlp_service
+)
+
+LIMIT = 50
+
+PREFERENCES = [
+    ExtractedPreferences(vehicle_type=VehicleType.CAR, body_types=[BodyType.SUV], engine_type=EngineType.PETROL),
+    ExtractedPreferences(vehicle_type=VehicleType.CAR),
+    ExtractedPreferences(vehicle_type=VehicleType.CAR, body_types=[BodyType.SEDAN, BodyType.HATCHBACK]),
+    ExtractedPreferences(vehicle_type=VehicleType.BIKE, body_types=[BodyType.CRUISER], engine_type=EngineType.ELECTRIC),
+    ExtractedPreferences(body_types=[BodyType.SUV, BodyType.CROSSOVER], engine_type=EngineType.DIESEL),
+    ExtractedPreferences(body_types=[BodyType.SUV]),
+    ExtractedPreferences(),
+]
+
+
+@pytest.fixture
+def db(client):
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def reference_ranking(db, preferences, location):
+    """Score every live listing with calculate_match_score and rank by (score desc, id)."""
+    query = (
+        db.query(VehicleListing.id, VehicleListing.location, Vehicle.vehicle_type, Vehicle.body_type, Vehicle.engine_type)
+        .join(Vehicle)
+        .filter(VehicleListing.suppressed_at.is_(None))
+    )
+    if location:
+        query = query.filter(VehicleListing.location == location)
+
+    scored = []
+    for row in query:
+        listing = SimpleNamespace(vehicle=SimpleNamespace(
+            vehicle_type=row.vehicle_type, body_type=row.body_type, engine_type=row.engine_type
+        ))
+        score = nlp_service.calculate_match_score(listing, preferences)
+        if score > MIN_MATCH_SCORE:
+            scored.append((row.id, score))
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:LIMIT]
+
+
+@pytest.mark.parametrize("location", [None, MajorCities.KATHMANDU])
+@pytest.mark.parametrize("preferences", PREFERENCES)
+def test_sql_and_index_rankings_match_reference_score(db, preferences, location):
+    expected = reference_ranking(db, preferences, location)
+
+    sql = nlp_service._rank_with_sql(db, preferences, location, LIMIT)
+    assert [(row.id, score) for row, score in sql] == expected
+
+    index = ListingAttributeIndex()
+    index.warm(db)
+    top = index.top_k(
+        vehicle_type=preferences.vehicle_type, body_types=preferences.body_types,
+        engine_type=preferences.engine_type, location=location, k=LIMIT,
+        weights=(VEHICLE_TYPE_WEIGHT, BODY_TYPE_WEIGHT, ENGINE_TYPE_WEIGHT), min_score=MIN_MATCH_SCORE
+    )
+    assert top == expected
+
+
+def test_reference_dataset_is_not_trivial(db):
+    assert len(reference_ranking(db, PREFERENCES[0], None)) == LIMIT
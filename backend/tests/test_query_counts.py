@@ -0,0 +1,53 @@
+from sqlalchemy import create_engine, exc, text
+
+from app.services.query_stats import assert_max_queries, count_queries, instrument_engine, response_query_count
+
+FEED_PARAMS = {"listing_type": "SALE", "location": "Kathmandu"}
+
+
+def test_listings_feed_query_count(client):
+    # Data version for the ETag, then the page itself
+    response = client.get("/vehicles/listings", params=FEED_PARAMS)
+    assert response.status_code == 200
+    assert_max_queries(response, 2)
+
+    # The same page again is served from the feed cache
+    response = client.get("/vehicles/listings", params=FEED_PARAMS)
+    assert response.status_code == 200
+    assert response_query_count(response) == 0
+
+
+def test_listings_feed_not_modified_query_count(client):
+    etag = client.get("/vehicles/listings", params={**FEED_PARAMS, "sort": "price_asc"}).headers["etag"]
+
+    response = client.get("/vehicles/listings", params={**FEED_PARAMS, "sort": "price_asc"},
+                          headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert_max_queries(response, 1)
+
+
+def test_recommendations_query_count(client):
+    # Data version for the ETag, then one ranking query however many listings match
+    response = client.post("/recommendations", json={"query": "family suv", "location": "Kathmandu"})
+    assert response.status_code == 200
+    assert_max_queries(response, 2)
+
+    response = client.get("/recommendations", params={"query": "cheap bike"})
+    assert response.status_code == 200
+    assert response.json()
+    assert_max_queries(response, 2)
+
+
+def test_failed_statements_are_not_left_on_the_connection():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        for _ in range(5):
+            try:
+                conn.execute(text("SELECT * FROM missing_table"))
+            except exc.OperationalError:
+                pass
+        with count_queries() as stats:
+            conn.execute(text("SELECT 1"))
+        assert stats.count == 1
+        assert "query_started" not in conn.info
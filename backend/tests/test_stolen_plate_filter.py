@@ -0,0 +1,85 @@
+import pytest
+
+from app.enum import VehicleType
+from app.models.reported_vehicle import ReportedVehicle
+from app.services import stolen_plate_filter
+from app.services.stolen_plate_filter import StolenPlateFilter, normalize_plate, plate_key
+
+
+@pytest.fixture
+def db(client):
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def _report(db, vehicle_no: str, vehicle_type: VehicleType = VehicleType.CAR) -> None:
+    """Commit a report the way another worker would: without telling this process's filter."""
+    db.add(ReportedVehicle(vehicle_no=vehicle_no, plate_key=normalize_plate(vehicle_no),
+                           vehicle_type=vehicle_type, reported_by=1))
+    db.commit()
+
+
+def test_normalize_plate():
+    assert normalize_plate("ba-1-pa 1234") == "BA1PA1234"
+    assert normalize_plate("ＢＡ１ＰＡ１２３４") == "BA1PA1234"
+    assert normalize_plate("ब १ प १२३४") == "ब१प१२३४"
+    assert plate_key("BA 1 PA 1234", VehicleType.CAR) != plate_key("BA 1 PA 1234", VehicleType.BIKE)
+
+
+def test_grow_keeps_every_key_visible(monkeypatch):
+    plates = StolenPlateFilter(capacity=4)
+    added = []
+
+    class CheckedBloomFilter(stolen_plate_filter.BloomFilter):
+        def add(self, key):
+            # Whatever filter is published must still hold every key added before
+            assert all(seen in plates._bloom for seen in added)
+            super().add(key)
+
+    monkeypatch.setattr(stolen_plate_filter, "BloomFilter", CheckedBloomFilter)
+    for i in range(20):
+        plates.add(f"GROW {i}", VehicleType.CAR)
+        added.append(plate_key(f"GROW {i}", VehicleType.CAR))
+
+    assert plates._bloom.capacity >= 20
+    assert all(key in plates._bloom for key in added)
+
+
+def test_miss_hit_and_confirm_outcomes(db):
+    plates = StolenPlateFilter(max_staleness=60)
+
+    # Not loaded yet: the table answers
+    _report(db, "SPF 1 PA 1001")
+    assert plates.is_reported(db, "spf-1-pa-1001", VehicleType.CAR)
+    assert plates.stats()["db_fallback"] == 1
+
+    plates.refresh(db)
+    assert not plates.is_reported(db, "SPF 1 PA 1001", VehicleType.BIKE)
+    assert plates.is_reported(db, "SPF 1 PA 1001", VehicleType.CAR)
+
+    # Filter hits are confirmed against the table
+    plates.add("SPF 1 PA 1002", VehicleType.CAR)
+    assert not plates.is_reported(db, "SPF 1 PA 1002", VehicleType.CAR)
+    stats = plates.stats()
+    assert stats["db_confirmed"] == 2
+    assert stats["bloom_negative"] + stats["set_negative"] == 1
+
+    # Another worker's report is missed while the filter is fresh...
+    _report(db, "SPF 1 PA 1003")
+    assert not plates.is_reported(db, "SPF 1 PA 1003", VehicleType.CAR)
+
+    # ...and found by the check itself once it is older than max_staleness
+    plates._refreshed_at -= 120
+    assert plates.is_reported(db, "SPF 1 PA 1003", VehicleType.CAR)
+    assert plates.stats()["stale_refreshes"] == 1
+
+
+def test_zero_staleness_sees_every_committed_report(db):
+    plates = StolenPlateFilter(max_staleness=0)
+    plates.refresh(db)
+
+    _report(db, "SPF 2 PA 2001", VehicleType.BIKE)
+    assert plates.is_reported(db, "spf 2 pa 2001", VehicleType.BIKE)
@@ -0,0 +1,73 @@
+import threading
+
+from app.enum import VehicleType
+from app.models.vehicle_listing import VehicleListing
+from app.models.reported_vehicle import ReportedVehicle
+from app.services.stolen_plate_filter import normalize_plate
+from app.services.suppression_service import ListingSuppressionSweep
+
+QUERY = {"query": "family suv"}
+
+
+def _feed_ids(client, listing_type: str, location: str) -> set:
+    ids, cursor = set(), None
+    while True:
+        params = {"listing_type": listing_type.upper(), "location": location, "limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/vehicles/listings", params=params).json()
+        ids |= {item["id"] for item in page["items"]}
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def test_listing_reported_after_listing_disappears(client):
+    from app.database import SessionLocal
+
+    listing = client.get("/recommendations", params=QUERY).json()[0]
+    vehicle = listing["vehicle"]
+    assert listing["id"] in _feed_ids(client, listing["listing_type"], listing["location"])
+
+    db = SessionLocal()
+    try:
+        db.add(ReportedVehicle(vehicle_no=vehicle["vehicle_no"].lower(), plate_key=normalize_plate(vehicle["vehicle_no"]),
+                               vehicle_type=VehicleType(vehicle["vehicle_type"]), reported_by=1))
+        db.commit()
+        ListingSuppressionSweep().sweep(db)
+        assert db.get(VehicleListing, listing["id"]).suppressed_at is not None
+    finally:
+        db.close()
+
+    assert listing["id"] not in _feed_ids(client, listing["listing_type"], listing["location"])
+    assert listing["id"] not in {item["id"] for item in client.get("/recommendations", params=QUERY).json()}
+
+
+def test_stats_do_not_wait_for_the_database():
+    sweep = ListingSuppressionSweep()
+    in_query, release = threading.Event(), threading.Event()
+
+    class SlowSession:
+        def query(self, *args):
+            in_query.set()
+            release.wait(5)
+            raise RuntimeError("database gone")
+
+    worker = threading.Thread(target=lambda: _swallow(sweep.sweep, SlowSession()))
+    worker.start()
+    try:
+        assert in_query.wait(5)
+        # The sweep is blocked inside its query; stats() must still answer
+        done = threading.Event()
+        threading.Thread(target=lambda: (sweep.stats(), done.set()), daemon=True).start()
+        assert done.wait(1)
+    finally:
+        release.set()
+        worker.join()
+
+
+def _swallow(fn, *args):
+    try:
+        fn(*args)
+    except RuntimeError:
+        pass
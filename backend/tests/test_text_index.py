@@ -0,0 +1,74 @@
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.text_index import ListingTextIndex
+
+
+class StubPipeline:
+    """Stands in for spaCy: a text's vector counts its letters a-z."""
+    def pipe(self, texts, batch_size=None):
+        for text in texts:
+            vector = np.zeros(26, dtype=np.float32)
+            for ch in text.lower():
+                if "a" <= ch <= "z":
+                    vector[ord(ch) - ord("a")] += 1
+            yield SimpleNamespace(vector=vector)
+
+
+@pytest.fixture
+def index():
+    text_index = ListingTextIndex()
+    text_index._nlp = StubPipeline()
+    text_index._query_nlp = StubPipeline()
+    return text_index
+
+
+@pytest.fixture
+def db(client):
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def test_append_grows_buffer_without_losing_rows(index):
+    for start in range(0, 3000, 500):
+        ids = range(start + 1, start + 501)
+        with index._lock:
+            index._append(ids, index.embed([f"listing {i}" for i in ids]))
+
+    assert index._size == 3000
+    assert index._ids.size >= 3000
+    assert index._ids[:index._size].tolist() == list(range(1, 3001))
+    assert index.similarity("listing", [1, 3000, 4000]).keys() == {1, 3000}
+
+
+def test_refresh_picks_up_listings_from_other_workers(index, db):
+    index.warm(db, path=None)
+    warmed = index._size
+    assert warmed > 0
+
+    # Drop the newest listings as if another worker had created them after the warm-up
+    with index._lock:
+        newest = index._ids[warmed - 5:warmed].tolist()
+        index._size -= 5
+        for listing_id in newest:
+            del index._positions[listing_id]
+
+    assert index.refresh(db) == 5
+    assert index.embed_pending() == 5
+    assert index._size == warmed
+    assert index.refresh(db) == 0
+
+
+def test_query_embedding_does_not_wait_for_batch_work(index):
+    with index._nlp_lock:
+        done = threading.Event()
+        worker = threading.Thread(target=lambda: (index.embed_query("family suv"), done.set()))
+        worker.start()
+        assert done.wait(2)
+        worker.join()
@@ -0,0 +1,13 @@
+import os
+
+
+def test_upload_etag_includes_extension(client):
+    name = next(name for name in sorted(os.listdir("uploads/vehicles")) if name.endswith((".jpg", ".png")))
+
+    response = client.get(f"/uploads/vehicles/{name}")
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{name}"'
+    assert "immutable" in response.headers["cache-control"]
+
+    response = client.get(f"/uploads/vehicles/{name}", headers={"If-None-Match": f'"{name}"'})
+    assert response.status_code == 304
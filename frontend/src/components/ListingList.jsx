@@ -7,6 +7,17 @@ export default function ListingList({ listingType, location }) {
   const [listings, setListings] = useState([]); // List of vehicle listings
   const [loading, setLoading] = useState(true); // Loading state
   const [err, setErr] = useState(""); // Error state
+  const [nextCursor, setNextCursor] = useState(null); // Cursor for the next page
+  const [loadingMore, setLoadingMore] = useState(false); // Loading state for "Load more"
+
+  // ---------------------- Build feed URL for a page ----------------------
+  const buildUrl = (cursor) => {
+    let url = `http://localhost:8000/vehicles/listings?listing_type=${encodeURIComponent(
+      listingType
+    )}&location=${encodeURIComponent(location)}`;
+    if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+    return url;
+  };
 
   // ---------------------- Fetch listings when listingType or location changes ----------------------
   useEffect(() => {
@@ -18,12 +29,7 @@ export default function ListingList({ listingType, location }) {
       setLoading(true);
       setErr(""); // Reset error before fetching
       try {
-        // Build API URL with query parameters
-        const url = `http://localhost:8000/vehicles/listings?listing_type=${encodeURIComponent(
-          listingType
-        )}&location=${encodeURIComponent(location)}`;
-
-        const res = await fetch(url, {
+        const res = await fetch(buildUrl(null), {
           method: "GET",
           credentials: "include", // Include session cookie
           signal: controller.signal, // Allow aborting the fetch
@@ -35,7 +41,8 @@ export default function ListingList({ listingType, location }) {
         }
 
         const data = await res.json();
-        setListings(data);
+        setListings(data.items);
+        setNextCursor(data.next_cursor);
       } catch (e) {
         if (e.name !== "AbortError") {
           console.error(e);
@@ -52,6 +59,32 @@ export default function ListingList({ listingType, location }) {
     return () => controller.abort();
   }, [listingType, location]);
 
+  // ---------------------- Fetch the next page and append it ----------------------
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await fetch(buildUrl(nextCursor), {
+        method: "GET",
+        credentials: "include", // Include session cookie
+      });
+
+      if (!res.ok) {
+        const t = await res.text();
+        throw new Error(t || "Failed to fetch listings");
+      }
+
+      const data = await res.json();
+      setListings((prev) => [...prev, ...data.items]);
+      setNextCursor(data.next_cursor);
+    } catch (e) {
+      console.error(e);
+      setErr("Could not load listings. Please try again.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // ---------------------- Conditional Rendering ----------------------
   if (loading) return <p className="text-center py-8">Loading listings…</p>;
   if (err) return <p className="text-center text-red-600 py-8">{err}</p>;
@@ -64,6 +97,17 @@ export default function ListingList({ listingType, location }) {
       {listings.map((l) => (
         <ListingRow key={l.id} listing={l} />
       ))}
+      {nextCursor && (
+        <div className="text-center">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-6 py-2 rounded-lg bg-teal-500 text-white font-semibold disabled:opacity-50"
+          >
+            {loadingMore ? "Loading…" : "Load more"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
\ No newline at end of file
@@ -1,9 +1,10 @@
 // ---------------------- ListingRow Component ----------------------
 export default function ListingRow({ listing }) {
     // ---------------------- Image Source ----------------------
-    // Use the listing image if available, otherwise fallback to placeholder
-    const imgSrc = listing.image_url
-        ? `http://localhost:8000${listing.image_url}`
+    // Prefer the list-size thumbnail, then the original image, otherwise fallback to placeholder
+    const imageUrl = listing.thumbnail_url || listing.image_url;
+    const imgSrc = imageUrl
+        ? `http://localhost:8000${imageUrl}`
         : "/placeholder.jpg";
 
     // ---------------------- Price Unit ----------------------